@@ -33,6 +33,11 @@ const int ANALOG_THRESHOLD = 10;                 // Potentiometer noise threshol
 const int EEPROM_CONFIG_ADDRESS = 0;             // EEPROM start address
 const uint16_t CONFIG_MAGIC = 0xAC02;            // Magic number for config validation (changed from dual-board version)
 
+// Chunked configuration upload (see gui/config_upload.py)
+const uint8_t UPLOAD_CREDITS = 2;                // Chunks the PC may send ahead of our acknowledgement
+const uint16_t UPLOAD_MAX_PAYLOAD = 512;         // Largest chunk payload (JSON array of inputs)
+const unsigned long UPLOAD_TIMEOUT_MS = 5000;    // Abandon an upload after this long without a chunk
+
 // ========== INPUT TYPES ==========
 enum InputType {
   INPUT_NONE = 0,
@@ -68,6 +73,9 @@ struct Config {
   uint16_t checksum;               // Simple checksum
 };
 
+// uint32_t fingerprint of the configuration, as computed by the PC (0 = unknown)
+const int EEPROM_FINGERPRINT_ADDRESS = EEPROM_CONFIG_ADDRESS + sizeof(Config);
+
 // ========== GLOBAL VARIABLES ==========
 Config config;
 Bounce* buttons[MAX_INPUTS];         // Bounce objects for buttons/switches
@@ -77,8 +85,24 @@ int potValues[MAX_INPUTS];           // Last potentiometer values
 bool configLoaded = false;
 const int LED_PIN = 13;
 
+uint32_t configFingerprint = 0;      // Fingerprint saved with the configuration (0 = unknown)
+
+// Chunked upload state (session 0 = no upload in progress)
+uint16_t uploadSession = 0;
+uint16_t committedSession = 0;       // Last committed session, to answer a repeated commit
+bool uploadPatch = false;            // Only changed inputs are sent, each with its index
+uint8_t uploadTotal = 0;             // Inputs in the new configuration
+uint8_t uploadExpected = 0;          // Inputs the PC will send
+uint8_t uploadCount = 0;             // Inputs stored so far
+uint16_t uploadNextSeq = 0;          // Next chunk expected
+unsigned long uploadTime = 0;        // millis() of the last upload message
+bool uploadImage = false;            // Receiving an EEPROM image of config (#I) instead of JSON inputs
+uint16_t uploadOffset = 0;           // Image bytes stored so far
+
 // ========== SETUP ==========
 void setup() {
+  paintFreeRam();  // Before anything else uses the stack or the heap
+
   // Initialize USB Serial
   Serial.begin(BAUD_RATE);
 
@@ -118,6 +142,11 @@ void loop() {
     handleSerialCommand();
   }
 
+  // Give up on an upload the PC abandoned
+  if (uploadSession != 0 && millis() - uploadTime > UPLOAD_TIMEOUT_MS) {
+    abortUpload(F("timeout"));
+  }
+
   // Process all configured inputs
   if (configLoaded) {
     processInputs();
@@ -144,6 +173,12 @@ void loadConfiguration() {
     configLoaded = false;
   }
 
+  if (configLoaded) {
+    EEPROM.get(EEPROM_FINGERPRINT_ADDRESS, configFingerprint);
+  } else {
+    configFingerprint = 0;
+  }
+
   // Initialize default config if invalid
   if (!configLoaded) {
     initializeDefaultConfig();
@@ -156,6 +191,7 @@ void saveConfiguration() {
   config.checksum = calculateChecksum();
 
   EEPROM.put(EEPROM_CONFIG_ADDRESS, config);
+  EEPROM.put(EEPROM_FINGERPRINT_ADDRESS, configFingerprint);
   Serial.println(F("Configuration saved to EEPROM"));
 }
 
@@ -336,6 +372,16 @@ void handleSerialCommand() {
 
   if (jsonString.length() == 0) return;
 
+  if (jsonString[0] == '#') {
+    handleUploadCommand(jsonString.c_str());
+    return;
+  }
+
+  handleJsonCommand(jsonString);
+}
+
+// Kept out of handleSerialCommand so the upload path never reserves the 4 KB document on the stack
+__attribute__((noinline)) void handleJsonCommand(const String& jsonString) {
   // Parse JSON
   StaticJsonDocument<4096> doc;
   DeserializationError error = deserializeJson(doc, jsonString);
@@ -379,22 +425,12 @@ void handleConfigCommand(JsonDocument& doc) {
   for (JsonObject input : inputs) {
     if (inputCount >= MAX_INPUTS) break;
 
-    config.inputs[inputCount].enabled = true;
-    config.inputs[inputCount].pin = input["pin"];
-    config.inputs[inputCount].pin2 = input["pin2"] | 0;
-    config.inputs[inputCount].type = input["type"];
-    config.inputs[inputCount].mode = input["mode"] | 0;
-
-    const char* name = input["name"];
-    if (name) strncpy(config.inputs[inputCount].name, name, 19);
-
-    const char* key = input["key"];
-    if (key) strncpy(config.inputs[inputCount].keyCommand, key, 15);
-
+    parseInput(input, config.inputs[inputCount]);
     inputCount++;
   }
 
   // Save to EEPROM
+  configFingerprint = 0;  // Unknown for a single-line config command
   saveConfiguration();
   configLoaded = true;
 
@@ -406,6 +442,307 @@ void handleConfigCommand(JsonDocument& doc) {
   Serial.println(F(" inputs configured"));
 }
 
+// An input field sent under its full or its compact key (see gui/config_model.py)
+JsonVariant field(JsonObject input, const char* key, const char* compactKey) {
+  JsonVariant value = input[key];
+  return value.isNull() ? input[compactKey] : value;
+}
+
+// Copy one input of a config command or upload chunk (target must be cleared)
+void parseInput(JsonObject input, InputConfig& target) {
+  target.enabled = true;
+  target.pin = field(input, "pin", "p") | 0;
+  target.pin2 = field(input, "pin2", "p2") | 0;
+  target.type = field(input, "type", "t") | 0;
+  target.mode = field(input, "mode", "m") | 0;
+
+  const char* name = field(input, "name", "n");
+  if (name) strncpy(target.name, name, 19);
+
+  const char* key = field(input, "key", "k");
+  if (key) strncpy(target.keyCommand, key, 15);
+}
+
+// ========== CHUNKED CONFIGURATION UPLOAD ==========
+// Host lines:  #B <session> <inputs> [<changed> <base fingerprint>]  |  #I <session> <image bytes>
+//              #C <session> <seq> <crc> <payload>  |  #E <session> [<fingerprint>]  |  #X <session>
+// Replies:     @B <session> <credits> <max payload>  |  @A <session> <seq> <credits>  |  @N <session> <seq>
+//              @E <session> <inputs>  |  @F <session> <reason>
+// Inputs stay suspended from #B until the commit (#E) or the saved configuration is restored.
+// A patch (#B with a base) keeps the current inputs and only receives the changed ones.
+// An image upload (#I) receives config itself, as gui/eeprom_image.py compiles it.
+void handleUploadCommand(const char* line) {
+  char kind = line[1];
+  char* rest;
+  uint16_t session = strtoul(line + 2, &rest, 10);
+
+  if (kind == 'I') {
+    if (strtoul(rest, &rest, 10) != sizeof(Config)) {
+      sendUploadFailure(session, F("layout-mismatch"));
+      return;
+    }
+    if (session != uploadSession || uploadNextSeq != 0) {
+      if (uploadSession != 0) loadConfiguration();  // Drop the unfinished upload
+      cleanupInputs();
+      configLoaded = false;
+      uploadSession = session;
+      uploadImage = true;
+      uploadPatch = false;
+      uploadTotal = 0;
+      uploadExpected = 0;
+      uploadCount = 0;
+      uploadOffset = 0;
+      uploadNextSeq = 0;
+    }
+    uploadTime = millis();
+    sendUploadReady(session);
+    return;
+  }
+
+  if (kind == 'B') {
+    unsigned long count = strtoul(rest, &rest, 10);
+    bool patch = (*rest == ' ');
+    unsigned long changed = patch ? strtoul(rest, &rest, 10) : count;
+    uint32_t base = patch ? strtoul(rest, &rest, 16) : 0;
+    if (count > MAX_INPUTS || changed > count) {
+      sendUploadFailure(session, F("too-many-inputs"));
+      return;
+    }
+    if (session != uploadSession || uploadNextSeq != 0) {
+      if (uploadSession != 0) abortUpload(nullptr);  // Drop the unfinished upload, inputs run again
+      if (patch && (configFingerprint == 0 || base != configFingerprint)) {
+        sendUploadFailure(session, F("stale-base"));
+        return;
+      }
+      cleanupInputs();
+      configLoaded = false;
+      if (!patch) initializeDefaultConfig();
+      uploadSession = session;
+      uploadImage = false;
+      uploadPatch = patch;
+      uploadTotal = count;
+      uploadExpected = changed;
+      uploadCount = 0;
+      uploadNextSeq = 0;
+    }
+    uploadTime = millis();
+    sendUploadReady(session);
+    return;
+  }
+
+  if (kind == 'E' && session != 0 && session == committedSession) {
+    // Our first @E was lost
+    sendUploadCommitted(session);
+    return;
+  }
+
+  if (uploadSession == 0 || session != uploadSession) {
+    if (kind != 'X') sendUploadFailure(session, F("no-session"));
+    return;
+  }
+
+  uploadTime = millis();
+
+  if (kind == 'C') {
+    handleUploadChunk(session, rest);
+  } else if (kind == 'E') {
+    if (uploadCount != uploadExpected || (uploadImage && uploadOffset != sizeof(Config))) {
+      abortUpload(F("incomplete"));
+      return;
+    }
+    if (uploadImage) {
+      if (!imageValid()) {
+        abortUpload(F("bad-image"));
+        return;
+      }
+      for (int i = 0; i < MAX_INPUTS; i++) {
+        if (config.inputs[i].enabled) uploadTotal++;
+      }
+    } else {
+      for (int i = uploadTotal; i < MAX_INPUTS; i++) {
+        memset(&config.inputs[i], 0, sizeof(InputConfig));  // Rows removed by a patch
+      }
+    }
+    configFingerprint = strtoul(rest, &rest, 16);  // 0 if the PC sent none
+    saveConfiguration();
+    configLoaded = true;
+    initializeInputs();
+    committedSession = session;
+    uploadSession = 0;
+    sendUploadCommitted(session);
+  } else if (kind == 'X') {
+    abortUpload(nullptr);
+  }
+}
+
+void handleUploadChunk(uint16_t session, const char* fields) {
+  char* rest;
+  uint16_t seq = strtoul(fields, &rest, 10);
+  uint16_t crc = strtoul(rest, &rest, 16);
+  if (*rest == ' ') rest++;
+  size_t length = strlen(rest);
+
+  if (seq < uploadNextSeq) {
+    // Already stored; our acknowledgement was lost
+    sendUploadAck(session, uploadNextSeq - 1);
+    return;
+  }
+  if (seq > uploadNextSeq || length == 0 || length > UPLOAD_MAX_PAYLOAD || crc16(rest, length) != crc) {
+    Serial.print(F("@N "));
+    Serial.print(session);
+    Serial.print(' ');
+    Serial.println(uploadNextSeq);
+    return;
+  }
+
+  if (uploadImage) {
+    if (!storeImageChunk(rest, length)) {
+      abortUpload(F("bad-image"));
+      return;
+    }
+    uploadNextSeq++;
+    sendUploadAck(session, seq);
+    return;
+  }
+
+  StaticJsonDocument<1024> doc;
+  DeserializationError error = deserializeJson(doc, rest, length);
+  if (error == DeserializationError::NoMemory) {
+    abortUpload(F("chunk-too-large"));
+    return;
+  }
+  JsonArray inputs = doc.as<JsonArray>();
+  if (error || inputs.isNull()) {
+    abortUpload(F("bad-json"));
+    return;
+  }
+  if (uploadCount + inputs.size() > uploadExpected) {
+    abortUpload(F("too-many-inputs"));
+    return;
+  }
+
+  for (JsonObject input : inputs) {
+    uint8_t slot = uploadPatch ? (input["index"] | 255) : uploadCount;
+    if (slot >= uploadTotal) {
+      abortUpload(F("bad-index"));
+      return;
+    }
+    memset(&config.inputs[slot], 0, sizeof(InputConfig));
+    parseInput(input, config.inputs[slot]);
+    uploadCount++;
+  }
+  uploadNextSeq++;
+  sendUploadAck(session, seq);
+}
+
+// Decode an image chunk (base64 of bytes in which a zero is followed by the
+// number of zeros it stands for) into config at uploadOffset
+bool storeImageChunk(const char* data, size_t length) {
+  uint8_t bytes[UPLOAD_MAX_PAYLOAD / 4 * 3];
+  size_t count = 0;
+  uint16_t bits = 0;
+  uint8_t bitCount = 0;
+  for (size_t i = 0; i < length && data[i] != '='; i++) {
+    int8_t value = base64Value(data[i]);
+    if (value < 0) return false;
+    bits = (bits << 6) | value;
+    bitCount += 6;
+    if (bitCount >= 8) {
+      bitCount -= 8;
+      bytes[count++] = bits >> bitCount;
+    }
+  }
+
+  uint8_t* image = (uint8_t*)&config;
+  for (size_t i = 0; i < count; i++) {
+    if (bytes[i] != 0) {
+      if (uploadOffset >= sizeof(Config)) return false;
+      image[uploadOffset++] = bytes[i];
+      continue;
+    }
+    if (++i == count || bytes[i] == 0 || uploadOffset + bytes[i] > sizeof(Config)) return false;
+    memset(image + uploadOffset, 0, bytes[i]);
+    uploadOffset += bytes[i];
+  }
+  return true;
+}
+
+int8_t base64Value(char c) {
+  if (c >= 'A' && c <= 'Z') return c - 'A';
+  if (c >= 'a' && c <= 'z') return c - 'a' + 26;
+  if (c >= '0' && c <= '9') return c - '0' + 52;
+  if (c == '+') return 62;
+  if (c == '/') return 63;
+  return -1;
+}
+
+// A received image must be a configuration this sketch could have saved itself
+bool imageValid() {
+  if (config.magic != CONFIG_MAGIC || config.version != 1 || config.checksum != calculateChecksum()) {
+    return false;
+  }
+  for (int i = 0; i < MAX_INPUTS; i++) {
+    InputConfig& input = config.inputs[i];
+    if (input.name[19] != 0 || input.keyCommand[15] != 0) {
+      return false;
+    }
+  }
+  return true;
+}
+
+void sendUploadReady(uint16_t session) {
+  Serial.print(F("@B "));
+  Serial.print(session);
+  Serial.print(' ');
+  Serial.print(UPLOAD_CREDITS);
+  Serial.print(' ');
+  Serial.println(UPLOAD_MAX_PAYLOAD);
+}
+
+void sendUploadAck(uint16_t session, uint16_t seq) {
+  Serial.print(F("@A "));
+  Serial.print(session);
+  Serial.print(' ');
+  Serial.print(seq);
+  Serial.print(' ');
+  Serial.println(UPLOAD_CREDITS);
+}
+
+void sendUploadCommitted(uint16_t session) {
+  Serial.print(F("@E "));
+  Serial.print(session);
+  Serial.print(' ');
+  Serial.println(uploadTotal);
+}
+
+void sendUploadFailure(uint16_t session, const __FlashStringHelper* reason) {
+  Serial.print(F("@F "));
+  Serial.print(session);
+  Serial.print(' ');
+  Serial.println(reason);
+}
+
+// Drop the upload in progress and go back to the configuration saved in EEPROM
+void abortUpload(const __FlashStringHelper* reason) {
+  uint16_t session = uploadSession;
+  uploadSession = 0;
+  loadConfiguration();
+  initializeInputs();
+  if (reason) sendUploadFailure(session, reason);
+}
+
+// CRC-16/CCITT-FALSE (polynomial 0x1021, initial value 0xFFFF)
+uint16_t crc16(const char* data, size_t length) {
+  uint16_t crc = 0xFFFF;
+  while (length--) {
+    crc ^= (uint16_t)(uint8_t)*data++ << 8;
+    for (uint8_t bit = 0; bit < 8; bit++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
 void handleTestCommand(JsonDocument& doc) {
   const char* key = doc["key"];
   if (key) {
@@ -427,12 +764,39 @@ void sendStatus() {
     if (config.inputs[i].enabled) activeInputs++;
   }
   doc["activeInputs"] = activeInputs;
+  doc["compact"] = true;  // Accepts compact input keys
+  doc["image"] = sizeof(Config);  // Accepts EEPROM images (#I) of this size
+  doc["freeRam"] = freeRamLowWater();  // Least free SRAM since boot, in bytes
+
+  char fingerprint[9];
+  sprintf(fingerprint, "%08lX", (unsigned long)configFingerprint);
+  doc["fingerprint"] = fingerprint;
 
   serializeJson(doc, Serial);
   Serial.println();
 }
 
 // ========== UTILITY FUNCTIONS ==========
+// Free SRAM low-water mark: the gap between heap and stack is filled with a
+// pattern at boot, and the pattern bytes left above the heap were never used
+extern char __heap_start;
+extern char* __brkval;
+const uint8_t FREE_RAM_PATTERN = 0xA5;
+
+void paintFreeRam() {
+  char marker;
+  char* p = __brkval ? __brkval : &__heap_start;
+  while (p < &marker - 32) *p++ = FREE_RAM_PATTERN;  // Spare this function's own frame
+}
+
+uint16_t freeRamLowWater() {
+  char marker;
+  const char* p = __brkval ? __brkval : &__heap_start;
+  uint16_t count = 0;
+  while (p + count < &marker && (uint8_t)p[count] == FREE_RAM_PATTERN) count++;
+  return count;
+}
+
 void blinkLED() {
   digitalWrite(LED_PIN, HIGH);
   delay(50);
@@ -20,7 +20,12 @@ if %errorlevel% neq 0 (
 )
 
 REM Run the updater CLI
-cd /d "%~dp0gui"
+REM Follow current-version (written by the updater) to the active install
+set "APP_DIR=%~dp0"
+set "APP_VERSION="
+if exist "%~dp0current-version" set /p APP_VERSION=<"%~dp0current-version"
+if defined APP_VERSION if not "%APP_VERSION%"=="." set "APP_DIR=%~dp0versions\%APP_VERSION%\"
+cd /d "%APP_DIR%gui"
 python updater.py
 
 if %errorlevel% neq 0 (
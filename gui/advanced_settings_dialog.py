@@ -0,0 +1,256 @@
+"""
+Advanced Settings Dialog for Arduino Input Configurator
+
+Per-input options beyond pin and key: encoder display and push button
+settings, and LED/mutual-exclusion settings for latching switches.
+Imported when the dialog is first opened.
+"""
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QFormLayout, QGroupBox, QLabel, QLineEdit,
+    QComboBox, QSpinBox, QListWidget, QDialogButtonBox
+)
+
+from config_model import DISPLAY_TYPES, BUTTON_ACTIONS
+
+DISPLAY_TYPE_NAMES = {value: name for name, value in DISPLAY_TYPES.items()}
+BUTTON_ACTION_NAMES = {value: name for name, value in BUTTON_ACTIONS.items()}
+
+
+class AdvancedSettingsDialog(QDialog):
+    """Dialog for advanced input configuration"""
+    def __init__(self, parent=None, input_type="Button", advanced_config=None, all_inputs=None):
+        super().__init__(parent)
+        self.input_type = input_type
+        self.config = advanced_config or {}
+        self.all_inputs = all_inputs or []  # Input names, for the mutex list
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle(f"Advanced Settings - {self.input_type}")
+        self.setModal(True)
+        self.resize(500, 600)
+
+        layout = QVBoxLayout()
+
+        # Create tabs for different feature categories
+        if self.input_type == "Rotary Encoder":
+            layout.addWidget(self.create_display_section())
+            layout.addWidget(self.create_encoder_button_section())
+        elif self.input_type == "Latching Switch":
+            layout.addWidget(self.create_led_section())
+            layout.addWidget(self.create_mutex_section())
+
+        # Dialog buttons
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        self.setLayout(layout)
+
+    def create_display_section(self):
+        group = QGroupBox("7-Segment Display")
+        form = QFormLayout()
+
+        # Display type
+        self.display_type = QComboBox()
+        self.display_type.addItems(list(DISPLAY_TYPES))
+        self.display_type.setCurrentText(DISPLAY_TYPE_NAMES.get(self.config.get("displayType", 0), "None"))
+        self.display_type.currentTextChanged.connect(self.on_display_type_changed)
+        form.addRow("Display Type:", self.display_type)
+
+        # Until a display is configured, suggest the usual wiring
+        display_pins = self.config if self.config.get("displayType", 0) else {}
+
+        # CLK Pin
+        self.display_clk_pin = QSpinBox()
+        self.display_clk_pin.setRange(2, 69)
+        self.display_clk_pin.setValue(display_pins.get("displayClkPin", 22))
+        form.addRow("CLK Pin:", self.display_clk_pin)
+
+        # Data Pin (DIO/DIN)
+        self.display_data_pin = QSpinBox()
+        self.display_data_pin.setRange(2, 69)
+        self.display_data_pin.setValue(display_pins.get("displayDataPin", 23))
+        form.addRow("DIO/DIN Pin:", self.display_data_pin)
+
+        # CS/STB Pin (for TM1638/MAX7219)
+        self.display_cs_pin = QSpinBox()
+        self.display_cs_pin.setRange(0, 69)
+        self.display_cs_pin.setValue(display_pins.get("displayCsPin", 24))
+        self.display_cs_pin.setSpecialValueText("N/A")
+        form.addRow("CS/STB Pin:", self.display_cs_pin)
+
+        # Number of digits to use
+        self.display_digits = QSpinBox()
+        self.display_digits.setRange(1, 8)
+        self.display_digits.setValue(self.config.get("displayDigits", 4))
+        form.addRow("Digits to Use:", self.display_digits)
+
+        # Min/Max values
+        self.display_min = QSpinBox()
+        self.display_min.setRange(-9999, 9999)
+        self.display_min.setValue(self.config.get("displayMin", 0))
+        form.addRow("Minimum Value:", self.display_min)
+
+        self.display_max = QSpinBox()
+        self.display_max.setRange(-9999, 9999)
+        self.display_max.setValue(self.config.get("displayMax", 9999))
+        form.addRow("Maximum Value:", self.display_max)
+
+        # Enable/disable based on type
+        self.on_display_type_changed(self.display_type.currentText())
+
+        group.setLayout(form)
+        return group
+
+    def on_display_type_changed(self, display_type):
+        enabled = (display_type != "None")
+        self.display_clk_pin.setEnabled(enabled)
+        self.display_data_pin.setEnabled(enabled)
+        self.display_cs_pin.setEnabled(enabled and display_type in ["TM1638", "MAX7219"])
+        self.display_digits.setEnabled(enabled)
+        self.display_min.setEnabled(enabled)
+        self.display_max.setEnabled(enabled)
+
+    def create_encoder_button_section(self):
+        group = QGroupBox("Encoder Push Button")
+        form = QFormLayout()
+
+        # Button pin
+        self.button_pin = QSpinBox()
+        self.button_pin.setRange(0, 69)
+        self.button_pin.setValue(self.config.get("buttonPin", 0))
+        self.button_pin.setSpecialValueText("None")
+        self.button_pin.valueChanged.connect(self.on_button_pin_changed)
+        form.addRow("Button Pin:", self.button_pin)
+
+        # Short press action
+        self.button_short_action = QComboBox()
+        self.button_short_action.addItems(list(BUTTON_ACTIONS))
+        self.button_short_action.setCurrentText(BUTTON_ACTION_NAMES.get(self.config.get("buttonShortAction", 0), "None"))
+        self.button_short_action.currentTextChanged.connect(self.on_short_action_changed)
+        form.addRow("Short Press:", self.button_short_action)
+
+        # Short press key command
+        self.button_short_key = QLineEdit()
+        self.button_short_key.setText(self.config.get("buttonShortKey", ""))
+        self.button_short_key.setPlaceholderText("e.g., CTRL+ENTER, F5, SHIFT+S")
+        form.addRow("Short Press Key:", self.button_short_key)
+
+        # Long press action
+        self.button_long_action = QComboBox()
+        self.button_long_action.addItems(list(BUTTON_ACTIONS))
+        self.button_long_action.setCurrentText(BUTTON_ACTION_NAMES.get(self.config.get("buttonLongAction", 0), "None"))
+        self.button_long_action.currentTextChanged.connect(self.on_long_action_changed)
+        form.addRow("Long Press:", self.button_long_action)
+
+        # Long press key command
+        self.button_long_key = QLineEdit()
+        self.button_long_key.setText(self.config.get("buttonLongKey", ""))
+        self.button_long_key.setPlaceholderText("e.g., CTRL+0, ESC, ALT+F4")
+        form.addRow("Long Press Key:", self.button_long_key)
+
+        # Long press threshold
+        self.long_press_ms = QSpinBox()
+        self.long_press_ms.setRange(100, 5000)
+        self.long_press_ms.setValue(self.config.get("longPressMs", 1000))
+        self.long_press_ms.setSuffix(" ms")
+        form.addRow("Long Press Time:", self.long_press_ms)
+
+        # Enable/disable based on button pin
+        self.on_button_pin_changed(self.button_pin.value())
+
+        group.setLayout(form)
+        return group
+
+    def on_button_pin_changed(self, pin):
+        enabled = (pin > 0)
+        self.button_short_action.setEnabled(enabled)
+        self.button_short_key.setEnabled(enabled and self.button_short_action.currentText() == "Send Key")
+        self.button_long_action.setEnabled(enabled)
+        self.button_long_key.setEnabled(enabled and self.button_long_action.currentText() == "Send Key")
+        self.long_press_ms.setEnabled(enabled)
+
+    def on_short_action_changed(self, action):
+        self.button_short_key.setEnabled(action == "Send Key")
+
+    def on_long_action_changed(self, action):
+        self.button_long_key.setEnabled(action == "Send Key")
+
+    def create_led_section(self):
+        group = QGroupBox("LED Control")
+        form = QFormLayout()
+
+        # LED pin
+        self.led_pin = QSpinBox()
+        self.led_pin.setRange(0, 69)
+        self.led_pin.setValue(self.config.get("ledPin", 0))
+        self.led_pin.setSpecialValueText("None")
+        form.addRow("LED Pin:", self.led_pin)
+
+        form.addRow(QLabel("LED will turn ON when switch is latched, OFF when unlatched."))
+
+        group.setLayout(form)
+        return group
+
+    def create_mutex_section(self):
+        group = QGroupBox("Mutual Exclusion Rules")
+        layout = QVBoxLayout()
+
+        layout.addWidget(QLabel("Select inputs that should turn OFF when this switch is activated:"))
+
+        # List widget for mutex inputs
+        self.mutex_list = QListWidget()
+        self.mutex_list.setSelectionMode(QListWidget.MultiSelection)
+
+        # Populate with all inputs except current
+        for idx, input_name in enumerate(self.all_inputs):
+            self.mutex_list.addItem(f"Input {idx}: {input_name}")
+
+        # Select previously configured mutex inputs
+        mutex_indices = self.config.get("mutexList", [])
+        for idx in mutex_indices:
+            if idx < self.mutex_list.count():
+                self.mutex_list.item(idx).setSelected(True)
+
+        layout.addWidget(self.mutex_list)
+
+        layout.addWidget(QLabel("When this switch turns ON, the selected inputs will turn OFF."))
+
+        group.setLayout(layout)
+        return group
+
+    def get_config(self):
+        """Return the advanced configuration dictionary"""
+        config = {}
+
+        if self.input_type == "Rotary Encoder":
+            # Display configuration
+            config["displayType"] = DISPLAY_TYPES[self.display_type.currentText()]
+            config["displayClkPin"] = self.display_clk_pin.value()
+            config["displayDataPin"] = self.display_data_pin.value()
+            config["displayCsPin"] = self.display_cs_pin.value()
+            config["displayDigits"] = self.display_digits.value()
+            config["displayMin"] = self.display_min.value()
+            config["displayMax"] = self.display_max.value()
+
+            # Encoder button configuration
+            config["buttonPin"] = self.button_pin.value()
+            config["buttonShortAction"] = BUTTON_ACTIONS[self.button_short_action.currentText()]
+            config["buttonLongAction"] = BUTTON_ACTIONS[self.button_long_action.currentText()]
+            config["buttonShortKey"] = self.button_short_key.text()
+            config["buttonLongKey"] = self.button_long_key.text()
+            config["longPressMs"] = self.long_press_ms.value()
+
+        elif self.input_type == "Latching Switch":
+            # LED configuration
+            config["ledPin"] = self.led_pin.value()
+
+            # Mutex configuration
+            selected_items = self.mutex_list.selectedItems()
+            config["mutexList"] = [self.mutex_list.row(item) for item in selected_items]
+            config["mutexCount"] = len(config["mutexList"])
+
+        return config
@@ -13,298 +13,83 @@ NEW FEATURES (v2.0):
 
 import sys
 import json
-import serial
-import serial.tools.list_ports
-from pathlib import Path
+import importlib.util
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QComboBox, QPushButton, QTableWidget, QTableWidgetItem,
-    QMessageBox, QGroupBox, QLineEdit, QSpinBox, QHeaderView,
-    QFrame, QTextEdit, QProgressDialog, QMenu, QAction, QDialog,
-    QFormLayout, QCheckBox, QListWidget, QDialogButtonBox
+    QLabel, QComboBox, QPushButton, QTableView, QAbstractItemView,
+    QMessageBox, QGroupBox, QHeaderView, QTabWidget,
+    QTextEdit, QProgressDialog, QAction, QDialog, QFileDialog
 )
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
-from PyQt5.QtGui import QFont, QColor
-
-# Import updater module
-try:
-    from updater import Updater
-    UPDATER_AVAILABLE = True
-except ImportError:
-    UPDATER_AVAILABLE = False
-    print("Warning: Updater module not available")
-
-
-class AdvancedSettingsDialog(QDialog):
-    """Dialog for advanced input configuration"""
-    def __init__(self, parent=None, input_type="Button", advanced_config=None):
-        super().__init__(parent)
-        self.input_type = input_type
-        self.config = advanced_config or {}
-        self.all_inputs = []  # Will be populated by parent
-        self.init_ui()
-
-    def init_ui(self):
-        self.setWindowTitle(f"Advanced Settings - {self.input_type}")
-        self.setModal(True)
-        self.resize(500, 600)
-
-        layout = QVBoxLayout()
-
-        # Create tabs for different feature categories
-        if self.input_type == "Rotary Encoder":
-            layout.addWidget(self.create_display_section())
-            layout.addWidget(self.create_encoder_button_section())
-        elif self.input_type == "Latching Switch":
-            layout.addWidget(self.create_led_section())
-            layout.addWidget(self.create_mutex_section())
-
-        # Dialog buttons
-        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        button_box.accepted.connect(self.accept)
-        button_box.rejected.connect(self.reject)
-        layout.addWidget(button_box)
-
-        self.setLayout(layout)
-
-    def create_display_section(self):
-        group = QGroupBox("7-Segment Display")
-        form = QFormLayout()
-
-        # Display type
-        self.display_type = QComboBox()
-        self.display_type.addItems(["None", "TM1637", "TM1638", "MAX7219"])
-        self.display_type.setCurrentText(self.config.get("displayType", "None"))
-        self.display_type.currentTextChanged.connect(self.on_display_type_changed)
-        form.addRow("Display Type:", self.display_type)
-
-        # CLK Pin
-        self.display_clk_pin = QSpinBox()
-        self.display_clk_pin.setRange(2, 69)
-        self.display_clk_pin.setValue(self.config.get("displayClkPin", 22))
-        form.addRow("CLK Pin:", self.display_clk_pin)
-
-        # Data Pin (DIO/DIN)
-        self.display_data_pin = QSpinBox()
-        self.display_data_pin.setRange(2, 69)
-        self.display_data_pin.setValue(self.config.get("displayDataPin", 23))
-        form.addRow("DIO/DIN Pin:", self.display_data_pin)
-
-        # CS/STB Pin (for TM1638/MAX7219)
-        self.display_cs_pin = QSpinBox()
-        self.display_cs_pin.setRange(0, 69)
-        self.display_cs_pin.setValue(self.config.get("displayCsPin", 24))
-        self.display_cs_pin.setSpecialValueText("N/A")
-        form.addRow("CS/STB Pin:", self.display_cs_pin)
-
-        # Number of digits to use
-        self.display_digits = QSpinBox()
-        self.display_digits.setRange(1, 8)
-        self.display_digits.setValue(self.config.get("displayDigits", 4))
-        form.addRow("Digits to Use:", self.display_digits)
-
-        # Min/Max values
-        self.display_min = QSpinBox()
-        self.display_min.setRange(-9999, 9999)
-        self.display_min.setValue(self.config.get("displayMin", 0))
-        form.addRow("Minimum Value:", self.display_min)
-
-        self.display_max = QSpinBox()
-        self.display_max.setRange(-9999, 9999)
-        self.display_max.setValue(self.config.get("displayMax", 9999))
-        form.addRow("Maximum Value:", self.display_max)
-
-        # Enable/disable based on type
-        self.on_display_type_changed(self.display_type.currentText())
-
-        group.setLayout(form)
-        return group
-
-    def on_display_type_changed(self, display_type):
-        enabled = (display_type != "None")
-        self.display_clk_pin.setEnabled(enabled)
-        self.display_data_pin.setEnabled(enabled)
-        self.display_cs_pin.setEnabled(enabled and display_type in ["TM1638", "MAX7219"])
-        self.display_digits.setEnabled(enabled)
-        self.display_min.setEnabled(enabled)
-        self.display_max.setEnabled(enabled)
-
-    def create_encoder_button_section(self):
-        group = QGroupBox("Encoder Push Button")
-        form = QFormLayout()
-
-        # Button pin
-        self.button_pin = QSpinBox()
-        self.button_pin.setRange(0, 69)
-        self.button_pin.setValue(self.config.get("buttonPin", 0))
-        self.button_pin.setSpecialValueText("None")
-        self.button_pin.valueChanged.connect(self.on_button_pin_changed)
-        form.addRow("Button Pin:", self.button_pin)
-
-        # Short press action
-        self.button_short_action = QComboBox()
-        self.button_short_action.addItems(["None", "Cycle Modes", "Send Key", "Reset Display"])
-        self.button_short_action.setCurrentText(self.config.get("buttonShortAction", "None"))
-        self.button_short_action.currentTextChanged.connect(self.on_short_action_changed)
-        form.addRow("Short Press:", self.button_short_action)
-
-        # Short press key command
-        self.button_short_key = QLineEdit()
-        self.button_short_key.setText(self.config.get("buttonShortKey", ""))
-        self.button_short_key.setPlaceholderText("e.g., CTRL+ENTER, F5, SHIFT+S")
-        form.addRow("Short Press Key:", self.button_short_key)
-
-        # Long press action
-        self.button_long_action = QComboBox()
-        self.button_long_action.addItems(["None", "Cycle Modes", "Send Key", "Reset Display"])
-        self.button_long_action.setCurrentText(self.config.get("buttonLongAction", "None"))
-        self.button_long_action.currentTextChanged.connect(self.on_long_action_changed)
-        form.addRow("Long Press:", self.button_long_action)
-
-        # Long press key command
-        self.button_long_key = QLineEdit()
-        self.button_long_key.setText(self.config.get("buttonLongKey", ""))
-        self.button_long_key.setPlaceholderText("e.g., CTRL+0, ESC, ALT+F4")
-        form.addRow("Long Press Key:", self.button_long_key)
-
-        # Long press threshold
-        self.long_press_ms = QSpinBox()
-        self.long_press_ms.setRange(100, 5000)
-        self.long_press_ms.setValue(self.config.get("longPressMs", 1000))
-        self.long_press_ms.setSuffix(" ms")
-        form.addRow("Long Press Time:", self.long_press_ms)
-
-        # Enable/disable based on button pin
-        self.on_button_pin_changed(self.button_pin.value())
-
-        group.setLayout(form)
-        return group
-
-    def on_button_pin_changed(self, pin):
-        enabled = (pin > 0)
-        self.button_short_action.setEnabled(enabled)
-        self.button_short_key.setEnabled(enabled and self.button_short_action.currentText() == "Send Key")
-        self.button_long_action.setEnabled(enabled)
-        self.button_long_key.setEnabled(enabled and self.button_long_action.currentText() == "Send Key")
-        self.long_press_ms.setEnabled(enabled)
-
-    def on_short_action_changed(self, action):
-        self.button_short_key.setEnabled(action == "Send Key")
-
-    def on_long_action_changed(self, action):
-        self.button_long_key.setEnabled(action == "Send Key")
-
-    def create_led_section(self):
-        group = QGroupBox("LED Control")
-        form = QFormLayout()
-
-        # LED pin
-        self.led_pin = QSpinBox()
-        self.led_pin.setRange(0, 69)
-        self.led_pin.setValue(self.config.get("ledPin", 0))
-        self.led_pin.setSpecialValueText("None")
-        form.addRow("LED Pin:", self.led_pin)
-
-        form.addRow(QLabel("LED will turn ON when switch is latched, OFF when unlatched."))
-
-        group.setLayout(form)
-        return group
-
-    def create_mutex_section(self):
-        group = QGroupBox("Mutual Exclusion Rules")
-        layout = QVBoxLayout()
-
-        layout.addWidget(QLabel("Select inputs that should turn OFF when this switch is activated:"))
-
-        # List widget for mutex inputs
-        self.mutex_list = QListWidget()
-        self.mutex_list.setSelectionMode(QListWidget.MultiSelection)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QKeySequence, QTextCursor
 
-        # Populate with all inputs except current
-        for idx, input_name in enumerate(self.all_inputs):
-            self.mutex_list.addItem(f"Input {idx}: {input_name}")
+from config_model import (
+    MAX_INPUTS, INPUT_TYPES, INPUT_ENCODER, INPUT_SWITCH_LATCHING, ENCODER_MODES,
+    DIGITAL_PINS, ANALOG_PINS, INTERRUPT_PINS, JSON_DOCUMENT_SIZE, InputConfig, validate,
+    config_command, command_size, fingerprint, diff_inputs, describe_changes
+)
+from config_table_model import (
+    InputTableModel, ChoiceDelegate, TextDelegate,
+    COLUMN_NAME, COLUMN_TYPE, COLUMN_PIN, COLUMN_PIN2, COLUMN_MODE, COLUMN_KEY
+)
+from input_monitor import InputMonitor, MONITOR_FPS
 
-        # Select previously configured mutex inputs
-        mutex_indices = self.config.get("mutexList", [])
-        for idx in mutex_indices:
-            if idx < self.mutex_list.count():
-                self.mutex_list.item(idx).setSelected(True)
+WINDOW_TITLE = "Arduino Input Configurator - ELEGOO MEGA R3 (v2.0)"
+PROFILE_FILTERS = "JSON profile (*.json);;Binary profile (*.aicp)"
+DIFF_PREVIEW_LINES = 15  # Changed rows listed before asking to upload them
+CONSOLE_MAX_LINES = 1000  # Older console lines are dropped
 
-        layout.addWidget(self.mutex_list)
+# Only what the first frame needs is imported here. The serial port modules,
+# the updater (urllib, zipfile, ...) and dialogs are imported on first use.
+UPDATER_AVAILABLE = importlib.util.find_spec('updater') is not None
+if not UPDATER_AVAILABLE:
+    print("Warning: Updater module not available")
 
-        layout.addWidget(QLabel("When this switch turns ON, the selected inputs will turn OFF."))
 
-        group.setLayout(layout)
-        return group
+def parse_status(status):
+    """
+    Read a status response.
 
-    def get_config(self):
-        """Return the advanced configuration dictionary"""
-        config = {}
-
-        if self.input_type == "Rotary Encoder":
-            # Display configuration
-            display_type_map = {"None": 0, "TM1637": 1, "TM1638": 2, "MAX7219": 3}
-            config["displayType"] = display_type_map[self.display_type.currentText()]
-            config["displayClkPin"] = self.display_clk_pin.value()
-            config["displayDataPin"] = self.display_data_pin.value()
-            config["displayCsPin"] = self.display_cs_pin.value()
-            config["displayDigits"] = self.display_digits.value()
-            config["displayMin"] = self.display_min.value()
-            config["displayMax"] = self.display_max.value()
-
-            # Encoder button configuration
-            action_map = {"None": 0, "Cycle Modes": 1, "Send Key": 2, "Reset Display": 3}
-            config["buttonPin"] = self.button_pin.value()
-            config["buttonShortAction"] = action_map[self.button_short_action.currentText()]
-            config["buttonLongAction"] = action_map[self.button_long_action.currentText()]
-            config["buttonShortKey"] = self.button_short_key.text()
-            config["buttonLongKey"] = self.button_long_key.text()
-            config["longPressMs"] = self.long_press_ms.value()
-
-        elif self.input_type == "Latching Switch":
-            # LED configuration
-            config["ledPin"] = self.led_pin.value()
-
-            # Mutex configuration
-            selected_items = self.mutex_list.selectedItems()
-            config["mutexList"] = [self.mutex_list.row(item) for item in selected_items]
-            config["mutexCount"] = len(config["mutexList"])
-
-        return config
+    Returns:
+        tuple: (configuration fingerprint, 0 if absent or unknown;
+                whether the firmware accepts compact inputs;
+                size of the EEPROM images it accepts, 0 if none)
+    """
+    try:
+        data = json.loads(status)
+        image_size = data.get("image", 0)
+        return (int(data.get("fingerprint", "0"), 16), data.get("compact") is True,
+                image_size if isinstance(image_size, int) else 0)
+    except (ValueError, TypeError, AttributeError):
+        return 0, False, 0
 
 
 class ArduinoConfigurator(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.serial_connection = None
+        self.serial_worker = None
+        self.pending_requests = {}  # request id -> callback(success, response)
+        self.update_worker = None
         self.inputs = []
-        self.max_inputs = 40
-        self.advanced_configs = {}  # Store advanced configs per row
-
-        self.input_types = {
-            "Button": 1,
-            "Rotary Encoder": 2,
-            "Switch": 3,
-            "Potentiometer": 4,
-            "Latching Switch": 5  # New type
-        }
+        self.max_inputs = MAX_INPUTS
+        self.profile_path = None  # Profile the table was loaded from / saved to
+        self.profile_name = None
+        self.recent_profiles = None  # Loaded when the File menu is first opened
+        self.upload_history = None  # Configurations uploaded before, by fingerprint
+        self.console_pending = []  # Arduino lines not written to the console yet
 
-        self.encoder_modes = {
-            "1x (increment by 1)": 0,
-            "10x (increment by 10)": 1,
-            "100x (increment by 100)": 2,
-            "1000x (increment by 1000)": 3
-        }
+        self.input_types = INPUT_TYPES
+        self.encoder_modes = ENCODER_MODES
 
         # Arduino Mega 2560 pin definitions
-        self.digital_pins = list(range(2, 54))  # Skip 0-1 (Serial)
-        self.analog_pins = [f"A{i}" for i in range(16)]
-        self.interrupt_pins = [2, 3, 18, 19, 20, 21]  # Best for encoders
+        self.digital_pins = list(DIGITAL_PINS)  # Skip 0-1 (Serial)
+        self.analog_pins = list(ANALOG_PINS)
+        self.interrupt_pins = list(INTERRUPT_PINS)  # Best for encoders
 
         self.init_ui()
 
     def init_ui(self):
-        self.setWindowTitle("Arduino Input Configurator - ELEGOO MEGA R3 (v2.0)")
+        self.setWindowTitle(WINDOW_TITLE)
         self.setGeometry(100, 100, 1300, 800)
 
         # Main widget and layout
@@ -334,17 +119,38 @@ class ArduinoConfigurator(QMainWindow):
         # Apply styling
         self.apply_styling()
 
-        # Refresh serial ports on startup
-        self.refresh_ports()
+        # Enumerate ports once the window is up
+        QTimer.singleShot(0, self.refresh_ports)
 
         # Check for updates on startup (after a delay)
         if UPDATER_AVAILABLE:
             QTimer.singleShot(2000, self.check_for_updates_async)
 
     def create_menu_bar(self):
-        """Create menu bar with Help menu"""
+        """Create menu bar with File and Help menus"""
         menubar = self.menuBar()
 
+        # File menu
+        file_menu = menubar.addMenu("File")
+
+        open_action = QAction("Open Profile...", self)
+        open_action.setShortcut(QKeySequence.Open)
+        open_action.triggered.connect(self.open_profile)
+        file_menu.addAction(open_action)
+
+        self.recent_menu = file_menu.addMenu("Open Recent")
+        self.recent_menu.aboutToShow.connect(self.update_recent_menu)
+
+        save_action = QAction("Save Profile", self)
+        save_action.setShortcut(QKeySequence.Save)
+        save_action.triggered.connect(self.save_profile)
+        file_menu.addAction(save_action)
+
+        save_as_action = QAction("Save Profile As...", self)
+        save_as_action.setShortcut(QKeySequence.SaveAs)
+        save_as_action.triggered.connect(self.save_profile_as)
+        file_menu.addAction(save_as_action)
+
         # Help menu
         help_menu = menubar.addMenu("Help")
 
@@ -354,6 +160,10 @@ class ArduinoConfigurator(QMainWindow):
             update_action.triggered.connect(self.check_for_updates_manual)
             help_menu.addAction(update_action)
 
+            rollback_action = QAction("Restore Previous Version", self)
+            rollback_action.triggered.connect(self.restore_previous_version)
+            help_menu.addAction(rollback_action)
+
         # About action
         about_action = QAction("About", self)
         about_action.triggered.connect(self.show_about)
@@ -415,6 +225,13 @@ class ArduinoConfigurator(QMainWindow):
 
         button_layout.addStretch()
 
+        self.upload_size_label = QLabel()
+        self.upload_size_label.setToolTip(
+            "Size of the configuration as uploaded (compact encoding), and the memory the "
+            f"firmware needs to parse it as one message (at most {JSON_DOCUMENT_SIZE:,} bytes).\n"
+            "Current firmware receives larger configurations in chunks.")
+        button_layout.addWidget(self.upload_size_label)
+
         self.upload_config_btn = QPushButton("⬆ Upload to Arduino")
         self.upload_config_btn.clicked.connect(self.upload_configuration)
         self.upload_config_btn.setStyleSheet("background-color: #2196F3; color: white; font-weight: bold;")
@@ -426,30 +243,45 @@ class ArduinoConfigurator(QMainWindow):
 
         layout.addLayout(button_layout)
 
-        # Configuration table
-        self.config_table = QTableWidget()
-        self.config_table.setColumnCount(6)
-        self.config_table.setHorizontalHeaderLabels([
-            "Name", "Type", "Pin 1", "Pin 2", "Encoder Mode", "Keyboard Command"
-        ])
+        # Configuration table: one InputConfig record per row, edited through delegates
+        self.input_model = InputTableModel(self)
+        self.config_table = QTableView()
+        self.config_table.setModel(self.input_model)
+
+        choice_delegate = ChoiceDelegate(self.config_table)
+        text_delegate = TextDelegate(self.config_table)
+        for column in (COLUMN_TYPE, COLUMN_PIN, COLUMN_PIN2, COLUMN_MODE):
+            self.config_table.setItemDelegateForColumn(column, choice_delegate)
+        for column in (COLUMN_NAME, COLUMN_KEY):
+            self.config_table.setItemDelegateForColumn(column, text_delegate)
 
         # Set column widths
         header = self.config_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.Stretch)  # Name
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # Type
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Pin 1
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)  # Pin 2
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)  # Encoder Mode
-        header.setSectionResizeMode(5, QHeaderView.Stretch)  # Keyboard Command
-
-        self.config_table.setSelectionBehavior(QTableWidget.SelectRows)
+        header.setSectionResizeMode(COLUMN_NAME, QHeaderView.Stretch)
+        for column in (COLUMN_TYPE, COLUMN_PIN, COLUMN_PIN2, COLUMN_MODE):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COLUMN_KEY, QHeaderView.Stretch)
+
+        self.config_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.config_table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked |
+            QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed
+        )
+        header.setSortIndicator(-1, Qt.AscendingOrder)  # Unsorted until a header is clicked
+        self.config_table.setSortingEnabled(True)
         layout.addWidget(self.config_table)
 
+        for signal in (self.input_model.dataChanged, self.input_model.rowsInserted, self.input_model.rowsRemoved,
+                       self.input_model.modelReset, self.input_model.layoutChanged):
+            signal.connect(self.on_inputs_changed)
+        self.update_upload_size()
+
         # Info label
         info_label = QLabel(
             "💡 Tips: Use interrupt pins (2,3,18,19,20,21) for encoders. "
             "Keyboard commands support flexible format: single keys (A, F1), modifiers (CTRL+F, SHIFT+A), or multi-key (A+B+C). "
-            "Use 'Advanced Settings' for displays, encoder buttons, and LED control."
+            "Use 'Advanced Settings' for displays, encoder buttons, and LED control. "
+            "Editing a cell with several rows selected changes all of them."
         )
         info_label.setWordWrap(True)
         info_label.setStyleSheet("color: #666; font-size: 10px; padding: 5px;")
@@ -459,12 +291,16 @@ class ArduinoConfigurator(QMainWindow):
         return group
 
     def create_console_section(self):
-        group = QGroupBox("Console Output")
+        tabs = QTabWidget()
+        tabs.setMaximumHeight(240)
+
+        console_tab = QWidget()
         layout = QVBoxLayout()
 
         self.console = QTextEdit()
         self.console.setReadOnly(True)
         self.console.setMaximumHeight(150)
+        self.console.document().setMaximumBlockCount(CONSOLE_MAX_LINES)
         self.console.setStyleSheet("background-color: #1e1e1e; color: #d4d4d4; font-family: Consolas, monospace;")
         layout.addWidget(self.console)
 
@@ -473,8 +309,21 @@ class ArduinoConfigurator(QMainWindow):
         clear_btn.clicked.connect(self.console.clear)
         layout.addWidget(clear_btn)
 
-        group.setLayout(layout)
-        return group
+        console_tab.setLayout(layout)
+        tabs.addTab(console_tab, "Console Output")
+
+        # Live monitor of what each configured input sends
+        self.input_monitor = InputMonitor()
+        self.input_monitor.set_inputs(self.input_model.inputs())
+        tabs.addTab(self.input_monitor, "Live Monitor")
+
+        # Lines from the board reach the console in batches, at the monitor's frame rate
+        self.console_timer = QTimer(self)
+        self.console_timer.setSingleShot(True)
+        self.console_timer.setInterval(int(1000 / MONITOR_FPS))
+        self.console_timer.timeout.connect(self.flush_console)
+
+        return tabs
 
     def apply_styling(self):
         self.setStyleSheet("""
@@ -505,7 +354,7 @@ class ArduinoConfigurator(QMainWindow):
             QPushButton:pressed {
                 background-color: #d0d0d0;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 gridline-color: #d0d0d0;
             }
@@ -519,8 +368,10 @@ class ArduinoConfigurator(QMainWindow):
 
     def refresh_ports(self):
         """Refresh the list of available serial ports"""
+        from serial.tools import list_ports
+
         self.port_combo.clear()
-        ports = serial.tools.list_ports.comports()
+        ports = list_ports.comports()
 
         for port in ports:
             # Show port name and description
@@ -534,7 +385,7 @@ class ArduinoConfigurator(QMainWindow):
 
     def toggle_connection(self):
         """Connect or disconnect from Arduino"""
-        if self.serial_connection is None or not self.serial_connection.is_open:
+        if self.serial_worker is None:
             self.connect_to_arduino()
         else:
             self.disconnect_from_arduino()
@@ -546,8 +397,18 @@ class ArduinoConfigurator(QMainWindow):
             QMessageBox.warning(self, "Connection Error", "No valid serial port selected")
             return
 
+        import serial
+        from serial_worker import SerialWorker
+
         try:
-            self.serial_connection = serial.Serial(port, 115200, timeout=2)
+            self.serial_worker = SerialWorker(port, 115200, self)
+            self.serial_worker.lines_received.connect(self.on_arduino_lines)
+            self.serial_worker.ready.connect(self.request_status)
+            self.serial_worker.request_finished.connect(self.on_request_finished)
+            self.serial_worker.upload_progress.connect(self.on_upload_progress)
+            self.serial_worker.connection_lost.connect(self.on_connection_lost)
+            self.serial_worker.start()
+
             self.connect_btn.setText("Disconnect")
             self.connect_btn.setStyleSheet("background-color: #f44336; color: white; font-weight: bold;")
             self.connection_status.setText("● Connected")
@@ -555,19 +416,20 @@ class ArduinoConfigurator(QMainWindow):
             self.statusBar().showMessage(f"Connected to {port}")
             self.log_console(f"Connected to Arduino on {port}")
 
-            # Request status
-            QTimer.singleShot(1000, self.request_status)
-
         except serial.SerialException as e:
             QMessageBox.critical(self, "Connection Error", f"Failed to connect:\n{str(e)}")
             self.log_console(f"Connection failed: {str(e)}")
 
     def disconnect_from_arduino(self):
         """Close serial connection to Arduino"""
-        if self.serial_connection and self.serial_connection.is_open:
-            self.serial_connection.close()
-
-        self.serial_connection = None
+        if self.serial_worker:
+            self.serial_worker.stop()
+
+        self.serial_worker = None
+        # Let requests still waiting for an answer clean up (e.g., re-enable Upload)
+        pending, self.pending_requests = self.pending_requests, {}
+        for callback in pending.values():
+            callback(False, "Disconnected")
         self.connect_btn.setText("Connect")
         self.connect_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
         self.connection_status.setText("● Disconnected")
@@ -575,120 +437,98 @@ class ArduinoConfigurator(QMainWindow):
         self.statusBar().showMessage("Disconnected")
         self.log_console("Disconnected from Arduino")
 
+    def on_connection_lost(self, error):
+        """Handle the serial port failing (e.g., board unplugged)"""
+        self.log_console(f"Connection lost: {error}")
+        self.disconnect_from_arduino()
+
+    def send_request(self, command, callback=None, upload=None):
+        """
+        Send a JSON command to the Arduino via the serial worker.
+
+        Args:
+            command (dict): Command with a "type" field
+            callback (callable): Called with (success, response) once the
+                                 Arduino answers or the request times out
+            upload (ConfigUpload): Prepared upload for a "config" command
+        """
+        request_id = self.serial_worker.request(command, upload=upload)
+        if callback:
+            self.pending_requests[request_id] = callback
+
+    def on_request_finished(self, request_id, success, response):
+        """Dispatch a correlated Arduino response to its callback"""
+        callback = self.pending_requests.pop(request_id, None)
+        if callback:
+            callback(success, response)
+
+    def on_arduino_lines(self, lines):
+        """Pass lines received from the Arduino to the live monitor and the console"""
+        self.input_monitor.add_lines(lines)
+        self.console_pending.extend(lines)
+        if not self.console_timer.isActive():
+            self.console_timer.start()
+
+    def flush_console(self):
+        """Write the Arduino lines received since the last frame to the console at once"""
+        if not self.console_pending:
+            return
+        text = "\n".join(f"Arduino: {line}" for line in self.console_pending[-CONSOLE_MAX_LINES:])
+        self.console_pending = []
+        cursor = QTextCursor(self.console.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text if self.console.document().isEmpty() else "\n" + text)
+        self.console.verticalScrollBar().setValue(self.console.verticalScrollBar().maximum())
+
     def add_input_row(self):
         """Add a new input configuration row"""
-        if self.config_table.rowCount() >= self.max_inputs:
+        if self.input_model.rowCount() >= self.max_inputs:
             QMessageBox.warning(self, "Limit Reached", f"Maximum {self.max_inputs} inputs supported")
             return
 
-        row = self.config_table.rowCount()
-        self.config_table.insertRow(row)
-
-        # Initialize advanced config for this row
-        self.advanced_configs[row] = {}
-
-        # Name
-        name_item = QLineEdit(f"Input {row + 1}")
-        self.config_table.setCellWidget(row, 0, name_item)
-
-        # Type
-        type_combo = QComboBox()
-        type_combo.addItems(list(self.input_types.keys()))
-        type_combo.currentTextChanged.connect(lambda text, r=row: self.on_type_changed(r, text))
-        self.config_table.setCellWidget(row, 1, type_combo)
-
-        # Pin 1
-        pin1_combo = QComboBox()
-        pin1_combo.addItems([str(p) for p in self.digital_pins] + self.analog_pins)
-        self.config_table.setCellWidget(row, 2, pin1_combo)
-
-        # Pin 2 (for encoders)
-        pin2_combo = QComboBox()
-        pin2_combo.addItem("N/A")
-        pin2_combo.addItems([str(p) for p in self.digital_pins])
-        pin2_combo.setEnabled(False)
-        self.config_table.setCellWidget(row, 3, pin2_combo)
-
-        # Encoder Mode
-        mode_combo = QComboBox()
-        mode_combo.addItems(list(self.encoder_modes.keys()))
-        mode_combo.setEnabled(False)
-        self.config_table.setCellWidget(row, 4, mode_combo)
-
-        # Keyboard Command
-        key_input = QLineEdit()
-        key_input.setPlaceholderText("e.g., CTRL+F, A, SHIFT+A+B, F1")
-        self.config_table.setCellWidget(row, 5, key_input)
+        row = self.input_model.rowCount()
+        self.input_model.append_input(InputConfig(name=f"Input {row + 1}"))
+        self.config_table.selectRow(row)
 
         self.log_console(f"Added input row {row + 1}")
 
-    def on_type_changed(self, row, input_type):
-        """Handle input type change"""
-        pin2_combo = self.config_table.cellWidget(row, 3)
-        mode_combo = self.config_table.cellWidget(row, 4)
-
-        if input_type == "Rotary Encoder":
-            pin2_combo.setEnabled(True)
-            pin2_combo.setCurrentIndex(1)  # Select first pin after N/A
-            mode_combo.setEnabled(True)
-        else:
-            pin2_combo.setEnabled(False)
-            pin2_combo.setCurrentIndex(0)  # Set to N/A
-            mode_combo.setEnabled(False)
+    def selected_rows(self):
+        """Selected table rows, in order"""
+        return sorted(index.row() for index in self.config_table.selectionModel().selectedRows())
 
     def open_advanced_settings(self):
         """Open advanced settings dialog for selected row"""
-        current_row = self.config_table.currentRow()
+        current_row = self.config_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.information(self, "No Selection", "Please select an input row first")
             return
 
-        # Get input type
-        type_combo = self.config_table.cellWidget(current_row, 1)
-        input_type = type_combo.currentText()
-
         # Only show advanced settings for Rotary Encoder and Latching Switch
-        if input_type not in ["Rotary Encoder", "Latching Switch"]:
+        record = self.input_model.input(current_row)
+        if record.type not in (INPUT_ENCODER, INPUT_SWITCH_LATCHING):
             QMessageBox.information(
                 self, "Not Available",
                 "Advanced settings are only available for Rotary Encoders and Latching Switches."
             )
             return
 
-        # Get all input names for mutex list
-        all_input_names = []
-        for row in range(self.config_table.rowCount()):
-            name_widget = self.config_table.cellWidget(row, 0)
-            all_input_names.append(name_widget.text() if name_widget else f"Input {row}")
-
         # Create and show dialog
-        dialog = AdvancedSettingsDialog(self, input_type, self.advanced_configs.get(current_row, {}))
-        dialog.all_inputs = all_input_names
+        from advanced_settings_dialog import AdvancedSettingsDialog
+
+        input_type = self.input_model.index(current_row, COLUMN_TYPE).data()
+        all_input_names = [other.name for other in self.input_model.inputs()]
+        dialog = AdvancedSettingsDialog(self, input_type, record.to_dict(), all_input_names)
 
         if dialog.exec_() == QDialog.Accepted:
-            self.advanced_configs[current_row] = dialog.get_config()
+            self.input_model.set_advanced(current_row, dialog.get_config())
             self.log_console(f"Advanced settings updated for row {current_row + 1}")
 
     def remove_input_row(self):
-        """Remove selected input row"""
-        current_row = self.config_table.currentRow()
-        if current_row >= 0:
-            self.config_table.removeRow(current_row)
-
-            # Remove advanced config and shift subsequent rows
-            if current_row in self.advanced_configs:
-                del self.advanced_configs[current_row]
-
-            # Shift advanced configs for rows after deleted row
-            new_configs = {}
-            for row, config in self.advanced_configs.items():
-                if row > current_row:
-                    new_configs[row - 1] = config
-                elif row < current_row:
-                    new_configs[row] = config
-            self.advanced_configs = new_configs
-
-            self.log_console(f"Removed input row {current_row + 1}")
+        """Remove selected input rows"""
+        rows = self.selected_rows()
+        if rows:
+            self.input_model.remove_inputs(rows)
+            self.log_console(f"Removed input row(s) {', '.join(str(row + 1) for row in rows)}")
         else:
             QMessageBox.information(self, "No Selection", "Please select a row to remove")
 
@@ -701,107 +541,239 @@ class ArduinoConfigurator(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            self.config_table.setRowCount(0)
-            self.advanced_configs = {}
+            self.input_model.set_inputs([])
             self.log_console("Cleared all input configurations")
 
+    def get_upload_history(self):
+        """Uploaded configurations index (read on first use)"""
+        if self.upload_history is None:
+            from profiles import UploadHistory
+            self.upload_history = UploadHistory()
+        return self.upload_history
+
+    def get_recent_profiles(self):
+        """Recent profiles index (read on first use)"""
+        if self.recent_profiles is None:
+            from profiles import RecentProfiles
+            self.recent_profiles = RecentProfiles()
+        return self.recent_profiles
+
+    def update_recent_menu(self):
+        """Rebuild the Open Recent menu from the recent profiles index"""
+        self.recent_menu.clear()
+        recent = self.get_recent_profiles()
+
+        for entry in recent.entries:
+            action = self.recent_menu.addAction(f"{entry['name']} ({entry.get('inputs', '?')} inputs)")
+            action.setToolTip(entry['path'])
+            action.setStatusTip(entry['path'])
+            action.triggered.connect(lambda checked, path=entry['path']: self.load_profile_file(path))
+
+        if recent.entries:
+            self.recent_menu.addSeparator()
+            clear_action = self.recent_menu.addAction("Clear Recent Profiles")
+            clear_action.triggered.connect(recent.clear)
+        else:
+            self.recent_menu.addAction("No recent profiles").setEnabled(False)
+
+    def open_profile(self):
+        """Ask for a profile file and load it"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Profile", str(self.profile_path or ""), "Profiles (*.json *.aicp);;" + PROFILE_FILTERS
+        )
+        if path:
+            self.load_profile_file(path)
+
+    def load_profile_file(self, path):
+        """
+        Replace the table with a saved profile.
+
+        Args:
+            path (str): Profile file (.json or .aicp)
+        """
+        from profiles import load_profile
+
+        try:
+            name, inputs = load_profile(path)
+        except FileNotFoundError:
+            self.get_recent_profiles().remove(path)
+            QMessageBox.warning(self, "Open Profile", f"The profile no longer exists:\n{path}")
+            return
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Open Profile", f"Could not open the profile:\n{e}")
+            return
+
+        self.input_model.set_inputs(inputs)  # One model reset, however many rows
+        self.set_profile(path, name, len(inputs))
+        self.log_console(f"Loaded profile '{name}': {len(inputs)} inputs")
+
+    def save_profile(self):
+        """Save to the current profile file, or ask for one"""
+        if self.profile_path is None:
+            self.save_profile_as()
+        else:
+            self.write_profile(self.profile_path, self.profile_name)
+
+    def save_profile_as(self):
+        """Ask for a file name and save the profile there"""
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Profile As", str(self.profile_path or "profile.json"), PROFILE_FILTERS
+        )
+        if not path:
+            return
+        if not path.lower().endswith(('.json', '.aicp')):
+            path += '.aicp' if '.aicp' in selected_filter else '.json'
+        self.write_profile(path)
+
+    def write_profile(self, path, name=None):
+        """
+        Save the table to a profile file.
+
+        Args:
+            path (str): Profile file; .aicp saves the binary encoding, anything else JSON
+            name (str): Profile name (default: the file name without suffix)
+        """
+        from pathlib import Path
+        from profiles import save_profile
+
+        inputs = self.input_model.inputs()
+        name = name or Path(path).stem
+        try:
+            save_profile(path, inputs, name)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Save Profile", f"Could not save the profile:\n{e}")
+            return
+
+        self.set_profile(path, name, len(inputs))
+        self.log_console(f"Saved profile '{name}' to {path}")
+
+    def set_profile(self, path, name, input_count):
+        """Remember the current profile and move it to the top of the recent list"""
+        self.profile_path = path
+        self.profile_name = name
+        self.setWindowTitle(f"{name} - {WINDOW_TITLE}")
+        self.get_recent_profiles().add(path, name, input_count)
+
     def upload_configuration(self):
         """Upload configuration to Arduino"""
-        if self.serial_connection is None or not self.serial_connection.is_open:
+        if self.serial_worker is None:
             QMessageBox.warning(self, "Not Connected", "Please connect to Arduino first")
             return
 
-        # Build configuration JSON
-        config = {
-            "type": "config",
-            "inputs": []
-        }
-
-        for row in range(self.config_table.rowCount()):
-            name_widget = self.config_table.cellWidget(row, 0)
-            type_combo = self.config_table.cellWidget(row, 1)
-            pin1_combo = self.config_table.cellWidget(row, 2)
-            pin2_combo = self.config_table.cellWidget(row, 3)
-            mode_combo = self.config_table.cellWidget(row, 4)
-            key_input = self.config_table.cellWidget(row, 5)
-
-            # Validate
-            if not key_input.text().strip():
-                QMessageBox.warning(self, "Invalid Configuration",
-                                  f"Row {row + 1}: Keyboard command is required")
-                return
+        inputs = self.input_model.inputs()
+        errors = validate(inputs)
+        if errors:
+            QMessageBox.warning(self, "Invalid Configuration", "\n".join(errors[:10]))
+            return
 
-            # Parse pin values
-            pin1_text = pin1_combo.currentText()
-            pin1 = int(pin1_text.replace('A', '')) + 54 if 'A' in pin1_text else int(pin1_text)
+        # Ask the board what it holds before deciding what to send
+        inputs = [record.copy() for record in inputs]
+        self.upload_config_btn.setEnabled(False)
+        self.send_request({"type": "status"},
+                          lambda success, response: self.send_configuration(inputs, success, response))
 
-            pin2_text = pin2_combo.currentText()
-            pin2 = 0 if pin2_text == "N/A" else int(pin2_text)
+    def send_configuration(self, inputs, status_ok, status):
+        """
+        Upload a configuration, skipping it or sending only the changed rows
+        when the Arduino reports a configuration uploaded from here before.
 
-            input_config = {
-                "pin": pin1,
-                "pin2": pin2,
-                "type": self.input_types[type_combo.currentText()],
-                "mode": self.encoder_modes[mode_combo.currentText()],
-                "name": name_widget.text(),
-                "key": key_input.text().strip()
-            }
+        Args:
+            inputs (list): InputConfig records to upload
+            status_ok (bool): Whether the status request succeeded
+            status (str): Status response line
+        """
+        if self.serial_worker is None:
+            self.upload_config_btn.setEnabled(True)
+            return
 
-            # Add advanced configuration if exists
-            if row in self.advanced_configs:
-                input_config.update(self.advanced_configs[row])
-            else:
-                # Add default values for new fields
-                input_config.update({
-                    "displayType": 0,
-                    "displayClkPin": 0,
-                    "displayDataPin": 0,
-                    "displayCsPin": 0,
-                    "displayDigits": 4,
-                    "displayMin": 0,
-                    "displayMax": 9999,
-                    "buttonPin": 0,
-                    "buttonShortAction": 0,
-                    "buttonLongAction": 0,
-                    "buttonShortKey": "",
-                    "buttonLongKey": "",
-                    "longPressMs": 1000,
-                    "ledPin": 0,
-                    "mutexCount": 0,
-                    "mutexList": []
-                })
-
-            config["inputs"].append(input_config)
-
-        # Send to Arduino
-        try:
-            json_str = json.dumps(config)
-            self.serial_connection.write((json_str + '\n').encode())
-            self.log_console(f"Uploaded configuration: {len(config['inputs'])} inputs")
+        from config_upload import ConfigUpload
+        from eeprom_image import compile_image, layout_for_size
 
-            # Read response
-            QTimer.singleShot(500, self.read_arduino_response)
+        new_fingerprint = fingerprint(inputs)
+        board_fingerprint, compact, image_size = parse_status(status) if status_ok else (0, False, 0)
+        if board_fingerprint == new_fingerprint:
+            self.upload_config_btn.setEnabled(True)
+            self.log_console("Arduino already has this configuration; nothing uploaded")
+            QMessageBox.information(self, "Upload Skipped", "The Arduino already has this configuration.")
+            return
 
+        config = config_command(inputs, compact)
+        input_count = len(config['inputs'])
+        # Firmware that takes EEPROM images gets its Config struct instead of JSON to parse
+        layout = layout_for_size(image_size)
+        image = compile_image(inputs, layout.name) if layout else None
+        upload = ConfigUpload(config['inputs'], fingerprint=new_fingerprint, image=image)
+
+        old_inputs = self.get_upload_history().get(board_fingerprint) if board_fingerprint else None
+        if old_inputs is not None:
+            changes = diff_inputs(old_inputs, inputs)
+            lines = describe_changes(changes, old_inputs, inputs)
+            if len(lines) > DIFF_PREVIEW_LINES:
+                lines[DIFF_PREVIEW_LINES:] = [f"... and {len(lines) - DIFF_PREVIEW_LINES} more"]
+            answer = QMessageBox.question(
+                self, "Upload Changes",
+                f"{len(changes)} row(s) differ from the configuration on the Arduino:\n\n"
+                + "\n".join(lines) + "\n\nUpload these changes?")
+            if answer != QMessageBox.Yes:
+                self.upload_config_btn.setEnabled(True)
+                return
+            changed = [index for index, change, _ in changes if change != 'removed']
+            upload = ConfigUpload(config['inputs'], fingerprint=new_fingerprint,
+                                  base=board_fingerprint, changed=changed)
+            self.log_console(f"Uploading configuration: {len(changed)} of {input_count} inputs changed")
+        elif image is not None:
+            self.log_console(f"Uploading configuration: {input_count} inputs as a {len(image):,}-byte EEPROM image")
+        else:
+            self.log_console(f"Uploading configuration: {input_count} inputs")
+
+        self.send_request(config, lambda success, response: self.on_upload_finished(
+            success, response, input_count, inputs, new_fingerprint), upload=upload)
+
+    def on_inputs_changed(self):
+        """Keep the upload size and the live monitor in step with the table"""
+        self.update_upload_size()
+        self.input_monitor.set_inputs(self.input_model.inputs())
+
+    def update_upload_size(self):
+        """Show the upload size of the table's configuration against the firmware's parse budget"""
+        inputs = self.input_model.inputs()
+        upload_bytes, document = command_size(inputs, compact=True)
+        full_bytes, _ = command_size(inputs)
+        self.upload_size_label.setText(
+            f"{upload_bytes:,} bytes ({full_bytes:,} uncompacted) · parse {document:,}/{JSON_DOCUMENT_SIZE:,}")
+        color = "#f44336" if document > JSON_DOCUMENT_SIZE else "#666"
+        self.upload_size_label.setStyleSheet(f"color: {color}; font-size: 10px;")
+
+    def on_upload_progress(self, request_id, stored, total):
+        """Show how much of a chunked upload the Arduino has stored"""
+        self.statusBar().showMessage(f"Uploading configuration: {stored}/{total} inputs")
+
+    def on_upload_finished(self, success, response, input_count, inputs, config_fingerprint):
+        """Report the Arduino's answer to a configuration upload"""
+        self.upload_config_btn.setEnabled(True)
+        self.statusBar().clearMessage()
+
+        if success:
+            self.get_upload_history().add(config_fingerprint, inputs)
+            self.log_console(f"Uploaded configuration: {input_count} inputs")
             QMessageBox.information(self, "Upload Complete",
-                                  f"Configuration uploaded successfully!\n{len(config['inputs'])} inputs configured.")
-
-        except Exception as e:
-            QMessageBox.critical(self, "Upload Error", f"Failed to upload configuration:\n{str(e)}")
-            self.log_console(f"Upload error: {str(e)}")
+                                  f"Configuration uploaded successfully!\n{input_count} inputs configured.")
+        else:
+            QMessageBox.critical(self, "Upload Error", f"Failed to upload configuration:\n{response}")
+            self.log_console(f"Upload error: {response}")
 
     def test_selected_key(self):
         """Test the keyboard command of selected row"""
-        if self.serial_connection is None or not self.serial_connection.is_open:
+        if self.serial_worker is None:
             QMessageBox.warning(self, "Not Connected", "Please connect to Arduino first")
             return
 
-        current_row = self.config_table.currentRow()
+        current_row = self.config_table.currentIndex().row()
         if current_row < 0:
             QMessageBox.information(self, "No Selection", "Please select a row to test")
             return
 
-        key_input = self.config_table.cellWidget(current_row, 5)
-        key_command = key_input.text().strip()
+        key_command = self.input_model.input(current_row).key
 
         if not key_command:
             QMessageBox.warning(self, "Invalid Command", "Keyboard command is empty")
@@ -813,48 +785,29 @@ class ArduinoConfigurator(QMainWindow):
             "key": key_command
         }
 
-        try:
-            json_str = json.dumps(test_cmd)
-            self.serial_connection.write((json_str + '\n').encode())
-            self.log_console(f"Testing key command: {key_command}")
-
-            QTimer.singleShot(200, self.read_arduino_response)
+        self.send_request(test_cmd, self.on_test_finished)
+        self.log_console(f"Testing key command: {key_command}")
 
-        except Exception as e:
-            QMessageBox.critical(self, "Test Error", f"Failed to send test command:\n{str(e)}")
-            self.log_console(f"Test error: {str(e)}")
+    def on_test_finished(self, success, response):
+        """Report the Arduino's answer to a key test"""
+        if not success:
+            self.log_console(f"Test error: {response}")
 
     def request_status(self):
         """Request status from Arduino"""
-        if self.serial_connection is None or not self.serial_connection.is_open:
+        if self.serial_worker is None:
             return
 
-        try:
-            status_cmd = {"type": "status"}
-            json_str = json.dumps(status_cmd)
-            self.serial_connection.write((json_str + '\n').encode())
+        self.send_request({"type": "status"}, self.on_status_finished)
 
-            QTimer.singleShot(300, self.read_arduino_response)
-
-        except Exception as e:
-            self.log_console(f"Failed to request status: {str(e)}")
-
-    def read_arduino_response(self):
-        """Read and display Arduino responses"""
-        if self.serial_connection is None or not self.serial_connection.is_open:
-            return
-
-        try:
-            while self.serial_connection.in_waiting > 0:
-                line = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    self.log_console(f"Arduino: {line}")
-
-        except Exception as e:
-            self.log_console(f"Read error: {str(e)}")
+    def on_status_finished(self, success, response):
+        """Report the Arduino's answer to a status request"""
+        if not success:
+            self.log_console(f"Failed to request status: {response}")
 
     def log_console(self, message):
         """Log message to console"""
+        self.flush_console()  # Keep Arduino lines still waiting for a frame in order
         self.console.append(message)
         # Auto-scroll to bottom
         self.console.verticalScrollBar().setValue(
@@ -866,18 +819,15 @@ class ArduinoConfigurator(QMainWindow):
         if not UPDATER_AVAILABLE:
             return
 
-        try:
-            updater = Updater()
-            update_info = updater.check_for_updates()
-
-            if update_info and update_info.get('available', False):
-                latest_version = update_info['latest_version']
-                self.log_console(f"Update available: v{latest_version}")
-                self.show_update_notification(latest_version)
+        self.start_update_check(self.on_background_check_finished)
 
-        except Exception as e:
-            # Silently fail for background check
-            pass
+    def on_background_check_finished(self, update_info):
+        """Handle the result of the startup update check"""
+        # Silently ignore failures for background check
+        if update_info and update_info.get('available', False):
+            latest_version = update_info['latest_version']
+            self.log_console(f"Update available: v{latest_version}")
+            self.show_update_notification(latest_version)
 
     def check_for_updates_manual(self):
         """Manual update check (user initiated)"""
@@ -886,22 +836,41 @@ class ArduinoConfigurator(QMainWindow):
                                   "The updater module is not available.")
             return
 
-        try:
-            updater = Updater()
-            update_info = updater.check_for_updates()
-
-            if update_info and update_info.get('available', False):
-                latest_version = update_info['latest_version']
-                self.pending_update_info = update_info  # Store for perform_update
-                self.show_update_dialog(latest_version)
-            else:
-                current_version = update_info.get('current_version', 'unknown') if update_info else 'unknown'
-                QMessageBox.information(self, "Up to Date",
-                                      f"You are already using the latest version (v{current_version}).")
+        self.statusBar().showMessage("Checking for updates...")
+        self.start_update_check(self.on_manual_check_finished, force=True)
 
-        except Exception as e:
+    def on_manual_check_finished(self, update_info):
+        """Handle the result of a user-initiated update check"""
+        self.statusBar().clearMessage()
+
+        if update_info is None:
             QMessageBox.critical(self, "Update Check Failed",
-                               f"Failed to check for updates:\n{str(e)}")
+                               "Failed to check for updates. Please check your internet connection.")
+        elif update_info.get('available', False):
+            latest_version = update_info['latest_version']
+            self.pending_update_info = update_info  # Store for perform_update
+            self.show_update_dialog(latest_version)
+        else:
+            current_version = update_info.get('current_version', 'unknown')
+            QMessageBox.information(self, "Up to Date",
+                                  f"You are already using the latest version (v{current_version}).")
+
+    def start_update_check(self, on_finished, force=False):
+        """
+        Run an update check on a worker thread.
+
+        Args:
+            on_finished (callable): Called with the update info (or None) on the GUI thread
+            force (bool): Ask GitHub even if the cached release list is still fresh
+        """
+        if self.update_worker and self.update_worker.isRunning():
+            return
+
+        from update_worker import UpdateWorker
+
+        self.update_worker = UpdateWorker(force_check=force, parent=self)
+        self.update_worker.check_finished.connect(on_finished)
+        self.update_worker.start()
 
     def show_update_notification(self, latest_version):
         """Show non-intrusive update notification"""
@@ -933,31 +902,89 @@ class ArduinoConfigurator(QMainWindow):
             QMessageBox.warning(self, "Update Error", "No download URL available.")
             return
 
-        progress = QProgressDialog("Downloading update...", "Cancel", 0, 0, self)
-        progress.setWindowModality(Qt.WindowModal)
-        progress.setWindowTitle("Updating")
-        progress.show()
+        if self.update_worker and self.update_worker.isRunning():
+            return
 
-        try:
-            updater = Updater()
-            success = updater.download_and_install_update(download_url)
-
-            progress.close()
-
-            if success:
-                QMessageBox.information(
-                    self, "Update Complete",
-                    "Update installed successfully!\n\nPlease restart the application."
-                )
-            else:
-                QMessageBox.warning(
-                    self, "Update Failed",
-                    "Failed to install update. Please try again later."
-                )
+        from update_worker import UpdateWorker
+
+        self.update_progress = QProgressDialog("Downloading update...", "Cancel", 0, 100, self)
+        self.update_progress.setWindowModality(Qt.WindowModal)
+        self.update_progress.setWindowTitle("Updating")
+        self.update_progress.setAutoClose(False)
+        self.update_progress.setAutoReset(False)
+        self.update_progress.setMinimumDuration(0)
+
+        self.update_worker = UpdateWorker(self.pending_update_info, parent=self)
+        self.update_worker.progress.connect(self.on_update_progress)
+        self.update_worker.install_finished.connect(self.on_update_finished)
+        self.update_progress.canceled.connect(self.update_worker.cancel)
+        self.update_worker.start()
+        self.update_progress.show()
+
+    def on_update_progress(self, percent, status):
+        """Show download/install progress from the update worker"""
+        from updater import INSTALL_START_PROGRESS
+
+        self.update_progress.setValue(percent)
+        self.update_progress.setLabelText(status)
+        if percent >= INSTALL_START_PROGRESS:
+            # Switching to the new version now; it can no longer be cancelled
+            self.update_progress.setCancelButton(None)
+
+    def on_update_finished(self, success):
+        """Report the result of an update install"""
+        cancelled = self.update_progress.wasCanceled()
+        self.update_progress.close()
+
+        if success:
+            QMessageBox.information(
+                self, "Update Complete",
+                "Update installed successfully!\n\nPlease restart the application."
+            )
+        elif cancelled:
+            self.log_console("Update cancelled")
+        else:
+            QMessageBox.warning(
+                self, "Update Failed",
+                "Failed to install update. Please try again later."
+            )
+
+    def restore_previous_version(self):
+        """Switch back to the version that was installed before the last update"""
+        if self.update_worker and self.update_worker.isRunning():
+            QMessageBox.information(self, "Update in Progress", "Please wait for the update to finish.")
+            return
+
+        reply = QMessageBox.question(
+            self, "Restore Previous Version",
+            "Switch back to the version that was installed before the last update?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        from updater import Updater
 
+        try:
+            restored = Updater().rollback()
         except Exception as e:
-            progress.close()
-            QMessageBox.critical(self, "Update Error", f"Update failed:\n{str(e)}")
+            QMessageBox.warning(self, "Restore Failed", f"Could not restore the previous version: {e}")
+            return
+
+        if restored is None:
+            QMessageBox.information(self, "Restore Previous Version", "There is no previous version to restore.")
+        else:
+            QMessageBox.information(self, "Version Restored",
+                                    "The previous version was restored.\n\nPlease restart the application.")
+
+    def closeEvent(self, event):
+        """Stop the background workers before the window closes"""
+        if self.serial_worker:
+            self.disconnect_from_arduino()
+        if self.update_worker and self.update_worker.isRunning():
+            self.update_worker.cancel()
+            self.update_worker.wait()
+        super().closeEvent(event)
 
     def show_about(self):
         """Show about dialog"""
@@ -0,0 +1,60 @@
+"""
+Configuration Model Benchmark
+
+Generates a batch of random full-size configurations and times the
+headless pipeline the GUI and the config_model CLI use: loading wire-format
+inputs into records, validating them and serializing the config command.
+
+Usage:
+    python bench_config_model.py                 # 2000 configurations of 40 inputs
+    python bench_config_model.py -n 10000 --inputs 20
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config_model import MAX_INPUTS, generate_inputs, load_inputs, validate, serialize
+
+
+def timed(label, count, function):
+    """Run `function` once and print its throughput; returns its result."""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<12} {elapsed * 1000:8.1f} ms  ({count / elapsed:,.0f} configurations/s)")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless configuration model benchmark')
+    parser.add_argument('-n', '--count', type=int, default=2000, help='Configurations (default: 2000)')
+    parser.add_argument('--inputs', type=int, default=MAX_INPUTS,
+                        help=f'Inputs per configuration (default: {MAX_INPUTS})')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed (default: 1)')
+
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{args.count} configurations of {args.inputs} inputs:")
+
+    configs = timed("generate", args.count,
+                    lambda: [generate_inputs(args.inputs, rng) for _ in range(args.count)])
+    lines = timed("serialize", args.count, lambda: [serialize(inputs) for inputs in configs])
+    parsed = [json.loads(line) for line in lines]
+    loaded = timed("load", args.count, lambda: [load_inputs(data) for data in parsed])
+    errors = timed("validate", args.count, lambda: [validate(inputs) for inputs in loaded])
+
+    invalid = sum(1 for result in errors if result)
+    size = sum(len(line) for line in lines) / len(lines)
+    print(f"\n{invalid} invalid, {size:,.0f} bytes per config command on average")
+    sys.exit(1 if invalid else 0)
+
+
+if __name__ == '__main__':
+    main()
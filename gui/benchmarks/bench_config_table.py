@@ -0,0 +1,132 @@
+"""
+Input Table Benchmark
+
+Compares the input table built the old way (a QTableWidget with six live
+cell widgets per row, pin combo boxes filled per row) with the
+InputTableModel + delegates view: time to load a profile, sort it and
+bulk-edit a column, and the number of widgets each one keeps alive.
+
+Runs without a display (offscreen platform).
+
+Usage:
+    python bench_config_table.py                 # 40 rows (a full board)
+    python bench_config_table.py -n 1000 --repeat 3
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableView, QComboBox, QLineEdit
+
+from config_model import INPUT_TYPES, ENCODER_MODES, PIN_LABELS, PIN2_LABELS, generate_inputs, pin_label
+from config_table_model import (
+    InputTableModel, ChoiceDelegate, TextDelegate, HEADERS, TYPE_NAMES, MODE_NAMES,
+    COLUMN_NAME, COLUMN_TYPE, COLUMN_PIN, COLUMN_PIN2, COLUMN_MODE, COLUMN_KEY
+)
+
+
+def widget_table(records):
+    """Fill a QTableWidget the way add_input_row used to, one row at a time."""
+    table = QTableWidget()
+    table.setColumnCount(len(HEADERS))
+    table.setHorizontalHeaderLabels(HEADERS)
+    for row, record in enumerate(records):
+        table.insertRow(row)
+        table.setCellWidget(row, COLUMN_NAME, QLineEdit(record.name))
+
+        type_combo = QComboBox()
+        type_combo.addItems(list(INPUT_TYPES))
+        type_combo.setCurrentText(TYPE_NAMES[record.type])
+        table.setCellWidget(row, COLUMN_TYPE, type_combo)
+
+        pin1_combo = QComboBox()
+        pin1_combo.addItems(PIN_LABELS)
+        pin1_combo.setCurrentText(pin_label(record.pin))
+        table.setCellWidget(row, COLUMN_PIN, pin1_combo)
+
+        pin2_combo = QComboBox()
+        pin2_combo.addItems(PIN2_LABELS)
+        pin2_combo.setCurrentText(pin_label(record.pin2))
+        table.setCellWidget(row, COLUMN_PIN2, pin2_combo)
+
+        mode_combo = QComboBox()
+        mode_combo.addItems(list(ENCODER_MODES))
+        mode_combo.setCurrentText(MODE_NAMES[record.mode])
+        table.setCellWidget(row, COLUMN_MODE, mode_combo)
+
+        table.setCellWidget(row, COLUMN_KEY, QLineEdit(record.key))
+    table.show()
+    return table
+
+
+def model_table(records):
+    """Load the same records into the model-backed view."""
+    view = QTableView()
+    model = InputTableModel(view)
+    view.setModel(model)
+    choice_delegate = ChoiceDelegate(view)
+    text_delegate = TextDelegate(view)
+    for column in (COLUMN_TYPE, COLUMN_PIN, COLUMN_PIN2, COLUMN_MODE):
+        view.setItemDelegateForColumn(column, choice_delegate)
+    for column in (COLUMN_NAME, COLUMN_KEY):
+        view.setItemDelegateForColumn(column, text_delegate)
+    model.set_inputs(records)
+    view.show()
+    return view
+
+
+def best_time(repeat, function):
+    """Best wall time of `repeat` calls, in ms, and the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        QApplication.processEvents()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Widget-per-cell vs model/view input table benchmark')
+    parser.add_argument('-n', '--rows', type=int, default=40, help='Rows to load (default: 40)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement, best is kept (default: 3)')
+
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = random.Random(1)
+    records = []
+    while len(records) < args.rows:
+        records.extend(generate_inputs(min(40, args.rows - len(records)), rng))
+
+    print(f"{args.rows} rows:\n")
+
+    load_ms, table = best_time(args.repeat, lambda: widget_table(records))
+    widgets = len(table.findChildren(QComboBox)) + len(table.findChildren(QLineEdit))
+    print(f"  QTableWidget + cell widgets: load {load_ms:8.1f} ms, {widgets} cell widgets alive")
+    table.close()
+
+    load_ms, view = best_time(args.repeat, lambda: model_table([record.copy() for record in records]))
+    model = view.model()
+    sort_ms, _ = best_time(args.repeat, lambda: model.sort(COLUMN_PIN, Qt.DescendingOrder))
+    rows = range(model.rowCount())
+    edit_ms, _ = best_time(args.repeat, lambda: model.set_values(rows, COLUMN_TYPE, "Rotary Encoder"))
+    widgets = len(view.findChildren(QComboBox)) + len(view.findChildren(QLineEdit))
+    print(f"  InputTableModel + delegates: load {load_ms:8.1f} ms, {widgets} cell widgets alive")
+    print(f"                               sort {sort_ms:8.1f} ms, bulk edit of every row {edit_ms:.1f} ms")
+    view.close()
+
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
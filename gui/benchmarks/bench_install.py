@@ -0,0 +1,140 @@
+"""
+Update Install Benchmark
+
+Stages a synthetic release with thousands of files the way the updater
+does (zip members streamed out, untouched files hard-linked from the
+active version) and compares sequential and parallel install time.
+
+On Windows every file written is scanned by antivirus, which adds a fixed
+cost per file that parallel workers overlap; --scan-delay simulates it on
+other systems.
+
+Usage:
+    python bench_install.py                          # 3000 files, 1 vs default vs 8 workers
+    python bench_install.py -n 5000 --workers 1 4 8 16
+    python bench_install.py --scan-delay 2           # 2 ms per file written
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import zipfile
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from updater import Updater, INSTALL_WORKERS
+from install_layout import InstallLayout
+
+
+class ScanDelayUpdater(Updater):
+    """Updater that waits after every file it writes, like an on-access scanner."""
+
+    def __init__(self, scan_delay, **kwargs):
+        super().__init__(**kwargs)
+        self.scan_delay = scan_delay
+
+    def _extract_member(self, *args):
+        super()._extract_member(*args)
+        time.sleep(self.scan_delay)
+
+    def _copy_file(self, source, dest_path, *args):
+        super()._copy_file(source, dest_path, *args)
+        if os.stat(dest_path).st_nlink == 1:  # A new link writes no data to scan
+            time.sleep(self.scan_delay)
+
+
+def make_release(directory, count, changed_fraction, seed=1):
+    """
+    Create an active install and a release zip of `count` files.
+
+    Returns:
+        tuple: (active root, zip path, paths that differ in the release)
+    """
+    rng = random.Random(seed)
+    active_root = Path(directory) / 'active'
+    zip_path = Path(directory) / 'release.zip'
+    changed = []
+
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for i in range(count):
+            rel_path = f'gui/module_{i // 100:02d}/file_{i:05d}.py'
+            data = os.urandom(rng.randint(512, 16384))
+            path = active_root / rel_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            if rng.random() < changed_fraction:
+                changed.append(rel_path)
+                path.write_bytes(data[::-1])
+            else:
+                path.write_bytes(data)
+            archive.writestr('seths-crap/' + rel_path, data)
+
+    return active_root, zip_path, changed
+
+
+def run_install(updater, active_root, zip_path, only):
+    """Stage one version; returns (seconds, progress reports)."""
+    layout = InstallLayout(active_root)
+    staging = layout.begin('bench')
+    reports = []
+
+    try:
+        start = time.perf_counter()
+        with zipfile.ZipFile(zip_path) as archive:
+            members = updater._update_members(archive, only)
+            updater._stage_version(archive, members, active_root, staging,
+                                   callback=lambda percent, status: reports.append(percent))
+        elapsed = time.perf_counter() - start
+    finally:
+        layout.abort(staging)
+        shutil.rmtree(layout.versions_dir, ignore_errors=True)
+
+    return elapsed, len(reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sequential vs parallel update install benchmark')
+    parser.add_argument('-n', '--count', type=int, default=3000, help='Files in the release (default: 3000)')
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, INSTALL_WORKERS, 8}),
+                        help=f'Worker counts to compare (default: 1, {INSTALL_WORKERS} (the updater default) and 8)')
+    parser.add_argument('--changed', type=float, default=0.1,
+                        help='Fraction of files changed for the delta scenario (default: 0.1)')
+    parser.add_argument('--scan-delay', type=float, default=0.0,
+                        help='Simulated antivirus cost per file written, in ms (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement, best is kept (default: 3)')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_install_') as directory:
+        active_root, zip_path, changed = make_release(directory, args.count, args.changed)
+        print(f"Release: {args.count} files, {zip_path.stat().st_size / 1e6:.1f} MB zipped, "
+              f"{len(changed)} changed; scan delay {args.scan_delay} ms/file\n")
+
+        scenarios = [
+            ('full (all members extracted)', None),
+            ('delta (changed extracted, rest linked)', changed),
+        ]
+
+        for label, only in scenarios:
+            print(f"{label}:")
+            baseline = None
+            for workers in args.workers:
+                updater = ScanDelayUpdater(args.scan_delay / 1000.0, install_workers=workers,
+                                           cache_dir=directory)
+                runs = [run_install(updater, active_root, zip_path, only) for _ in range(args.repeat)]
+                elapsed = min(seconds for seconds, _ in runs)
+                reports = runs[0][1]
+                baseline = baseline or elapsed
+                print(f"  {workers:>2} worker(s): {elapsed * 1000:8.1f} ms  "
+                      f"({args.count / elapsed:,.0f} files/s, {baseline / elapsed:.2f}x, "
+                      f"{reports} progress reports){'  <- default' if workers == INSTALL_WORKERS else ''}")
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Line Reader Benchmark for the Keyboard Daemon
+
+Replays a recorded serial byte stream through KeyboardDaemon.read_loop (or
+the original 1-byte reader) and the daemon's queue and dispatcher, and
+reports commands/sec and p50/p99 line-to-dispatch latency as measured by
+serial_recorder.replay_through_daemon.
+
+Usage:
+    python bench_line_reader.py                      # synthetic encoder burst
+    python bench_line_reader.py capture.bin          # raw bytes captured from the port
+    python bench_line_reader.py --legacy             # also run the old 1-byte reader
+"""
+
+import os
+import sys
+import time
+import argparse
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from serial_recorder import replay_through_daemon, percentile
+
+
+def synthetic_stream(count):
+    """Build an encoder-burst style stream of `count` commands."""
+    commands = [b'CTRL+UPARROW\r\n', b'CTRL+DOWNARROW\r\n', b'CTRL+F\r\n', b'CTRL+F5\r\n']
+    return b''.join(commands[i % len(commands)] for i in range(count))
+
+
+def legacy_read_loop(daemon, on_line):
+    """The original reader: 1-byte reads, per-byte decode, 1 ms sleep per iteration."""
+    input_buffer = ""
+    while daemon.running:
+        if daemon.serial_connection.in_waiting > 0:
+            char = daemon.serial_connection.read(1).decode('utf-8', errors='ignore')
+            if char == '\n':
+                if input_buffer:
+                    on_line(input_buffer)
+                    input_buffer = ""
+            else:
+                input_buffer += char
+                if len(input_buffer) > 100:
+                    input_buffer = ""
+        else:
+            daemon.serial_connection.read(1)  # Lets the replay port signal end of stream
+        time.sleep(0.001)
+
+
+def run_benchmark(data, packet_size, loop=None):
+    """
+    Replay `data` through a daemon and collect dispatch statistics.
+
+    Args:
+        data (bytes): Raw board output
+        packet_size (int): Bytes per simulated USB packet
+        loop (callable): Reader to use instead of KeyboardDaemon.read_loop
+
+    Returns:
+        dict: commands, elapsed, commands_per_sec, p50_us, p99_us
+    """
+    # The daemon prints every key it sends; keep that off the report.
+    # The queue is large enough that no line is dropped.
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = replay_through_daemon([data], packet_size, read_loop=loop, queue_size=1 << 20)
+
+    latencies = result['latencies']
+    return {
+        'commands': result['commands'],
+        'elapsed': result['elapsed'],
+        'commands_per_sec': result['commands_per_sec'],
+        'p50_us': percentile(latencies, 50) * 1e6,
+        'p99_us': percentile(latencies, 99) * 1e6,
+    }
+
+
+def print_result(label, result):
+    print(f"{label}:")
+    print(f"  Commands:      {result['commands']}")
+    print(f"  Elapsed:       {result['elapsed']:.3f} s")
+    print(f"  Throughput:    {result['commands_per_sec']:,.0f} commands/sec")
+    print(f"  p50 latency:   {result['p50_us']:.1f} us")
+    print(f"  p99 latency:   {result['p99_us']:.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyboard daemon line reader benchmark')
+    parser.add_argument('capture', nargs='?', help='Raw serial byte capture to replay')
+    parser.add_argument('-n', '--count', type=int, default=100000,
+                        help='Synthetic command count when no capture is given (default: 100000)')
+    parser.add_argument('--packet-size', type=int, default=64, help='Bytes per simulated USB packet (default: 64)')
+    parser.add_argument('--legacy', action='store_true', help='Also benchmark the original 1-byte reader')
+    parser.add_argument('--legacy-count', type=int, default=200,
+                        help='Commands replayed through the legacy reader (default: 200)')
+
+    args = parser.parse_args()
+
+    if args.capture:
+        data = Path(args.capture).read_bytes()
+    else:
+        data = synthetic_stream(args.count)
+
+    print(f"Replaying {len(data):,} bytes in {args.packet_size}-byte packets\n")
+    print_result("Bulk line reader", run_benchmark(data, args.packet_size))
+
+    if args.legacy:
+        legacy_data = synthetic_stream(args.legacy_count) if not args.capture else data[:args.legacy_count * 16]
+        print()
+        print_result("Legacy 1-byte reader", run_benchmark(legacy_data, args.packet_size, legacy_read_loop))
+
+
+if __name__ == '__main__':
+    main()
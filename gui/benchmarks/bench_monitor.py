@@ -0,0 +1,120 @@
+"""
+Live Input Stream Benchmark
+
+Feeds a synthetic stream of key commands (as the firmware emulator's event
+generator produces them) into the configurator window the old way - every
+line appended to the console and scrolled into view as it arrives - and
+the current way - each serial read handed to the live monitor and the
+console buffer as one batch, with the monitor table and the console
+updated once per frame - and reports the GUI thread's share of each
+second of stream and the slowest single read.
+
+Runs without a display (offscreen platform). Stream time is simulated, so
+the frame interval is applied per batch rather than by the frame timers.
+
+Usage:
+    python bench_monitor.py                      # 1000 lines/s for 5 s
+    python bench_monitor.py --rate 5000 --seconds 10 --pattern encoder
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+import arduino_configurator
+from config_model import generate_inputs
+from firmware_emulator import FirmwareEmulator
+from input_monitor import MONITOR_FPS
+
+READ_INTERVAL = 0.01  # Seconds of stream per serial read
+
+
+def make_window(records):
+    """Build the configurator window with `records` loaded and the update check disabled."""
+    arduino_configurator.UPDATER_AVAILABLE = False
+    window = arduino_configurator.ArduinoConfigurator()
+    window.input_model.set_inputs(records)
+    window.show()
+    QApplication.processEvents()
+    return window
+
+
+def stream_batches(records, rate, seconds, pattern, burst):
+    """Split `seconds` of a `rate` lines/s event stream into per-read batches."""
+    emulator = FirmwareEmulator(inputs=[record.to_dict() for record in records])
+    emulator.config_loaded = True
+    lines = emulator.event_lines(pattern, burst)
+    per_read = max(1, round(rate * READ_INTERVAL))
+    return [[next(lines).decode().strip() for _ in range(per_read)]
+            for _ in range(round(seconds / READ_INTERVAL))]
+
+
+def run_per_line(window, batches):
+    """The old path: one console append and scroll per line."""
+    slowest = 0.0
+    start = time.perf_counter()
+    for batch in batches:
+        read_start = time.perf_counter()
+        for line in batch:
+            window.log_console(f"Arduino: {line}")
+        QApplication.processEvents()
+        slowest = max(slowest, time.perf_counter() - read_start)
+    return time.perf_counter() - start, slowest
+
+
+def run_batched(window, batches):
+    """The current path: one batch per read, the monitor and console drawn once per frame."""
+    window.input_monitor.frame_timer.stop()
+    reads_per_frame = max(1, round(1 / MONITOR_FPS / READ_INTERVAL))
+    slowest = 0.0
+    start = time.perf_counter()
+    for index, batch in enumerate(batches, 1):
+        read_start = time.perf_counter()
+        window.on_arduino_lines(batch)
+        window.console_timer.stop()
+        window.input_monitor.frame_timer.stop()
+        if index % reads_per_frame == 0:
+            window.input_monitor.render_frame()
+            window.flush_console()
+        QApplication.processEvents()
+        slowest = max(slowest, time.perf_counter() - read_start)
+    return time.perf_counter() - start, slowest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-line vs batched live input stream benchmark')
+    parser.add_argument('--rate', type=int, default=1000, help='Lines per second (default: 1000)')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Seconds of stream (default: 5)')
+    parser.add_argument('--pattern', choices=['buttons', 'encoder', 'pot', 'mixed'], default='mixed',
+                        help='Which inputs generate events (default: mixed)')
+    parser.add_argument('--burst', type=int, default=4, help='Commands per encoder spin (default: 4)')
+    parser.add_argument('--inputs', type=int, default=40, help='Configured inputs (default: 40)')
+
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    records = generate_inputs(args.inputs, random.Random(1))
+    batches = stream_batches(records, args.rate, args.seconds, args.pattern, args.burst)
+    lines = sum(len(batch) for batch in batches)
+    print(f"{lines} lines over {args.seconds:g} s of stream, {len(batches[0])} per read:\n")
+
+    for label, run in (('per line', run_per_line), ('batched', run_batched)):
+        window = make_window(records)
+        elapsed, slowest = run(window, batches)
+        print(f"  {label:<10} {elapsed * 1000:8.0f} ms  {elapsed / args.seconds * 100:6.1f}% of the GUI thread  "
+              f"slowest read {slowest * 1000:6.1f} ms  {window.console.document().blockCount()} console lines")
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+
+
+if __name__ == '__main__':
+    main()
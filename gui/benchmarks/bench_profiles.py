@@ -0,0 +1,96 @@
+"""
+Profile Encoding Benchmark
+
+Saves and loads the same full-size profiles as JSON and as binary, and
+reports file size and save/load throughput of each encoding, then times
+populating the input table from a loaded profile in one model reset
+versus one row insert at a time.
+
+Usage:
+    python bench_profiles.py                  # 500 profiles of 40 inputs
+    python bench_profiles.py -n 2000 --inputs 20
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config_model import MAX_INPUTS, generate_inputs
+from profiles import save_profile, load_profile
+
+
+def measure(function, count):
+    """Run `function` once; returns (milliseconds, `count` per second)."""
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000, count / elapsed
+
+
+def populate_table(inputs, repeat):
+    """Best times (ms) for filling InputTableModel in one reset vs row by row."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication, QTableView
+    from config_table_model import InputTableModel
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    view = QTableView()
+    model = InputTableModel(view)
+    view.setModel(model)
+    view.show()
+
+    def batch():
+        model.set_inputs(inputs)
+        app.processEvents()
+
+    def row_by_row():
+        model.set_inputs([])
+        for record in inputs:
+            model.append_input(record)
+            app.processEvents()  # What a GUI slot per row amounts to
+
+    results = []
+    for function in (batch, row_by_row):
+        results.append(min(measure(function, 1)[0] for _ in range(repeat)))
+    view.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON vs binary profile benchmark')
+    parser.add_argument('-n', '--count', type=int, default=500, help='Profiles (default: 500)')
+    parser.add_argument('--inputs', type=int, default=MAX_INPUTS,
+                        help=f'Inputs per profile (default: {MAX_INPUTS})')
+    parser.add_argument('--no-gui', action='store_true', help='Skip the table population measurement')
+
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    profiles = [generate_inputs(args.inputs, rng) for _ in range(args.count)]
+    print(f"{args.count} profiles of {args.inputs} inputs:\n")
+
+    with tempfile.TemporaryDirectory(prefix='bench_profiles_') as directory:
+        for label, suffix in (('JSON', '.json'), ('binary', '.aicp')):
+            paths = [Path(directory) / f'profile-{number:04d}{suffix}' for number in range(args.count)]
+
+            save_ms, save_rate = measure(
+                lambda: [save_profile(path, inputs) for path, inputs in zip(paths, profiles)], args.count)
+            load_ms, load_rate = measure(lambda: [load_profile(path) for path in paths], args.count)
+            size = sum(path.stat().st_size for path in paths) / args.count
+            print(f"  {label:<7} {size:8,.0f} bytes/profile   save {save_rate:8,.0f}/s   "
+                  f"load {load_rate:8,.0f}/s ({load_ms / args.count:.3f} ms each)")
+
+    if not args.no_gui:
+        batch_ms, row_ms = populate_table(profiles[0], repeat=5)
+        print(f"\nTable population ({args.inputs} rows): one reset {batch_ms:.2f} ms, "
+              f"row by row {row_ms:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
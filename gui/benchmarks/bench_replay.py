@@ -0,0 +1,92 @@
+"""
+End-to-End Replay Benchmark for the Keyboard Daemon
+
+Replays serial traffic logs (written with keyboard_daemon.py --record)
+through the daemon's full path - reader, command queue, dispatcher and
+command table - against a fake keyboard, and reports throughput and
+latency percentiles per scenario.
+
+Usage:
+    python bench_replay.py                       # built-in synthetic scenarios
+    python bench_replay.py capture.srlog ...     # recorded sessions
+    python bench_replay.py --realtime capture.srlog
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from serial_recorder import (
+    SerialRecorder, DIRECTION_RX, received_chunks, replay_through_daemon, percentile
+)
+
+
+def write_synthetic_log(path, lines, chunk_lines=4):
+    """Record a synthetic board session (no real timing) to `path`."""
+    recorder = SerialRecorder(path)
+    recorder.record(DIRECTION_RX, b'Configuration loaded from EEPROM\r\nArduino Mega Solo Input Handler Ready\r\n')
+    for i in range(0, len(lines), chunk_lines):
+        recorder.record(DIRECTION_RX, b''.join(lines[i:i + chunk_lines]))
+    recorder.close()
+
+
+def synthetic_scenarios(directory, count):
+    """Create the built-in scenario logs and return {name: path}."""
+    scenarios = {
+        'encoder-burst': [b'CTRL+UPARROW\r\n'] * count,
+        'mixed-buttons': [(b'CTRL+%c\r\n' % (ord('A') + i % 26)) for i in range(count)],
+        'noisy-stream': [b'CTRL+F5\r\n' if i % 3 else b'JSON parse error: InvalidInput\r\n' for i in range(count)],
+    }
+    paths = {}
+    for name, lines in scenarios.items():
+        path = os.path.join(directory, f'{name}.srlog')
+        write_synthetic_log(path, lines)
+        paths[name] = path
+    return paths
+
+
+def run_scenario(name, path, packet_size, realtime):
+    # The daemon prints every key it sends; keep that off the report
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        result = replay_through_daemon(received_chunks(path), packet_size, realtime, queue_size=1 << 20)
+
+    latencies = result['latencies']
+    print(f"{name}:")
+    print(f"  Lines:         {result['commands']}  (hotkeys sent: {len(result['sent'])})")
+    print(f"  Elapsed:       {result['elapsed']:.3f} s")
+    print(f"  Throughput:    {result['commands_per_sec']:,.0f} lines/sec")
+    print(f"  p50 latency:   {percentile(latencies, 50) * 1e6:.1f} us")
+    print(f"  p90 latency:   {percentile(latencies, 90) * 1e6:.1f} us")
+    print(f"  p99 latency:   {percentile(latencies, 99) * 1e6:.1f} us")
+    print(f"  max latency:   {percentile(latencies, 100) * 1e6:.1f} us")
+    print(f"  dropped:       {result['stats']['dropped']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Keyboard daemon end-to-end replay benchmark')
+    parser.add_argument('logs', nargs='*', help='Serial traffic logs to replay')
+    parser.add_argument('-n', '--count', type=int, default=50000,
+                        help='Lines per synthetic scenario (default: 50000)')
+    parser.add_argument('--packet-size', type=int, default=64, help='Bytes per simulated USB packet (default: 64)')
+    parser.add_argument('--realtime', action='store_true', help='Keep the recorded timing')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='bench_replay_') as directory:
+        if args.logs:
+            scenarios = {Path(log).name: log for log in args.logs}
+        else:
+            scenarios = synthetic_scenarios(directory, args.count)
+
+        for name, path in scenarios.items():
+            run_scenario(name, path, args.packet_size, args.realtime)
+            print()
+
+
+if __name__ == '__main__':
+    main()
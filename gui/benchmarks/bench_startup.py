@@ -0,0 +1,97 @@
+"""
+GUI Cold-Start Import Benchmark
+
+Imports the GUI module in fresh interpreters with `python -X importtime`,
+reports the import cost and the slowest modules, and fails (exit status 1)
+when the median exceeds the budget or when a module that should be loaded
+on first use (updater, serial port enumeration, dialogs) is imported at
+startup.
+
+Usage:
+    python bench_startup.py                  # 100 ms budget, 7 runs
+    python bench_startup.py --budget-ms 80 --runs 15
+    python bench_startup.py --top 25         # show more of the slowest imports
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+GUI_DIR = Path(__file__).parent.parent
+
+# Must not be imported before the first frame is shown
+DEFERRED_MODULES = (
+    'updater', 'update_worker', 'release_manifest', 'install_layout',
+    'serial', 'serial.tools.list_ports', 'serial_worker',
+    'advanced_settings_dialog',
+    'zipfile', 'urllib.request', 'http.client', 'subprocess', 'concurrent.futures',
+)
+
+
+def import_times(module):
+    """
+    Import `module` in a new interpreter with -X importtime.
+
+    Returns:
+        dict: {module name: (self microseconds, cumulative microseconds)}
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(GUI_DIR), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        universal_newlines=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE='')
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # "import time:       519 |       4334 |     hashlib"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GUI cold-start import-time benchmark')
+    parser.add_argument('--module', default='arduino_configurator', help='Module to import (default: arduino_configurator)')
+    parser.add_argument('--budget-ms', type=float, default=100.0, help='Median import-time budget (default: 100 ms)')
+    parser.add_argument('--runs', type=int, default=7, help='Fresh interpreters to measure (default: 7)')
+    parser.add_argument('--top', type=int, default=10, help='Slowest modules to list (default: 10)')
+
+    args = parser.parse_args()
+
+    import_times(args.module)  # Warm-up: compiles .pyc files and fills the OS cache
+    runs = [import_times(args.module) for _ in range(args.runs)]
+
+    totals = sorted(times[args.module][1] / 1000.0 for times in runs)
+    median = totals[len(totals) // 2]
+
+    print(f"import {args.module}: median {median:.1f} ms, min {totals[0]:.1f} ms, "
+          f"max {totals[-1]:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)\n")
+
+    last = runs[-1]
+    print("Slowest modules (self time, last run):")
+    for name, (self_us, cumulative_us) in sorted(last.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000.0:7.1f} ms  {name}")
+    print()
+
+    failed = False
+    early = [name for name in DEFERRED_MODULES if name in last]
+    if early:
+        print(f"FAIL: imported at startup but should load on first use: {', '.join(early)}")
+        failed = True
+    if median > args.budget_ms:
+        print(f"FAIL: cold-start import time {median:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print("OK: within budget, no deferred modules imported")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Configuration Upload Benchmark
+
+Uploads generated configurations to the firmware emulator over its pty,
+with the chunked protocol at several credit and chunk sizes (with and
+without dropped/corrupted chunks) and with the single-line command, in
+the full and the compact input encoding and as an EEPROM image, and
+reports time, throughput and retransmissions for each.
+
+The emulator consumes host data at the board's baud rate by default, so
+times are comparable to a real Mega at 115200 baud.
+
+Usage:
+    python bench_upload.py                    # 40 inputs at 115200 baud
+    python bench_upload.py --inputs 20 --baud 0 --repeat 5
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serial
+
+from config_model import MAX_INPUTS, generate_inputs
+from config_upload import upload_config, upload_legacy
+from eeprom_image import compile_image
+from firmware_emulator import FirmwareEmulator
+
+# (label, credits, max payload, drop rate, corrupt rate, encoding)
+SCENARIOS = (
+    ('1 credit, 512 B', 1, 512, 0.0, 0.0, 'full'),
+    ('2 credits, 512 B', 2, 512, 0.0, 0.0, 'full'),
+    ('4 credits, 512 B', 4, 512, 0.0, 0.0, 'full'),
+    ('4 credits, 1024 B', 4, 1024, 0.0, 0.0, 'full'),
+    ('2 credits, 512 B, 5% lost', 2, 512, 0.05, 0.0, 'full'),
+    ('2 credits, 512 B, 5% corrupt', 2, 512, 0.0, 0.05, 'full'),
+    ('compact, 2 credits, 512 B', 2, 512, 0.0, 0.0, 'compact'),
+    ('compact, 5% corrupt', 2, 512, 0.0, 0.05, 'compact'),
+    ('image, 2 credits, 512 B', 2, 512, 0.0, 0.0, 'image'),
+    ('image, 5% corrupt', 2, 512, 0.0, 0.05, 'image'),
+)
+
+
+def run_upload(inputs, baud, credits=2, max_payload=512, drop_rate=0.0, corrupt_rate=0.0, legacy=False,
+               image=None):
+    """
+    Upload once to a fresh emulator.
+
+    Returns:
+        tuple: (success, seconds, ConfigUpload or None, response message)
+    """
+    emulator = FirmwareEmulator(upload_credits=credits, max_payload=max_payload, baud=baud or None)
+    emulator.drop_rate = drop_rate
+    emulator.corrupt_rate = corrupt_rate
+    emulator.start()
+    try:
+        with serial.Serial(emulator.port, 115200, timeout=0.01) as connection:
+            time.sleep(0.2)  # Let the emulated board "reset"
+            connection.reset_input_buffer()
+            start = time.perf_counter()
+            if legacy:
+                success, message = upload_legacy(connection, inputs)
+                upload = None
+            else:
+                upload = upload_config(connection, inputs, timeout=60, image=image)
+                success, message = upload.success, upload.message
+            elapsed = time.perf_counter() - start
+        if success and len(emulator.inputs) != len(inputs):
+            success, message = False, f"board stored {len(emulator.inputs)} inputs"
+        return success, elapsed, upload, message
+    finally:
+        emulator.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunked vs single-line configuration upload benchmark')
+    parser.add_argument('--inputs', type=int, default=MAX_INPUTS,
+                        help=f'Inputs per configuration (default: {MAX_INPUTS})')
+    parser.add_argument('--baud', type=int, default=115200, help='Emulated line speed, 0 = unlimited (default: 115200)')
+    parser.add_argument('--repeat', type=int, default=3, help='Uploads per scenario, best is kept (default: 3)')
+
+    args = parser.parse_args()
+
+    records = generate_inputs(args.inputs, random.Random(1))
+    encodings = {'full': [record.to_dict() for record in records],
+                 'compact': [record.to_compact() for record in records]}
+    encodings['image'] = encodings['compact']
+    image = compile_image(records, 'solo')  # The emulator runs the solo sketch
+    print(f"{args.inputs} inputs at {args.baud or 'unlimited'} baud:\n")
+
+    for label, credits, max_payload, drop_rate, corrupt_rate, encoding in SCENARIOS:
+        best = None
+        for _ in range(args.repeat):
+            success, elapsed, upload, message = run_upload(
+                encodings[encoding], args.baud, credits, max_payload, drop_rate, corrupt_rate,
+                image=image if encoding == 'image' else None)
+            if not success:
+                print(f"  {label:<30} FAILED: {message}")
+                break
+            if best is None or elapsed < best[0]:
+                best = (elapsed, upload)
+        else:
+            elapsed, upload = best
+            stats = upload.stats
+            print(f"  {label:<30} {elapsed * 1000:7.0f} ms  {stats['bytes_sent'] / elapsed / 1024:6.1f} KB/s  "
+                  f"{stats['chunks_sent']:3} chunks ({stats['retransmits']} resent)")
+
+    # The single-line command: the full configuration, then halved until it fits the board
+    for compact in (False, True):
+        count = args.inputs
+        while count:
+            success, elapsed, _, message = run_upload(
+                encodings['compact' if compact else 'full'][:count], args.baud, legacy=True)
+            label = f"single line{', compact' if compact else ''}, {count} inputs"
+            if success:
+                print(f"  {label:<30} {elapsed * 1000:7.0f} ms")
+                break
+            print(f"  {label:<30} FAILED: {message}")
+            count //= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,627 @@
+"""
+Configuration Model for Arduino Input Configurator
+
+A pure-Python model of a board configuration: one InputConfig record per
+input, the pin and option tables of the Arduino Mega 2560, a validator
+that reports every problem at once, and the serializer that produces the
+"config" command the firmware parses. The GUI builds its uploads through
+this module, and the command line below uses it to check or generate
+configurations in bulk without a display. fingerprint() and diff_inputs()
+let an upload be skipped, or cut down to the rows that changed, when the
+board already holds a known configuration.
+
+Wire format of one input (the "inputs" list of a config command):
+    {"pin": 2, "pin2": 0, "type": 1, "mode": 0, "name": "Input 1", "key": "CTRL+F",
+     "displayType": 0, ..., "ledPin": 0, "mutexCount": 0, "mutexList": []}
+
+Compact form of the same input (firmware that reports "compact" in its
+status): short keys, and fields equal to the firmware's default left out:
+    {"p": 2, "t": 1, "n": "Input 1", "k": "CTRL+F"}
+
+Usage:
+    python config_model.py validate profile.json ...
+    python config_model.py generate -n 1000 -o profiles/
+    python config_model.py pins
+    python config_model.py diff uploaded.json profile.json
+"""
+
+import json
+import zlib
+from operator import attrgetter
+
+MAX_INPUTS = 40
+MAX_NAME_LENGTH = 19     # char name[20] in the firmware
+MAX_KEY_LENGTH = 15      # char keyCommand[16], buttonShortKey[16], buttonLongKey[16]
+MAX_MUTEX = 8            # uint8_t mutexList[8]
+
+JSON_DOCUMENT_SIZE = 4096   # StaticJsonDocument<4096> in handleSerialCommand()
+JSON_SLOT_SIZE = 8          # ArduinoJson 6 on AVR: bytes per variant slot
+
+# ========== INPUT TYPES AND OPTIONS ==========
+
+INPUT_BUTTON = 1
+INPUT_ENCODER = 2
+INPUT_SWITCH = 3
+INPUT_POT = 4
+INPUT_SWITCH_LATCHING = 5
+
+# Display name -> wire value, in the order the GUI lists them
+INPUT_TYPES = {
+    "Button": INPUT_BUTTON,
+    "Rotary Encoder": INPUT_ENCODER,
+    "Switch": INPUT_SWITCH,
+    "Potentiometer": INPUT_POT,
+    "Latching Switch": INPUT_SWITCH_LATCHING
+}
+
+ENCODER_MODES = {
+    "1x (increment by 1)": 0,
+    "10x (increment by 10)": 1,
+    "100x (increment by 100)": 2,
+    "1000x (increment by 1000)": 3
+}
+
+DISPLAY_TYPES = {"None": 0, "TM1637": 1, "TM1638": 2, "MAX7219": 3}
+BUTTON_ACTIONS = {"None": 0, "Cycle Modes": 1, "Send Key": 2, "Reset Display": 3}
+
+# ========== PIN TABLES (Arduino Mega 2560) ==========
+
+DIGITAL_PINS = tuple(range(2, 54))  # Skip 0-1 (Serial)
+ANALOG_PINS = tuple(f"A{i}" for i in range(16))
+INTERRUPT_PINS = (2, 3, 18, 19, 20, 21)  # Best for encoders
+ANALOG_PIN_BASE = 54  # A0 is pin 54
+
+PIN_LABELS = tuple(str(pin) for pin in DIGITAL_PINS) + ANALOG_PINS  # Pin 1 choices
+PIN2_LABELS = ("N/A",) + tuple(str(pin) for pin in DIGITAL_PINS)    # Pin 2 choices
+
+PIN_NUMBERS = {label: pin for pin, label in zip(DIGITAL_PINS, PIN_LABELS)}
+PIN_NUMBERS.update({label: ANALOG_PIN_BASE + i for i, label in enumerate(ANALOG_PINS)})
+PIN_NUMBERS["N/A"] = 0
+PIN_NAMES = {pin: label for label, pin in PIN_NUMBERS.items()}
+
+_INPUT_PINS = frozenset(pin for pin in PIN_NAMES if pin)
+_DIGITAL_PINS = frozenset(DIGITAL_PINS)
+_ANALOG_PINS = frozenset(range(ANALOG_PIN_BASE, ANALOG_PIN_BASE + len(ANALOG_PINS)))
+_OPTIONAL_PINS = _INPUT_PINS | {0}  # Advanced pins use 0 for "not connected"
+_INPUT_TYPE_VALUES = frozenset(INPUT_TYPES.values())
+_ENCODER_MODE_VALUES = frozenset(ENCODER_MODES.values())
+_DISPLAY_TYPE_VALUES = frozenset(DISPLAY_TYPES.values())
+_BUTTON_ACTION_VALUES = frozenset(BUTTON_ACTIONS.values())
+
+
+def pin_number(label):
+    """
+    Convert a pin label ("13", "A3", "N/A") to the firmware's pin number.
+
+    Raises:
+        ValueError: If the label is not a Mega 2560 pin
+    """
+    try:
+        return PIN_NUMBERS[label]
+    except KeyError:
+        raise ValueError(f"Unknown pin: {label}") from None
+
+
+def pin_label(number):
+    """Convert a firmware pin number to its label (0 -> "N/A", 57 -> "A3")."""
+    return PIN_NAMES.get(number, str(number))
+
+
+# ========== INPUT RECORDS ==========
+
+# (attribute, wire key, default); wire order matches what the GUI always sent
+FIELDS = (
+    ('pin', 'pin', 2),
+    ('pin2', 'pin2', 0),
+    ('type', 'type', INPUT_BUTTON),
+    ('mode', 'mode', 0),
+    ('name', 'name', ''),
+    ('key', 'key', ''),
+    ('display_type', 'displayType', 0),
+    ('display_clk_pin', 'displayClkPin', 0),
+    ('display_data_pin', 'displayDataPin', 0),
+    ('display_cs_pin', 'displayCsPin', 0),
+    ('display_digits', 'displayDigits', 4),
+    ('display_min', 'displayMin', 0),
+    ('display_max', 'displayMax', 9999),
+    ('button_pin', 'buttonPin', 0),
+    ('button_short_action', 'buttonShortAction', 0),
+    ('button_long_action', 'buttonLongAction', 0),
+    ('button_short_key', 'buttonShortKey', ''),
+    ('button_long_key', 'buttonLongKey', ''),
+    ('long_press_ms', 'longPressMs', 1000),
+    ('led_pin', 'ledPin', 0),
+    ('mutex_list', 'mutexList', ()),
+)
+
+# Wire key -> (compact key, value the firmware assumes when the key is missing)
+COMPACT_KEYS = {
+    'pin': ('p', 0),
+    'pin2': ('p2', 0),
+    'type': ('t', 0),
+    'mode': ('m', 0),
+    'name': ('n', ''),
+    'key': ('k', ''),
+    'displayType': ('dt', 0),
+    'displayClkPin': ('dc', 0),
+    'displayDataPin': ('dd', 0),
+    'displayCsPin': ('ds', 0),
+    'displayDigits': ('dg', 4),
+    'displayMin': ('d0', 0),
+    'displayMax': ('d1', 9999),
+    'buttonPin': ('bp', 0),
+    'buttonShortAction': ('bs', 0),
+    'buttonLongAction': ('bl', 0),
+    'buttonShortKey': ('ks', ''),
+    'buttonLongKey': ('kl', ''),
+    'longPressMs': ('lm', 1000),
+    'ledPin': ('lp', 0),
+    'mutexList': ('x', []),
+}
+
+_ATTRIBUTES = tuple(field[0] for field in FIELDS)
+_WIRE_KEYS = tuple(field[1] for field in FIELDS)
+_DEFAULTS = tuple(field[2] for field in FIELDS)
+_ATTRIBUTE_FOR_KEY = {key: attribute for attribute, key, _ in FIELDS}
+_ATTRIBUTE_FOR_KEY['mutexCount'] = None  # Derived from mutexList
+_COMPACT = tuple(COMPACT_KEYS[key] for key in _WIRE_KEYS)
+_get_fields = attrgetter(*_ATTRIBUTES)
+
+
+class InputConfig:
+    """One configured input, holding the values the firmware receives."""
+
+    __slots__ = _ATTRIBUTES
+
+    def __init__(self, **fields):
+        """
+        Args:
+            **fields: Attribute values (see FIELDS); the rest keep their defaults
+
+        Raises:
+            TypeError: If a field name is unknown
+        """
+        for attribute, default in zip(_ATTRIBUTES, _DEFAULTS):
+            setattr(self, attribute, fields.pop(attribute, default))
+        if fields:
+            raise TypeError(f"Unknown input field(s): {', '.join(sorted(fields))}")
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from a wire-format input dictionary.
+
+        Args:
+            data (dict): Input as sent to the firmware (missing keys use defaults)
+
+        Raises:
+            ValueError: If the dictionary has a key the firmware does not know
+        """
+        record = cls.__new__(cls)
+        for attribute, default in zip(_ATTRIBUTES, _DEFAULTS):
+            setattr(record, attribute, default)
+        for key, value in data.items():
+            attribute = _ATTRIBUTE_FOR_KEY.get(key, False)
+            if attribute is False:
+                raise ValueError(f"Unknown input field: {key}")
+            if attribute is not None:
+                setattr(record, attribute, value)
+        return record
+
+    def to_dict(self):
+        """Return the wire-format dictionary of this input."""
+        data = dict(zip(_WIRE_KEYS, _get_fields(self)))
+        data['mutexList'] = list(self.mutex_list)
+        data['mutexCount'] = len(self.mutex_list)
+        return data
+
+    def to_compact(self):
+        """Return the compact wire dictionary of this input (see the module docstring)."""
+        data = {}
+        for (key, default), value in zip(_COMPACT, _get_fields(self)):
+            if value != default:
+                data[key] = value
+        if self.mutex_list:
+            data['x'] = list(self.mutex_list)
+        else:
+            data.pop('x', None)
+        return data
+
+    def copy(self):
+        """Return an independent copy of this record."""
+        record = InputConfig.__new__(InputConfig)
+        for attribute, value in zip(_ATTRIBUTES, _get_fields(self)):
+            setattr(record, attribute, value)
+        record.mutex_list = tuple(self.mutex_list)
+        return record
+
+    def __eq__(self, other):
+        if not isinstance(other, InputConfig):
+            return NotImplemented
+        return _get_fields(self)[:-1] == _get_fields(other)[:-1] and \
+            tuple(self.mutex_list) == tuple(other.mutex_list)
+
+    def __repr__(self):
+        return f"InputConfig(name={self.name!r}, type={self.type}, pin={pin_label(self.pin)}, key={self.key!r})"
+
+
+# ========== VALIDATION ==========
+
+def _check_text(errors, prefix, label, value, max_length):
+    if not isinstance(value, str):
+        errors.append(f"{prefix}: {label} must be text")
+    elif len(value) > max_length:
+        errors.append(f"{prefix}: {label} is longer than {max_length} characters")
+
+
+def validate_input(record, index, count):
+    """
+    Check one input.
+
+    Args:
+        record (InputConfig): Input to check
+        index (int): Position of the input in its configuration
+        count (int): Number of inputs in the configuration (for mutex indices)
+
+    Returns:
+        list: Error messages ("Row N: ..."), empty if the input is valid
+    """
+    errors = []
+    prefix = f"Row {index + 1}"
+
+    if record.type not in _INPUT_TYPE_VALUES:
+        errors.append(f"{prefix}: Unknown input type {record.type!r}")
+    if record.pin not in _INPUT_PINS:
+        errors.append(f"{prefix}: Invalid pin {record.pin!r}")
+    elif record.type == INPUT_POT and record.pin not in _ANALOG_PINS:
+        errors.append(f"{prefix}: Potentiometers need an analog pin (A0-A15)")
+
+    if record.type == INPUT_ENCODER:
+        if record.pin2 not in _DIGITAL_PINS:
+            errors.append(f"{prefix}: Encoders need a digital second pin")
+        elif record.pin2 == record.pin:
+            errors.append(f"{prefix}: Encoder pins must be different")
+        if record.mode not in _ENCODER_MODE_VALUES:
+            errors.append(f"{prefix}: Unknown encoder mode {record.mode!r}")
+    elif record.pin2 not in _OPTIONAL_PINS:
+        errors.append(f"{prefix}: Invalid second pin {record.pin2!r}")
+
+    _check_text(errors, prefix, "Name", record.name, MAX_NAME_LENGTH)
+    if isinstance(record.key, str) and not record.key.strip():
+        errors.append(f"{prefix}: Keyboard command is required")
+    else:
+        _check_text(errors, prefix, "Keyboard command", record.key, MAX_KEY_LENGTH)
+
+    # Advanced settings
+    if record.display_type not in _DISPLAY_TYPE_VALUES:
+        errors.append(f"{prefix}: Unknown display type {record.display_type!r}")
+    for label, pin in (("Display CLK pin", record.display_clk_pin), ("Display data pin", record.display_data_pin),
+                       ("Display CS pin", record.display_cs_pin), ("Button pin", record.button_pin),
+                       ("LED pin", record.led_pin)):
+        if pin not in _OPTIONAL_PINS:
+            errors.append(f"{prefix}: Invalid {label[0].lower() + label[1:]} {pin!r}")
+    if record.display_digits not in range(1, 9):
+        errors.append(f"{prefix}: Display digits must be between 1 and 8")
+    if record.display_min not in range(-32768, 32768) or record.display_max not in range(-32768, 32768):
+        errors.append(f"{prefix}: Display range must fit -32768..32767")
+    elif record.display_min > record.display_max:
+        errors.append(f"{prefix}: Display minimum is greater than its maximum")
+
+    if record.button_short_action not in _BUTTON_ACTION_VALUES or \
+            record.button_long_action not in _BUTTON_ACTION_VALUES:
+        errors.append(f"{prefix}: Unknown encoder button action")
+    _check_text(errors, prefix, "Short press key", record.button_short_key, MAX_KEY_LENGTH)
+    _check_text(errors, prefix, "Long press key", record.button_long_key, MAX_KEY_LENGTH)
+    if record.long_press_ms not in range(0, 65536):
+        errors.append(f"{prefix}: Long press time must be between 0 and 65535 ms")
+
+    if len(record.mutex_list) > MAX_MUTEX:
+        errors.append(f"{prefix}: At most {MAX_MUTEX} mutually exclusive inputs are supported")
+    for other in record.mutex_list:
+        if other not in range(count) or other == index:
+            errors.append(f"{prefix}: Invalid mutually exclusive input {other!r}")
+            break
+
+    return errors
+
+
+def validate(inputs):
+    """
+    Check a whole configuration.
+
+    Args:
+        inputs (list): InputConfig records in upload order
+
+    Returns:
+        list: Error messages, empty if the configuration can be uploaded
+    """
+    errors = []
+    count = len(inputs)
+    if count > MAX_INPUTS:
+        errors.append(f"At most {MAX_INPUTS} inputs are supported ({count} configured)")
+
+    pin_owners = {}
+    for index, record in enumerate(inputs):
+        errors.extend(validate_input(record, index, count))
+
+        pins = (record.pin, record.pin2) if record.type == INPUT_ENCODER and record.pin2 != record.pin \
+            else (record.pin,)
+        for pin in pins:
+            owner = pin_owners.setdefault(pin, index)
+            if owner != index:
+                errors.append(f"Row {index + 1}: Pin {pin_label(pin)} is already used by row {owner + 1}")
+
+    return errors
+
+
+# ========== SERIALIZATION ==========
+
+def config_command(inputs, compact=False):
+    """
+    Build the "config" command for a configuration.
+
+    Args:
+        inputs (list): InputConfig records
+        compact (bool): Use the compact input encoding
+
+    Returns:
+        dict: Command ready to be sent as one JSON line
+    """
+    if compact:
+        return {"type": "config", "inputs": [record.to_compact() for record in inputs]}
+    return {"type": "config", "inputs": [record.to_dict() for record in inputs]}
+
+
+def serialize(inputs, compact=False):
+    """Return the config command as the JSON line (no whitespace) the firmware reads."""
+    return json.dumps(config_command(inputs, compact), separators=(',', ':'))
+
+
+def json_document_size(value):
+    """
+    Estimate the memory ArduinoJson needs to hold a parsed document.
+
+    Args:
+        value: Parsed JSON value
+
+    Returns:
+        int: Estimated bytes (compare with JSON_DOCUMENT_SIZE)
+    """
+    if isinstance(value, dict):
+        size = 0
+        for key, item in value.items():
+            size += JSON_SLOT_SIZE + len(key.encode()) + 1 + json_document_size(item)
+        return size
+    if isinstance(value, list):
+        return sum(JSON_SLOT_SIZE + json_document_size(item) for item in value)
+    if isinstance(value, str):
+        return len(value.encode()) + 1
+    return 0
+
+
+def command_size(inputs, compact=False):
+    """
+    Size of the config command for a configuration.
+
+    Returns:
+        tuple: (bytes on the wire including the newline,
+                estimated parse memory on the board, see JSON_DOCUMENT_SIZE)
+    """
+    command = config_command(inputs, compact)
+    line = json.dumps(command, separators=(',', ':'))
+    return len(line.encode()) + 1, json_document_size(command)
+
+
+def load_inputs(data):
+    """
+    Read a configuration from parsed JSON.
+
+    Args:
+        data: A config command ({"type": "config", "inputs": [...]}),
+              an object with an "inputs" list, or the list itself
+
+    Returns:
+        list: InputConfig records
+
+    Raises:
+        ValueError: If the data is not a configuration
+    """
+    if isinstance(data, dict):
+        data = data.get("inputs")
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("Expected a list of inputs")
+    return [InputConfig.from_dict(item) for item in data]
+
+
+# ========== COMPARISON ==========
+
+def fingerprint(inputs):
+    """
+    Stable 32-bit fingerprint of a configuration.
+
+    Computed over the canonical wire format (sorted keys, no whitespace),
+    so it only changes when a value the firmware receives changes.
+
+    Args:
+        inputs (list): InputConfig records
+
+    Returns:
+        int: CRC-32 of the canonical form, never 0 (the board reports 0
+             when it does not know what it holds)
+    """
+    canonical = json.dumps([record.to_dict() for record in inputs], sort_keys=True, separators=(',', ':'))
+    return zlib.crc32(canonical.encode('utf-8')) or 1
+
+
+def diff_inputs(old, new):
+    """
+    Compare two configurations row by row.
+
+    Args:
+        old (list): InputConfig records, e.g. what the board holds
+        new (list): InputConfig records, e.g. the table
+
+    Returns:
+        list: (row index, change, changed wire keys) tuples; change is
+              'added', 'removed' or 'changed'
+    """
+    changes = []
+    for index in range(max(len(old), len(new))):
+        if index >= len(old):
+            changes.append((index, 'added', ()))
+        elif index >= len(new):
+            changes.append((index, 'removed', ()))
+        else:
+            old_data = old[index].to_dict()
+            new_data = new[index].to_dict()
+            keys = tuple(key for key in _WIRE_KEYS if old_data[key] != new_data[key])
+            if keys:
+                changes.append((index, 'changed', keys))
+    return changes
+
+
+def describe_changes(changes, old, new):
+    """
+    Describe the result of diff_inputs(), one line per changed row.
+
+    Returns:
+        list: Lines such as "Row 3 (Throttle): pin, key changed"
+    """
+    lines = []
+    for index, change, keys in changes:
+        record = old[index] if change == 'removed' else new[index]
+        label = f"Row {index + 1} ({record.name})" if record.name else f"Row {index + 1}"
+        if change == 'changed':
+            lines.append(f"{label}: {', '.join(keys)} changed")
+        else:
+            lines.append(f"{label}: {change}")
+    return lines
+
+
+def generate_inputs(count, rng):
+    """
+    Generate a random valid configuration (for batch tests and benchmarks).
+
+    Args:
+        count (int): Number of inputs (at most MAX_INPUTS)
+        rng (random.Random): Random source
+
+    Returns:
+        list: InputConfig records
+    """
+    digital = list(DIGITAL_PINS)
+    analog = list(range(ANALOG_PIN_BASE, ANALOG_PIN_BASE + len(ANALOG_PINS)))
+    rng.shuffle(digital)
+    rng.shuffle(analog)
+    keys = ['A', 'B', 'F1', 'F12', 'CTRL+F', 'SHIFT+A', 'ALT+TAB', 'CTRL+SHIFT+S', 'SPACE', 'ENTER']
+    types = list(INPUT_TYPES.values())
+
+    inputs = []
+    for index in range(count):
+        input_type = rng.choice(types)
+        if input_type == INPUT_POT and not analog:
+            input_type = INPUT_BUTTON
+        if input_type == INPUT_ENCODER and len(digital) < 2:
+            input_type = INPUT_POT
+        record = InputConfig(name=f"Input {index + 1}", type=input_type, key=rng.choice(keys))
+
+        if input_type == INPUT_POT:
+            record.pin = analog.pop()
+        else:
+            record.pin = digital.pop()
+        if input_type == INPUT_ENCODER:
+            record.pin2 = digital.pop()
+            record.mode = rng.choice(list(ENCODER_MODES.values()))
+            record.display_type = rng.choice(list(DISPLAY_TYPES.values()))
+            record.button_short_action = rng.choice(list(BUTTON_ACTIONS.values()))
+        elif input_type == INPUT_SWITCH_LATCHING and index:
+            record.mutex_list = tuple(rng.sample(range(index), min(index, rng.randint(0, 3))))
+        inputs.append(record)
+
+    return inputs
+
+
+def main():
+    """Command-line interface for checking and generating configurations."""
+    import sys
+    import time
+    import random
+    import argparse
+    from pathlib import Path
+
+    parser = argparse.ArgumentParser(description='Input configuration tools')
+    subparsers = parser.add_subparsers(dest='command')
+
+    validate_parser = subparsers.add_parser('validate', help='Check configuration files')
+    validate_parser.add_argument('files', nargs='+', help='JSON files holding a config command or an inputs list')
+    validate_parser.add_argument('--quiet', action='store_true', help='Only print files with errors')
+
+    generate_parser = subparsers.add_parser('generate', help='Write random valid configurations')
+    generate_parser.add_argument('-n', '--count', type=int, default=1, help='Configurations to generate (default: 1)')
+    generate_parser.add_argument('--inputs', type=int, default=MAX_INPUTS,
+                                 help=f'Inputs per configuration (default: {MAX_INPUTS})')
+    generate_parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    generate_parser.add_argument('-o', '--output', default=None,
+                                 help='Directory to write config-NNNN.json files to (default: print one per line)')
+
+    subparsers.add_parser('pins', help='List the pin labels and firmware pin numbers')
+
+    diff_parser = subparsers.add_parser('diff', help='Show what changed between two configurations')
+    diff_parser.add_argument('old', help='JSON file holding the earlier configuration')
+    diff_parser.add_argument('new', help='JSON file holding the later configuration')
+
+    args = parser.parse_args()
+
+    if args.command == 'validate':
+        start = time.perf_counter()
+        failed = 0
+        for path in args.files:
+            try:
+                inputs = load_inputs(json.loads(Path(path).read_text()))
+                errors = validate(inputs)
+            except (OSError, ValueError) as e:
+                inputs, errors = [], [str(e)]
+            if errors:
+                failed += 1
+                print(f"{path}: {len(errors)} error(s)")
+                for error in errors:
+                    print(f"  {error}")
+            elif not args.quiet:
+                print(f"{path}: OK ({len(inputs)} inputs)")
+        elapsed = time.perf_counter() - start
+        print(f"{len(args.files) - failed} of {len(args.files)} valid ({elapsed * 1000:.1f} ms)")
+        sys.exit(1 if failed else 0)
+
+    elif args.command == 'generate':
+        rng = random.Random(args.seed)
+        output = Path(args.output) if args.output else None
+        if output:
+            output.mkdir(parents=True, exist_ok=True)
+        for number in range(args.count):
+            line = serialize(generate_inputs(min(args.inputs, MAX_INPUTS), rng))
+            if output:
+                (output / f'config-{number:04d}.json').write_text(line + '\n')
+            else:
+                print(line)
+        if output:
+            print(f"Wrote {args.count} configurations to {output}")
+
+    elif args.command == 'pins':
+        for label in PIN_LABELS:
+            note = " (interrupt)" if PIN_NUMBERS[label] in INTERRUPT_PINS else ""
+            print(f"{label:>4} -> {PIN_NUMBERS[label]}{note}")
+
+    elif args.command == 'diff':
+        old, new = (load_inputs(json.loads(Path(path).read_text())) for path in (args.old, args.new))
+        print(f"{args.old}: {len(old)} inputs, fingerprint {fingerprint(old):08X}")
+        print(f"{args.new}: {len(new)} inputs, fingerprint {fingerprint(new):08X}")
+        for line in describe_changes(diff_inputs(old, new), old, new) or ["Identical"]:
+            print(f"  {line}")
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
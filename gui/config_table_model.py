@@ -0,0 +1,307 @@
+"""
+Input Table Model for Arduino Input Configurator
+
+Qt model/view adapter over the configuration model: InputTableModel
+exposes a list of InputConfig records as the six-column input table, and
+the delegates create one editor at a time (a combo box for types, pins and
+modes, a length-limited line edit for text) instead of six live widgets
+per row. Editing a cell while several rows are selected applies the value
+to all of them.
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QStyledItemDelegate, QComboBox, QLineEdit
+
+from config_model import (
+    INPUT_ENCODER, INPUT_TYPES, ENCODER_MODES, DIGITAL_PINS, PIN_LABELS, PIN2_LABELS,
+    PIN_NUMBERS, MAX_NAME_LENGTH, MAX_KEY_LENGTH, InputConfig, pin_label
+)
+
+COLUMN_NAME = 0
+COLUMN_TYPE = 1
+COLUMN_PIN = 2
+COLUMN_PIN2 = 3
+COLUMN_MODE = 4
+COLUMN_KEY = 5
+
+HEADERS = ("Name", "Type", "Pin 1", "Pin 2", "Encoder Mode", "Keyboard Command")
+
+TYPE_NAMES = {value: name for name, value in INPUT_TYPES.items()}
+MODE_NAMES = {value: name for name, value in ENCODER_MODES.items()}
+
+# Choices offered by the combo box editor of each column
+COLUMN_CHOICES = {
+    COLUMN_TYPE: tuple(INPUT_TYPES),
+    COLUMN_PIN: PIN_LABELS,
+    COLUMN_PIN2: PIN2_LABELS,
+    COLUMN_MODE: tuple(ENCODER_MODES),
+}
+
+# Sort key of each column, computed from a record
+_SORT_KEYS = {
+    COLUMN_NAME: lambda record: record.name.casefold(),
+    COLUMN_TYPE: lambda record: record.type,
+    COLUMN_PIN: lambda record: record.pin,
+    COLUMN_PIN2: lambda record: record.pin2,
+    COLUMN_MODE: lambda record: record.mode,
+    COLUMN_KEY: lambda record: record.key.casefold(),
+}
+
+_DISABLED_COLOR = QColor('#aaaaaa')
+
+
+class InputTableModel(QAbstractTableModel):
+    """Table model over a list of InputConfig records."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = []
+
+    # ========== QAbstractTableModel interface ==========
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        column = index.column()
+
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == COLUMN_NAME:
+                return record.name
+            if column == COLUMN_TYPE:
+                return TYPE_NAMES.get(record.type, str(record.type))
+            if column == COLUMN_PIN:
+                return pin_label(record.pin)
+            if column == COLUMN_PIN2:
+                return pin_label(record.pin2)
+            if column == COLUMN_MODE:
+                return MODE_NAMES.get(record.mode, str(record.mode))
+            return record.key
+        if role == Qt.ForegroundRole and not self._applies(record, column):
+            return _DISABLED_COLOR
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self._applies(self.records[index.row()], index.column()):
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        return self.set_values([index.row()], index.column(), value)
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        return self.remove_inputs(range(row, row + count))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        key = _SORT_KEYS.get(column)
+        if key is None:
+            return  # No sort column (the view asks for -1 until a header is clicked)
+        order_rows = sorted(range(len(self.records)), key=lambda row: key(self.records[row]),
+                            reverse=(order == Qt.DescendingOrder))
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        new_rows = {old: new for new, old in enumerate(order_rows)}
+        self.records = [self.records[row] for row in order_rows]
+        self._remap_mutex(new_rows)
+        self.changePersistentIndexList(
+            old_indexes, [self.index(new_rows[index.row()], index.column()) for index in old_indexes])
+        self.layoutChanged.emit()
+
+    # ========== Editing ==========
+
+    @staticmethod
+    def _applies(record, column):
+        """True if a column means anything for the record's input type."""
+        if column in (COLUMN_PIN2, COLUMN_MODE):
+            return record.type == INPUT_ENCODER
+        return True
+
+    def set_values(self, rows, column, value):
+        """
+        Set one column of several rows from its displayed text.
+
+        Args:
+            rows (iterable): Row numbers
+            column (int): Column number
+            value (str): Text as shown in the table or chosen in the editor
+
+        Returns:
+            bool: True if the value was valid for the column
+        """
+        try:
+            if column == COLUMN_TYPE:
+                value = INPUT_TYPES[value]
+            elif column in (COLUMN_PIN, COLUMN_PIN2):
+                value = PIN_NUMBERS[value]
+            elif column == COLUMN_MODE:
+                value = ENCODER_MODES[value]
+            else:
+                value = str(value)
+                value = value.strip() if column == COLUMN_KEY else value
+        except KeyError:
+            return False
+
+        rows = sorted(rows)
+        if not rows:
+            return False
+        last_column = column
+        for row in rows:
+            record = self.records[row]
+            if column == COLUMN_NAME:
+                record.name = value
+            elif column == COLUMN_TYPE:
+                if value == INPUT_ENCODER and record.type != INPUT_ENCODER:
+                    record.pin2 = DIGITAL_PINS[0]  # First pin after N/A
+                elif value != INPUT_ENCODER:
+                    record.pin2 = 0
+                record.type = value
+                last_column = COLUMN_MODE
+            elif column == COLUMN_PIN:
+                record.pin = value
+            elif column == COLUMN_PIN2:
+                record.pin2 = value
+            elif column == COLUMN_MODE:
+                record.mode = value
+            else:
+                record.key = value
+
+        self.dataChanged.emit(self.index(rows[0], column), self.index(rows[-1], last_column))
+        return True
+
+    def set_advanced(self, row, config):
+        """
+        Apply advanced settings to a row.
+
+        Args:
+            row (int): Row number
+            config (dict): Wire-format settings (see AdvancedSettingsDialog.get_config)
+        """
+        data = self.records[row].to_dict()
+        data.update(config)
+        self.records[row] = InputConfig.from_dict(data)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    # ========== Rows ==========
+
+    def inputs(self):
+        """Records in table order (the list itself; do not modify)."""
+        return self.records
+
+    def input(self, row):
+        """Record of one row."""
+        return self.records[row]
+
+    def set_inputs(self, records):
+        """Replace the whole table (one reset, however many rows)."""
+        self.beginResetModel()
+        self.records = list(records)
+        self.endResetModel()
+
+    def append_input(self, record):
+        """Add a record as the last row; returns its row number."""
+        row = len(self.records)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.records.append(record)
+        self.endInsertRows()
+        return row
+
+    def remove_inputs(self, rows):
+        """
+        Remove rows, keeping the mutual-exclusion references of the
+        remaining rows pointed at the same inputs.
+
+        Args:
+            rows (iterable): Row numbers
+
+        Returns:
+            bool: True if anything was removed
+        """
+        rows = sorted(set(rows), reverse=True)
+        if not rows or rows[0] >= len(self.records) or rows[-1] < 0:
+            return False
+
+        removed = set(rows)
+        new_rows = {}
+        for row in range(len(self.records)):
+            if row not in removed:
+                new_rows[row] = len(new_rows)
+
+        # Contiguous blocks from the bottom up, so row numbers stay valid
+        block_end = rows[0]
+        for position, row in enumerate(rows):
+            next_row = rows[position + 1] if position + 1 < len(rows) else None
+            if next_row != row - 1:
+                self.beginRemoveRows(QModelIndex(), row, block_end)
+                del self.records[row:block_end + 1]
+                self.endRemoveRows()
+                block_end = next_row
+
+        self._remap_mutex(new_rows)
+        return True
+
+    def _remap_mutex(self, new_rows):
+        """Rewrite mutex lists after rows moved ({old row: new row}, missing = removed)."""
+        for record in self.records:
+            if record.mutex_list:
+                record.mutex_list = tuple(new_rows[row] for row in record.mutex_list if row in new_rows)
+
+
+class ChoiceDelegate(QStyledItemDelegate):
+    """Combo box editor for the type, pin and mode columns."""
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.addItems(COLUMN_CHOICES[index.column()])
+        editor.activated.connect(lambda _: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.EditRole))
+
+    def setModelData(self, editor, model, index):
+        _set_selected(self.parent(), model, index, editor.currentText())
+
+
+class TextDelegate(QStyledItemDelegate):
+    """Length-limited line edit for the name and keyboard command columns."""
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        if index.column() == COLUMN_KEY:
+            editor.setMaxLength(MAX_KEY_LENGTH)
+            editor.setPlaceholderText("e.g., CTRL+F, A, SHIFT+A+B, F1")
+        else:
+            editor.setMaxLength(MAX_NAME_LENGTH)
+        return editor
+
+    def setModelData(self, editor, model, index):
+        _set_selected(self.parent(), model, index, editor.text())
+
+
+def _set_selected(view, model, index, value):
+    """Apply an edit to every selected row if the edited row is selected, else to that row only."""
+    rows = [index.row()]
+    if view is not None and view.selectionModel() is not None:
+        selected = [selected.row() for selected in view.selectionModel().selectedRows()]
+        if index.row() in selected:
+            rows = [row for row in selected if model.flags(model.index(row, index.column())) & Qt.ItemIsEditable]
+    model.set_values(rows, index.column(), value)
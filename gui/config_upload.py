@@ -0,0 +1,502 @@
+"""
+Chunked Configuration Upload for Arduino Input Configurator
+
+Sends a configuration to the board as numbered, CRC-checked chunks of
+whole inputs instead of one JSON line, so no upload has to fit the
+board's serial buffer or its JSON document at once. The board grants
+credits (how many chunks may be in flight), acknowledges chunks
+cumulatively, asks for a resend when a chunk is corrupt or missing, and
+only applies the configuration when the host commits it.
+
+Protocol (one text line each, "\\n" terminated):
+    Host -> board
+        #B <session> <inputs>               Begin: board suspends its inputs
+        #B <session> <inputs> <changed> <base>
+                                            Begin a patch: only <changed> inputs follow,
+                                            each with an "index"; the rest are kept from
+                                            the configuration with fingerprint <base>
+        #I <session> <image bytes>          Begin an EEPROM image upload (eeprom_image.py):
+                                            chunks carry the board's Config struct itself
+        #C <session> <seq> <crc> <payload>  Chunk: JSON array of inputs (or base64 of the
+                                            zero-run encoded image), CRC-16/CCITT-FALSE
+                                            of <payload> in hex
+        #E <session> [<fingerprint>]        Commit: save to EEPROM (with the fingerprint,
+                                            reported by "status"), restart inputs
+        #X <session>                        Abort: board reloads its saved config
+    Board -> host
+        @B <session> <credits> <max payload bytes>   Ready
+        @A <session> <seq> <credits>                 Chunks up to <seq> stored
+        @N <session> <seq>                           Resend from chunk <seq>
+        @E <session> <inputs>                        Committed
+        @F <session> <reason>                        Upload failed (board restored its config)
+
+Fingerprints are config_model.fingerprint() values in hex. A board that
+holds a different configuration than <base> rejects a patch with
+"@F <session> stale-base", and one whose Config struct has a different
+size than the image rejects "#I" with "@F <session> layout-mismatch";
+ConfigUpload then falls back to a full JSON upload.
+
+Firmware that predates the protocol answers "#B" with a JSON parse error;
+ConfigUpload then reports `legacy` so the caller can fall back to the
+single-line "config" command.
+
+ConfigUpload is a state machine without I/O (it returns the bytes to
+write), used by the GUI's serial worker; upload_config() drives it over a
+pyserial-style connection for scripts and benchmarks.
+
+Usage:
+    python config_upload.py -p COM3 profile.json
+    python config_upload.py -p /dev/pts/4 profile.aicp --legacy
+    python config_upload.py -p COM3 profile.json --image mega
+"""
+
+import json
+import time
+import random
+import binascii
+
+from serial_framing import LineFramer
+from config_model import JSON_SLOT_SIZE, json_document_size
+from eeprom_image import image_chunks
+
+BEGIN_TIMEOUT = 1.0         # Seconds to wait for "@B" before resending "#B"
+CHUNK_TIMEOUT = 0.5         # Seconds without an acknowledgement before going back
+COMMIT_TIMEOUT = 15.0       # EEPROM writes take 3.3 ms per changed byte
+MAX_RETRIES = 5             # Resends of one chunk (or of "#B") before giving up
+CHUNK_DOCUMENT_SIZE = 1024  # StaticJsonDocument the firmware parses one chunk into
+
+PROTOCOL_REPLIES = ('@B ', '@A ', '@N ', '@E ', '@F ')
+LEGACY_REPLIES = ("JSON parse error", "Unknown command type", "Missing 'type' field")
+
+
+def crc16(data):
+    """CRC-16/CCITT-FALSE (polynomial 0x1021, initial value 0xFFFF), as the firmware computes it."""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def split_chunks(inputs, max_payload, max_document=CHUNK_DOCUMENT_SIZE):
+    """
+    Pack inputs into chunk payloads of at most `max_payload` bytes.
+
+    Small (compact) inputs pack densely, so a chunk is also closed before
+    the board's parsed copy of it would outgrow `max_document`.
+
+    Args:
+        inputs (list): Wire-format input dictionaries
+        max_payload (int): Largest payload the board accepts
+        max_document (int): Parse memory the board has for one chunk
+
+    Returns:
+        list: (payload bytes, number of inputs) per chunk
+
+    Raises:
+        ValueError: If a single input does not fit in a chunk
+    """
+    chunks = []
+    items = []
+    size = 2  # "[" and "]"
+    document = 0
+    for index, item in enumerate(inputs):
+        encoded = json.dumps(item, separators=(',', ':')).encode()
+        item_document = JSON_SLOT_SIZE + json_document_size(item)
+        if len(encoded) + 2 > max_payload or item_document > max_document:
+            raise ValueError(f"Row {index + 1} is too large to upload ({len(encoded)} bytes, "
+                             f"the board accepts {max_payload - 2})")
+        if items and (size + 1 + len(encoded) > max_payload or document + item_document > max_document):
+            chunks.append((b'[' + b','.join(items) + b']', len(items)))
+            items = []
+            size = 2
+            document = 0
+        size += len(encoded) + (1 if items else 0)
+        document += item_document
+        items.append(encoded)
+    if items:
+        chunks.append((b'[' + b','.join(items) + b']', len(items)))
+    return chunks
+
+
+class ConfigUpload:
+    """
+    One chunked upload session.
+
+    Feed every line from the board to on_line() and call poll()
+    regularly; both return the bytes to write to the port (possibly b'').
+    When `finished` is set, `success` and `message` hold the outcome.
+    """
+
+    def __init__(self, inputs, session=None, chunk_timeout=CHUNK_TIMEOUT, max_retries=MAX_RETRIES,
+                 fingerprint=None, base=None, changed=None, image=None):
+        """
+        Args:
+            inputs (list): Wire-format input dictionaries (the whole configuration)
+            session (int): Session number (default: random)
+            chunk_timeout (float): Seconds to wait for an acknowledgement
+            max_retries (int): Resends of one chunk before giving up
+            fingerprint (int): Fingerprint of `inputs` for the board to store
+            base (int): Fingerprint of the configuration on the board; with
+                        `changed`, only those inputs are sent
+            changed (list): Indexes of the inputs that differ from `base`
+            image (bytes): EEPROM image of `inputs` (eeprom_image.compile_image())
+                           to send instead of JSON, for firmware reporting its size
+        """
+        self.inputs = inputs
+        self.fingerprint = fingerprint
+        self.base = base
+        self.image = image
+        if base is not None:
+            self.items = [dict(inputs[index], index=index) for index in changed]
+        else:
+            self.items = inputs
+        self.session = session if session is not None else random.randint(1, 0xFFFF)
+        self.chunk_timeout = chunk_timeout
+        self.max_retries = max_retries
+
+        self.state = 'begin'
+        self.chunks = []
+        self.chunk_ends = []      # Inputs stored once chunk N is acknowledged
+        self.credits = 1
+        self.acked = 0            # Chunks acknowledged
+        self.next_seq = 0         # Next chunk to (re)send
+        self.sent_at = {}         # seq -> time it was last sent
+        self.retries = 0          # Resends since the last progress
+        self.deadline = None
+        self.last_nak = None      # Chunk the last NAK asked for
+        self.stale_naks = 0       # NAKs still expected for chunks sent after it
+
+        self.finished = False
+        self.success = False
+        self.legacy = False
+        self.message = ''
+        self.stats = {'chunks_sent': 0, 'bytes_sent': 0, 'retransmits': 0, 'naks': 0, 'timeouts': 0}
+
+    # ========== Progress ==========
+
+    @property
+    def inputs_acked(self):
+        """Inputs the board has stored so far."""
+        return self.chunk_ends[self.acked - 1] if self.acked else 0
+
+    @property
+    def total(self):
+        """Inputs this upload sends (only the changed ones for a patch)."""
+        return len(self.items)
+
+    @staticmethod
+    def is_protocol_line(line):
+        """True if a line from the board is an upload protocol reply."""
+        return line.startswith(PROTOCOL_REPLIES)
+
+    # ========== State machine ==========
+
+    def start(self, now=None):
+        """Return the "#B" line that opens the session."""
+        now = time.monotonic() if now is None else now
+        self.deadline = now + BEGIN_TIMEOUT
+        return self._begin_line()
+
+    def on_line(self, line, now=None):
+        """
+        Handle a line received from the board.
+
+        Args:
+            line (str): Line without its terminator
+            now (float): time.monotonic() value
+
+        Returns:
+            bytes: Data to write to the port
+        """
+        if self.finished:
+            return b''
+        now = time.monotonic() if now is None else now
+
+        if not self.is_protocol_line(line):
+            if self.state == 'begin' and line.startswith(LEGACY_REPLIES):
+                self.legacy = True
+                self._finish(False, "Board firmware does not support chunked uploads")
+            return b''
+
+        fields = line.split()
+        try:
+            session = int(fields[1])
+        except (IndexError, ValueError):
+            return b''
+        if session != self.session:
+            return b''  # Late reply to an earlier session
+        kind = fields[0]
+
+        if kind == '@F':
+            if self.state == 'begin' and self.image is not None:
+                # The board cannot take this image; send the inputs as JSON
+                self.image = None
+                return self._begin_line()
+            if self.state == 'begin' and self.base is not None and fields[2:] == ['stale-base']:
+                # The board does not hold the configuration the patch is based on
+                self.base = None
+                self.items = self.inputs
+                return self._begin_line()
+            self._finish(False, "Upload rejected by Arduino: " + ' '.join(fields[2:]))
+            return b''
+
+        try:
+            if kind == '@B' and self.state == 'begin':
+                return self._on_ready(int(fields[2]), int(fields[3]), now)
+            if kind == '@A' and self.state == 'send':
+                return self._on_ack(int(fields[2]), int(fields[3]), now)
+            if kind == '@N' and self.state == 'send':
+                return self._on_nak(int(fields[2]), now)
+            if kind == '@E' and self.state == 'commit':
+                self._finish(True, f"Configuration uploaded: {fields[2]} inputs configured")
+        except (IndexError, ValueError):
+            pass
+        return b''
+
+    def poll(self, now=None):
+        """
+        Check timeouts.
+
+        Returns:
+            bytes: Data to resend, if anything timed out
+        """
+        if self.finished:
+            return b''
+        now = time.monotonic() if now is None else now
+
+        if self.state == 'begin' and now >= self.deadline:
+            if not self._retry("No answer from Arduino"):
+                return b''
+            self.deadline = now + BEGIN_TIMEOUT
+            return self._begin_line()
+
+        if self.state == 'send' and self.acked < self.next_seq:
+            if now - self.sent_at[self.acked] >= self.chunk_timeout:
+                # Go back to the oldest unacknowledged chunk
+                self.stats['timeouts'] += 1
+                if not self._retry("No acknowledgement from Arduino"):
+                    return b''
+                self.next_seq = self.acked
+                self.last_nak = None
+                self.stale_naks = 0
+                return self._send_window(now)
+
+        if self.state == 'commit' and now >= self.deadline:
+            self._finish(False, "Arduino did not confirm the configuration")
+        return b''
+
+    def abort(self):
+        """Give up; returns the "#X" line that tells the board to restore its config."""
+        if self.finished:
+            return b''
+        self._finish(False, "Upload cancelled")
+        return self._line(f'#X {self.session}')
+
+    # ========== Internals ==========
+
+    def _line(self, text):
+        return text.encode() + b'\n'
+
+    def _begin_line(self):
+        if self.image is not None:
+            return self._line(f'#I {self.session} {len(self.image)}')
+        if self.base is None:
+            return self._line(f'#B {self.session} {len(self.inputs)}')
+        return self._line(f'#B {self.session} {len(self.inputs)} {len(self.items)} {self.base:08X}')
+
+    def _finish(self, success, message):
+        self.finished = True
+        self.success = success
+        self.message = message
+        self.state = 'done'
+
+    def _retry(self, message):
+        self.retries += 1
+        if self.retries > self.max_retries:
+            self._finish(False, message)
+            return False
+        return True
+
+    def _on_ready(self, credits, max_payload, now):
+        try:
+            if self.image is not None:
+                self.chunks = image_chunks(self.image, len(self.inputs), max_payload)
+            else:
+                self.chunks = split_chunks(self.items, max_payload)
+        except ValueError as e:
+            self._finish(False, str(e))
+            return self._line(f'#X {self.session}')
+
+        total = 0
+        for _, count in self.chunks:
+            total += count
+            self.chunk_ends.append(total)
+        self.credits = max(1, credits)
+        self.retries = 0
+        self.state = 'send'
+        if not self.chunks:
+            return self._commit(now)
+        return self._send_window(now)
+
+    def _on_ack(self, seq, credits, now):
+        self.credits = max(1, credits)
+        if seq + 1 > self.acked:
+            self.acked = min(seq + 1, len(self.chunks))
+            self.retries = 0
+            self.last_nak = None
+            self.stale_naks = 0
+            self.next_seq = max(self.next_seq, self.acked)
+        if self.acked == len(self.chunks):
+            return self._commit(now)
+        return self._send_window(now)
+
+    def _on_nak(self, seq, now):
+        self.stats['naks'] += 1
+        if seq < self.acked or seq >= len(self.chunks):
+            return b''
+        if seq == self.last_nak and self.stale_naks:
+            # The chunks already in flight behind a bad one are each answered
+            # with the same NAK; the resend is under way
+            self.stale_naks -= 1
+            return b''
+        self.last_nak = seq
+        self.stale_naks = self.next_seq - seq - 1
+        if not self._retry("Too many corrupted chunks"):
+            return b''
+        self.next_seq = seq
+        return self._send_window(now)
+
+    def _send_window(self, now):
+        """Send every chunk the board's credits allow."""
+        lines = []
+        while self.next_seq < len(self.chunks) and self.next_seq - self.acked < self.credits:
+            seq = self.next_seq
+            payload = self.chunks[seq][0]
+            if seq in self.sent_at:
+                self.stats['retransmits'] += 1
+            line = b'#C %d %d %04X ' % (self.session, seq, crc16(payload)) + payload + b'\n'
+            lines.append(line)
+            self.sent_at[seq] = now
+            self.stats['chunks_sent'] += 1
+            self.stats['bytes_sent'] += len(line)
+            self.next_seq += 1
+        return b''.join(lines)
+
+    def _commit(self, now):
+        self.state = 'commit'
+        self.deadline = now + COMMIT_TIMEOUT
+        if self.fingerprint is None:
+            return self._line(f'#E {self.session}')
+        return self._line(f'#E {self.session} {self.fingerprint:08X}')
+
+
+def upload_config(connection, inputs, timeout=60.0, progress=None, **options):
+    """
+    Upload a configuration over an open serial connection.
+
+    Args:
+        connection: pyserial-style object with read(), write() and in_waiting
+        inputs (list): Wire-format input dictionaries
+        timeout (float): Seconds before giving up altogether
+        progress (callable): Called with (inputs stored, total inputs)
+        **options: Passed to ConfigUpload
+
+    Returns:
+        ConfigUpload: The finished session (success, message, stats, legacy)
+    """
+    upload = ConfigUpload(inputs, **options)
+    framer = LineFramer(max_line_length=4096)
+    deadline = time.monotonic() + timeout
+    reported = -1
+
+    connection.write(upload.start())
+    while not upload.finished:
+        now = time.monotonic()
+        if now >= deadline:
+            connection.write(upload.abort())
+            upload.message = "Upload timed out"
+            break
+
+        data = connection.read(connection.in_waiting or 1)
+        out = []
+        for line in framer.feed(data):
+            out.append(upload.on_line(line.strip(), time.monotonic()))
+        out.append(upload.poll(time.monotonic()))
+        data = b''.join(out)
+        if data:
+            connection.write(data)
+
+        if progress and upload.inputs_acked != reported:
+            reported = upload.inputs_acked
+            progress(reported, upload.total)
+
+    return upload
+
+
+def upload_legacy(connection, inputs, timeout=5.0):
+    """
+    Upload with the single-line "config" command (firmware without chunked uploads).
+
+    Returns:
+        tuple: (success, response line)
+    """
+    framer = LineFramer(max_line_length=4096)
+    connection.write((json.dumps({"type": "config", "inputs": inputs}) + '\n').encode())
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for line in framer.feed(connection.read(connection.in_waiting or 1)):
+            line = line.strip()
+            if line.startswith("Configuration updated"):
+                return True, line
+            if line.startswith(LEGACY_REPLIES) or line.startswith("Missing 'inputs' array"):
+                return False, line
+    return False, "No response from Arduino"
+
+
+def main():
+    """Command-line interface: upload a profile to a board."""
+    import sys
+    import argparse
+    import serial
+    from profiles import load_profile
+    from config_model import fingerprint
+    from eeprom_image import LAYOUTS, compile_image
+
+    parser = argparse.ArgumentParser(description='Upload a configuration profile to the Arduino')
+    parser.add_argument('profile', help='Profile or config file (.json or .aicp)')
+    parser.add_argument('-p', '--port', required=True, help='Serial port')
+    parser.add_argument('-b', '--baud', type=int, default=115200, help='Baud rate (default: 115200)')
+    parser.add_argument('--legacy', action='store_true', help='Use the single-line config command')
+    parser.add_argument('--image', choices=sorted(LAYOUTS),
+                        help='Send an EEPROM image compiled for this sketch instead of JSON')
+    parser.add_argument('--reset-wait', type=float, default=2.0,
+                        help='Seconds to let the board reset after opening the port (default: 2)')
+
+    args = parser.parse_args()
+
+    _, records = load_profile(args.profile)
+    inputs = [record.to_dict() for record in records]
+    image = compile_image(records, args.image) if args.image else None
+
+    with serial.Serial(args.port, args.baud, timeout=0.02) as connection:
+        time.sleep(args.reset_wait)
+        connection.reset_input_buffer()
+        start = time.perf_counter()
+
+        if args.legacy:
+            success, message = upload_legacy(connection, inputs)
+        else:
+            upload = upload_config(connection, inputs, fingerprint=fingerprint(records), image=image,
+                                   progress=lambda done, total: print(f"\r{done}/{total} inputs", end='', flush=True))
+            print()
+            if upload.legacy:
+                print("Board does not support chunked uploads; using the single-line command")
+                success, message = upload_legacy(connection, inputs)
+            else:
+                success, message = upload.success, upload.message
+                print(f"Chunks: {upload.stats['chunks_sent']} sent, {upload.stats['retransmits']} resent "
+                      f"({upload.stats['naks']} NAKs, {upload.stats['timeouts']} timeouts)")
+
+    print(f"{message} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,537 @@
+"""
+EEPROM Image Compiler for Arduino Input Configurator
+
+Packs a configuration into the bytes the firmware keeps in EEPROM, its
+`Config` struct, exactly as the sketch's own upload handling leaves them:
+inputs in the first slots, the remaining slots zero, and the sketch's
+calculateChecksum(). A board whose status reports an "image" size takes
+such an image as a raw block copy (see config_upload.py) instead of
+parsing JSON on the AVR.
+
+Layout (AVR: little-endian, no padding, bool is one byte):
+    Config       uint16 magic, uint8 version, InputConfig inputs[40], uint16 checksum
+    InputConfig  97 bytes in arduino-config-mega.ino, 41 bytes in
+                 arduino-config-mega-solo.ino; field order in LAYOUTS
+
+On the wire an image is run-length encoded: a zero byte is followed by
+the number of zeros it stands for (1-255), so unused slots and the unused
+ends of names cost next to nothing.
+
+Usage:
+    python eeprom_image.py compile profile.json -o config.eep --layout solo
+    python eeprom_image.py dump config.eep
+    python eeprom_image.py verify       # golden check against the sketches (needs a C++ compiler)
+"""
+
+import base64
+import struct
+
+from config_model import InputConfig, MAX_INPUTS, MAX_MUTEX
+
+CONFIG_MAGIC = 0xAC02   # CONFIG_MAGIC in both sketches
+CONFIG_VERSION = 1
+
+HEADER = struct.Struct('<HB')   # magic, version
+CHECKSUM = struct.Struct('<H')
+
+# InputConfig member -> (struct format, InputConfig attribute; None if the sketch sets it itself)
+C_FIELDS = {
+    'pin': ('B', 'pin'),
+    'pin2': ('B', 'pin2'),
+    'type': ('B', 'type'),
+    'mode': ('B', 'mode'),
+    'name': ('20s', 'name'),
+    'keyCommand': ('16s', 'key'),
+    'enabled': ('?', None),
+    'displayType': ('B', 'display_type'),
+    'displayClkPin': ('B', 'display_clk_pin'),
+    'displayDataPin': ('B', 'display_data_pin'),
+    'displayCsPin': ('B', 'display_cs_pin'),
+    'displayDigits': ('B', 'display_digits'),
+    'displayMin': ('h', 'display_min'),
+    'displayMax': ('h', 'display_max'),
+    'buttonPin': ('B', 'button_pin'),
+    'buttonShortAction': ('B', 'button_short_action'),
+    'buttonLongAction': ('B', 'button_long_action'),
+    'buttonShortKey': ('16s', 'button_short_key'),
+    'buttonLongKey': ('16s', 'button_long_key'),
+    'longPressMs': ('H', 'long_press_ms'),
+    'ledPin': ('B', 'led_pin'),
+    'mutexCount': ('B', None),
+    'mutexList': ('8s', 'mutex_list'),
+}
+
+
+def _getter(field):
+    """Return a function giving the value parseInput() stores in one InputConfig member."""
+    fmt, attribute = C_FIELDS[field]
+    if field == 'enabled':
+        return lambda record: True
+    if field == 'mutexCount':
+        return lambda record: min(len(record.mutex_list), MAX_MUTEX)
+    if field == 'mutexList':
+        return lambda record: bytes(record.mutex_list[:MAX_MUTEX])
+    if fmt.endswith('s'):
+        # strncpy(target, text, size - 1) into a cleared member
+        length = int(fmt[:-1]) - 1
+        return lambda record: getattr(record, attribute).encode('utf-8')[:length]
+    return lambda record: getattr(record, attribute)
+
+
+class ImageLayout:
+    """The Config struct of one sketch."""
+
+    def __init__(self, name, sketch, fields, checksum_fields):
+        """
+        Args:
+            name (str): Layout name
+            sketch (str): Sketch defining the struct, relative to the repository root
+            fields (tuple): InputConfig members in declaration order
+            checksum_fields (tuple): Members calculateChecksum() adds up for enabled inputs
+        """
+        self.name = name
+        self.sketch = sketch
+        self.fields = fields
+        self.checksum_fields = checksum_fields
+        self.record = struct.Struct('<' + ''.join(C_FIELDS[field][0] for field in fields))
+        self.size = HEADER.size + MAX_INPUTS * self.record.size + CHECKSUM.size
+        self.getters = tuple(_getter(field) for field in fields)
+        self.checksummed = tuple(fields.index(field) for field in checksum_fields)
+        self.enabled = fields.index('enabled')
+        # char arrays must keep their terminator; mutexList is data
+        self.strings = tuple(index for index, field in enumerate(fields)
+                             if C_FIELDS[field][0].endswith('s') and field != 'mutexList')
+
+    def record_offset(self, index):
+        """Byte offset of inputs[index] in the image."""
+        return HEADER.size + index * self.record.size
+
+
+LAYOUTS = {
+    'mega': ImageLayout(
+        'mega', 'arduino-config-mega/arduino-config-mega.ino',
+        ('pin', 'pin2', 'type', 'mode', 'name', 'keyCommand', 'enabled',
+         'displayType', 'displayClkPin', 'displayDataPin', 'displayCsPin', 'displayDigits',
+         'displayMin', 'displayMax', 'buttonPin', 'buttonShortAction', 'buttonLongAction',
+         'buttonShortKey', 'buttonLongKey', 'longPressMs', 'ledPin', 'mutexCount', 'mutexList'),
+        ('pin', 'pin2', 'type', 'mode', 'displayType', 'buttonPin', 'ledPin')),
+    'solo': ImageLayout(
+        'solo', 'arduino-config-mega-solo/arduino-config-mega-solo.ino',
+        ('pin', 'pin2', 'type', 'mode', 'name', 'keyCommand', 'enabled'),
+        ('pin', 'pin2', 'type', 'mode')),
+}
+
+
+def layout_for_size(size):
+    """Return the layout whose Config struct has `size` bytes, or None."""
+    for layout in LAYOUTS.values():
+        if layout.size == size:
+            return layout
+    return None
+
+
+# ========== IMAGES ==========
+
+def compile_image(inputs, layout='mega'):
+    """
+    Pack a configuration into an EEPROM image.
+
+    Args:
+        inputs (list): InputConfig records (at most MAX_INPUTS)
+        layout (str): Key of LAYOUTS for the target sketch
+
+    Returns:
+        bytes: The Config struct, layout.size bytes
+
+    Raises:
+        ValueError: If there are too many inputs or a value does not fit its member
+    """
+    layout = LAYOUTS[layout]
+    if len(inputs) > MAX_INPUTS:
+        raise ValueError(f"Too many inputs for the firmware ({len(inputs)}, maximum {MAX_INPUTS})")
+
+    image = bytearray(layout.size)
+    HEADER.pack_into(image, 0, CONFIG_MAGIC, CONFIG_VERSION)
+    checksum = CONFIG_MAGIC + CONFIG_VERSION
+    for index, record in enumerate(inputs):
+        try:
+            values = [get(record) for get in layout.getters]
+            layout.record.pack_into(image, layout.record_offset(index), *values)
+        except (struct.error, ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"Row {index + 1}: cannot be stored in the EEPROM image ({e})") from None
+        for position in layout.checksummed:
+            checksum += values[position]
+    CHECKSUM.pack_into(image, layout.size - CHECKSUM.size, checksum & 0xFFFF)
+    return bytes(image)
+
+
+def read_image(data):
+    """
+    Decode an EEPROM image, checking it the way the firmware does before using it.
+
+    Args:
+        data (bytes): Image contents
+
+    Returns:
+        tuple: (ImageLayout, list of InputConfig records of the enabled slots)
+
+    Raises:
+        ValueError: If the image is not a valid configuration for either sketch
+    """
+    layout = layout_for_size(len(data))
+    if layout is None:
+        raise ValueError(f"No firmware layout is {len(data)} bytes "
+                         f"({', '.join(f'{l.name}: {l.size}' for l in LAYOUTS.values())})")
+    magic, version = HEADER.unpack_from(data)
+    if magic != CONFIG_MAGIC or version != CONFIG_VERSION:
+        raise ValueError("Invalid config magic/version")
+
+    checksum = CONFIG_MAGIC + CONFIG_VERSION
+    inputs = []
+    for index in range(MAX_INPUTS):
+        values = layout.record.unpack_from(data, layout.record_offset(index))
+        for position in layout.strings:
+            if values[position][-1]:
+                raise ValueError(f"Slot {index + 1}: {layout.fields[position]} is not terminated")
+        if not values[layout.enabled]:
+            continue
+        for position in layout.checksummed:
+            checksum += values[position]
+
+        fields = {}
+        for field, value in zip(layout.fields, values):
+            attribute = C_FIELDS[field][1]
+            if attribute is None or field == 'mutexList':
+                continue
+            if isinstance(value, bytes):
+                value = value.split(b'\0', 1)[0].decode('utf-8', errors='replace')
+            fields[attribute] = value
+        if 'mutexList' in layout.fields:
+            mutex_count = values[layout.fields.index('mutexCount')]
+            if mutex_count > MAX_MUTEX:
+                raise ValueError(f"Slot {index + 1}: mutexCount {mutex_count} is out of range")
+            fields['mutex_list'] = tuple(values[layout.fields.index('mutexList')][:mutex_count])
+        inputs.append(InputConfig(**fields))
+
+    if CHECKSUM.unpack_from(data, layout.size - CHECKSUM.size)[0] != checksum & 0xFFFF:
+        raise ValueError("Config checksum mismatch")
+    return layout, inputs
+
+
+# ========== WIRE ENCODING ==========
+
+def encode_zero_runs(data):
+    """Run-length encode zeros: each run becomes a zero byte and its length (1-255)."""
+    out = bytearray()
+    index = 0
+    length = len(data)
+    while index < length:
+        end = data.find(0, index)
+        if end < 0:
+            end = length
+        out += data[index:end]
+        index = end
+        while index < length and data[index] == 0:
+            run = 1
+            while index + run < length and run < 255 and data[index + run] == 0:
+                run += 1
+            out += bytes((0, run))
+            index += run
+    return bytes(out)
+
+
+def decode_zero_runs(data):
+    """
+    Reverse encode_zero_runs().
+
+    Raises:
+        ValueError: If a zero is not followed by a run length of 1-255
+    """
+    out = bytearray()
+    index = 0
+    length = len(data)
+    while index < length:
+        end = data.find(0, index)
+        if end < 0:
+            out += data[index:]
+            break
+        out += data[index:end]
+        if end + 1 >= length or not data[end + 1]:
+            raise ValueError("Incomplete zero run")
+        out += bytes(data[end + 1])
+        index = end + 2
+    return bytes(out)
+
+
+def image_chunks(image, count, max_payload):
+    """
+    Split an image into upload chunk payloads: base64 of its zero-run
+    encoding, never separating a zero from its run length.
+
+    Args:
+        image (bytes): compile_image() output
+        count (int): Inputs in the image (for progress)
+        max_payload (int): Largest payload the board accepts
+
+    Returns:
+        list: (payload bytes, inputs completed by this chunk) per chunk,
+              the same shape as config_upload.split_chunks()
+    """
+    layout = layout_for_size(len(image))
+    record_size = layout.record.size if layout else len(image)
+    encoded = encode_zero_runs(image)
+    limit = max_payload // 4 * 3  # Raw bytes whose base64 fits the payload
+    if limit < 2:
+        raise ValueError(f"Chunks of {max_payload} bytes are too small for an image")
+
+    chunks = []
+    start = 0
+    offset = 0      # Image bytes covered so far
+    completed = 0
+    while start < len(encoded):
+        end = start
+        while end < len(encoded) and end - start < limit:
+            if encoded[end]:
+                offset += 1
+                end += 1
+            elif end + 2 - start <= limit:
+                offset += encoded[end + 1]
+                end += 2
+            else:
+                break
+        done = count if end == len(encoded) else \
+            min(count, max(0, (offset - HEADER.size) // record_size))
+        chunks.append((base64.b64encode(encoded[start:end]), done - completed))
+        completed = done
+        start = end
+    return chunks
+
+
+# ========== GOLDEN CHECK ==========
+
+def _c_string(text):
+    """A C string literal of the UTF-8 bytes of text (octal escapes cannot run into what follows)."""
+    return '"' + ''.join(f'\\{byte:03o}' for byte in text.encode('utf-8')) + '"'
+
+
+def sketch_structs(source):
+    """
+    Read the InputConfig members from a sketch.
+
+    Returns:
+        list: (C type, member name, array length or None) in declaration order
+    """
+    import re
+
+    match = re.search(r'^struct InputConfig \{(.*?)^\};', source, re.S | re.M)
+    if not match:
+        raise ValueError("struct InputConfig not found")
+    members = []
+    for line in match.group(1).splitlines():
+        line = line.split('//', 1)[0].strip()
+        member = re.fullmatch(r'(\w+)\s+(\w+)(?:\[(\d+)\])?;', line)
+        if member:
+            ctype, name, length = member.groups()
+            members.append((ctype, name, int(length) if length else None))
+        elif line:
+            raise ValueError(f"Cannot read struct member: {line}")
+    return members
+
+
+# Struct format of each C member type on AVR
+_C_FORMATS = {('uint8_t', None): 'B', ('bool', None): '?', ('int16_t', None): 'h', ('uint16_t', None): 'H'}
+
+
+def check_layout(layout, source):
+    """
+    Compare a layout with the struct declared in its sketch.
+
+    Returns:
+        list: Differences (empty if the layout matches)
+    """
+    members = sketch_structs(source)
+    errors = []
+    if [name for _, name, _ in members] != list(layout.fields):
+        errors.append(f"members {[name for _, name, _ in members]} != {list(layout.fields)}")
+        return errors
+    for ctype, name, length in members:
+        fmt = _C_FORMATS.get((ctype, length)) or (f'{length}s' if ctype in ('char', 'uint8_t') else None)
+        if fmt != C_FIELDS[name][0]:
+            errors.append(f"{name}: {ctype}{f'[{length}]' if length else ''} is not packed as {C_FIELDS[name][0]}")
+    return errors
+
+
+def golden_image(layout, inputs, source, compiler):
+    """
+    Build the EEPROM image of a configuration with the sketch's own code.
+
+    Compiles the sketch's declarations, initializeDefaultConfig() and
+    calculateChecksum() on the host (packed like AVR) together with the
+    assignments parseInput() makes for each input, runs it, and returns
+    the bytes of its Config struct.
+
+    Args:
+        layout (ImageLayout): Layout of the sketch
+        inputs (list): InputConfig records
+        source (str): Sketch source
+        compiler (str): C++ compiler command
+
+    Returns:
+        bytes: The Config struct as the firmware would save it
+    """
+    import os
+    import re
+    import tempfile
+    import subprocess
+
+    declarations = source[:source.index('// ========== GLOBAL VARIABLES')]
+    declarations = re.sub(r'^#include.*$', '', declarations, flags=re.M)
+    functions = [re.search(r'^\w+ %s\(\) \{.*?^\}' % name, source, re.S | re.M).group(0)
+                 for name in ('calculateChecksum', 'initializeDefaultConfig')]
+
+    body = []
+    for index, record in enumerate(inputs):
+        target = f'config.inputs[{index}]'
+        body.append(f'  memset(&{target}, 0, sizeof(InputConfig));')
+        body.append(f'  {target}.enabled = true;')
+        for field in layout.fields:
+            fmt, attribute = C_FIELDS[field]
+            if field == 'mutexList':
+                for position, item in enumerate(record.mutex_list[:MAX_MUTEX]):
+                    body.append(f'  {target}.mutexList[{position}] = {item};')
+            elif field == 'mutexCount':
+                body.append(f'  {target}.mutexCount = {min(len(record.mutex_list), MAX_MUTEX)};')
+            elif fmt.endswith('s'):
+                body.append(f'  strncpy({target}.{field}, {_c_string(getattr(record, attribute))}, '
+                            f'sizeof({target}.{field}) - 1);')
+            elif attribute is not None:
+                body.append(f'  {target}.{field} = {getattr(record, attribute)};')
+    program = '\n'.join([
+        '#include <stdint.h>', '#include <stdio.h>', '#include <string.h>',
+        '#pragma pack(push, 1)',
+        declarations,
+        '#pragma pack(pop)',
+        'Config config;',
+        *functions,
+        'int main() {',
+        '  initializeDefaultConfig();',
+        *body,
+        # The commit clears the slots past the uploaded inputs, then saveConfiguration()
+        f'  for (int i = {len(inputs)}; i < MAX_INPUTS; i++) memset(&config.inputs[i], 0, sizeof(InputConfig));',
+        '  config.magic = CONFIG_MAGIC;',
+        '  config.version = 1;',
+        '  config.checksum = calculateChecksum();',
+        '  fwrite(&config, sizeof(config), 1, stdout);',
+        '  return 0;',
+        '}',
+    ])
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, 'golden.cpp')
+        binary_path = os.path.join(directory, 'golden')
+        with open(source_path, 'w') as f:
+            f.write(program)
+        subprocess.run([compiler, '-std=c++11', '-w', '-o', binary_path, source_path],
+                       check=True, capture_output=True)
+        return subprocess.run([binary_path], check=True, capture_output=True).stdout
+
+
+def main():
+    """Command-line interface: compile, inspect and verify EEPROM images."""
+    import sys
+    import shutil
+    import random
+    import argparse
+    from pathlib import Path
+    from profiles import load_profile
+    from config_model import generate_inputs
+
+    parser = argparse.ArgumentParser(description='Firmware EEPROM image tools')
+    subparsers = parser.add_subparsers(dest='command')
+
+    compile_parser = subparsers.add_parser('compile', help='Compile a profile into an EEPROM image')
+    compile_parser.add_argument('profile', help='Profile or config file (.json or .aicp)')
+    compile_parser.add_argument('-o', '--output', required=True, help='Image file to write')
+    compile_parser.add_argument('--layout', choices=sorted(LAYOUTS), default='mega',
+                                help='Target sketch (default: mega)')
+
+    dump_parser = subparsers.add_parser('dump', help='Show the configuration in an EEPROM image')
+    dump_parser.add_argument('image', help='Image file')
+
+    verify_parser = subparsers.add_parser('verify', help='Check the compiler byte for byte against the sketches')
+    verify_parser.add_argument('--compiler', default=None, help='C++ compiler (default: c++, g++ or clang++)')
+    verify_parser.add_argument('--configs', type=int, default=20,
+                               help='Random configurations per sketch (default: 20)')
+
+    args = parser.parse_args()
+
+    if args.command == 'compile':
+        _, records = load_profile(args.profile)
+        image = compile_image(records, args.layout)
+        Path(args.output).write_bytes(image)
+        encoded = sum(len(payload) for payload, _ in image_chunks(image, len(records), 512))
+        print(f"{args.output}: {len(records)} inputs, {len(image)} bytes ({args.layout}), "
+              f"checksum {CHECKSUM.unpack_from(image, len(image) - CHECKSUM.size)[0]:04X}, "
+              f"{encoded} bytes on the wire")
+
+    elif args.command == 'dump':
+        try:
+            layout, records = read_image(Path(args.image).read_bytes())
+        except ValueError as e:
+            print(f"{args.image}: {e}")
+            sys.exit(1)
+        print(f"{args.image}: {layout.name} layout, {len(records)} inputs")
+        for index, record in enumerate(records):
+            print(f"  {index + 1:2}. {record!r}")
+
+    elif args.command == 'verify':
+        compiler = args.compiler or shutil.which('c++') or shutil.which('g++') or shutil.which('clang++')
+        root = Path(__file__).resolve().parent.parent
+        rng = random.Random(1)
+        edge_cases = [
+            [],
+            [InputConfig(name='N' * 30, key='K' * 30, button_short_key='S' * 20, button_long_key='L' * 20,
+                         display_min=-32768, display_max=32767, long_press_ms=65535,
+                         mutex_list=tuple(range(10)))],
+            [InputConfig(name='Ünïcode näme över 19', key='CTRL+Ä')],
+        ]
+        failed = False
+        for layout in LAYOUTS.values():
+            source = (root / layout.sketch).read_text()
+            errors = check_layout(layout, source)
+            print(f"{layout.name}: struct InputConfig {'matches' if not errors else 'differs'} "
+                  f"({layout.record.size} bytes, Config {layout.size} bytes)")
+            for error in errors:
+                print(f"  {error}")
+            failed = failed or bool(errors)
+            if compiler is None:
+                print("  No C++ compiler found; byte-for-byte check skipped")
+                continue
+
+            generated = [generate_inputs(rng.randint(1, MAX_INPUTS), rng) for _ in range(args.configs)]
+            configs = edge_cases + generated
+            mismatches = 0
+            for inputs in configs:
+                expected = golden_image(layout, inputs, source, compiler)
+                image = compile_image(inputs, layout.name)
+                if image != expected:
+                    mismatches += 1
+                    first = next((i for i, (a, b) in enumerate(zip(image, expected)) if a != b),
+                                 min(len(image), len(expected)))
+                    print(f"  {len(inputs)} inputs: differs from byte {first} "
+                          f"({len(image)} vs {len(expected)} bytes)")
+                elif layout.name == 'mega' and inputs in generated and read_image(image)[1] != inputs:
+                    # Valid configurations survive the round trip (solo keeps only its own fields)
+                    mismatches += 1
+                    print(f"  {len(inputs)} inputs: image does not decode to its configuration")
+            print(f"  {len(configs) - mismatches} of {len(configs)} images identical to the sketch's")
+            failed = failed or bool(mismatches)
+        sys.exit(1 if failed else 0)
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
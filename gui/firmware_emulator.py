@@ -0,0 +1,589 @@
+"""
+Firmware Emulator for Arduino Input Configurator (Linux only)
+
+Emulates the serial protocol of arduino-config-mega-solo.ino on a pseudo-
+terminal, so the keyboard daemon and the GUI can be exercised and stress
+tested without a board attached.
+
+The emulator:
+- "Resets" whenever the host opens the port and prints the firmware banner
+- Parses config/test/status JSON commands with the firmware's limits
+  (40 inputs, 4096-byte JSON document, 19-char names, 15-char keys)
+- Accepts chunked, credit-flow-controlled config uploads, full, patch or
+  EEPROM image (see config_upload.py), and reports the stored configuration
+  fingerprint in its status; optionally consumes input at a real baud rate
+  and drops or corrupts chunks to exercise retransmission
+- Generates synthetic button/encoder/pot event streams at a chosen rate
+
+Usage:
+    python firmware_emulator.py                         # idle board, prints its port
+    python firmware_emulator.py --rate 5000 --pattern encoder
+    python firmware_emulator.py --baud 115200 --corrupt-rate 0.05
+    python keyboard_daemon.py -p /dev/pts/N             # in another terminal
+"""
+
+import os
+import json
+import time
+import base64
+import random
+import select
+import binascii
+import threading
+
+from serial_framing import LineFramer
+from config_upload import crc16
+from config_model import JSON_DOCUMENT_SIZE, COMPACT_KEYS, json_document_size
+from eeprom_image import LAYOUTS, decode_zero_runs, read_image
+
+# Limits from arduino-config-mega-solo.ino
+MAX_INPUTS = 40
+NAME_LENGTH = 19
+KEY_LENGTH = 15
+
+# Chunked upload limits (UPLOAD_* in the firmware)
+UPLOAD_CREDITS = 2              # Chunks the host may have in flight
+UPLOAD_MAX_PAYLOAD = 512        # Bytes of JSON per chunk
+CHUNK_DOCUMENT_SIZE = 1024      # StaticJsonDocument for one chunk
+UPLOAD_IDLE_TIMEOUT = 5.0       # Seconds without a chunk before the board gives up
+IMAGE_SIZE = LAYOUTS['solo'].size   # sizeof(Config)
+
+INPUT_BUTTON = 1
+INPUT_ENCODER = 2
+INPUT_SWITCH = 3
+INPUT_POT = 4
+
+DEMO_INPUTS = [
+    {"pin": 22, "pin2": 0, "type": INPUT_BUTTON, "mode": 0, "name": "Button", "key": "CTRL+F"},
+    {"pin": 2, "pin2": 3, "type": INPUT_ENCODER, "mode": 0, "name": "Encoder Up", "key": "CTRL+UPARROW"},
+    {"pin": 18, "pin2": 19, "type": INPUT_ENCODER, "mode": 0, "name": "Encoder Down", "key": "CTRL+DOWNARROW"},
+    {"pin": 54, "pin2": 0, "type": INPUT_POT, "mode": 0, "name": "Pot", "key": "CTRL+P"},
+]
+
+
+def _as_uint8(value):
+    """Convert a JSON value the way `uint8_t x = input["..."]` does (non-numbers become 0)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0
+    return int(value) & 0xFF
+
+
+class FirmwareEmulator:
+    """Stand-in for an Arduino Mega running the solo firmware, served on a pty."""
+
+    def __init__(self, inputs=None, upload_credits=UPLOAD_CREDITS, max_payload=UPLOAD_MAX_PAYLOAD, baud=None):
+        """
+        Create the pseudo-terminal.
+
+        Args:
+            inputs (list): Initial input configuration ("EEPROM" contents), or
+                           None to start unconfigured
+            upload_credits (int): Chunks granted to the host during an upload
+            max_payload (int): Largest chunk payload accepted
+            baud (int): Consume host data no faster than this baud rate
+                        (None = as fast as the pty delivers it)
+        """
+        master, slave = os.openpty()
+        self.master = master
+        self.port = os.ttyname(slave)
+        # Only the host keeps the slave open, so we can see it attach and detach
+        os.close(slave)
+
+        self.inputs = [dict(i) for i in inputs[:MAX_INPUTS]] if inputs else []
+        self.config_loaded = bool(self.inputs)
+        self.write_lock = threading.Lock()
+        self.running = False
+        self.attached = False
+        self.thread = None
+        self.event_thread = None
+        self.baud = baud
+
+        # Chunked upload state
+        self.upload_credits = upload_credits
+        self.max_payload = max_payload
+        self.upload_session = 0
+        self.upload_expected_inputs = 0
+        self.upload_next_seq = 0
+        self.upload_received = 0
+        self.upload_patch = False
+        self.upload_inputs = []
+        self.upload_image = None        # Image bytes received by an "#I" upload
+        self.upload_deadline = None
+        self.committed_session = 0
+        self.fingerprint = 0            # Stored with the configuration by a chunked upload
+
+        # Fault injection for chunks (probabilities per chunk)
+        self.drop_rate = 0.0
+        self.corrupt_rate = 0.0
+        self.random = random.Random(1)
+
+        # Counters
+        self.commands_received = 0
+        self.events_sent = 0
+        self.boots = 0
+        self.chunks_received = 0
+        self.naks_sent = 0
+
+    # ========== HOST CONNECTION ==========
+
+    def start(self):
+        """Start serving the port in a background thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop event generation and close the pty."""
+        self.running = False
+        if self.event_thread:
+            self.event_thread.join()
+        if self.thread:
+            self.thread.join()
+        os.close(self.master)
+
+    def _serve(self):
+        framer = LineFramer(max_line_length=1 << 16)
+
+        while self.running:
+            readable, _, _ = select.select([self.master], [], [], 0.05)
+
+            if self.upload_session and time.monotonic() >= self.upload_deadline:
+                self.abort_upload("timeout")
+
+            if not readable:
+                if not self.attached:
+                    # Reading no longer fails: the host opened the port
+                    self.attached = True
+                    framer.reset()
+                    self.boot()
+                continue
+
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                # EIO: nobody has the port open
+                self.attached = False
+                time.sleep(0.05)
+                continue
+
+            if self.baud:
+                # 10 bits per byte on the wire (start, 8 data, stop)
+                time.sleep(len(data) * 10.0 / self.baud)
+
+            for line in framer.feed(data):
+                self.handle_line(line.strip())
+
+    def println(self, text):
+        """Send one line to the host, like Serial.println."""
+        self.write(text.encode() + b'\r\n')
+
+    def write(self, data):
+        """Send raw bytes to the host."""
+        with self.write_lock:
+            view = memoryview(data)
+            while view:
+                try:
+                    written = os.write(self.master, view)
+                except BlockingIOError:
+                    time.sleep(0.001)
+                    continue
+                except OSError:
+                    return
+                view = view[written:]
+
+    # ========== FIRMWARE BEHAVIOUR ==========
+
+    def boot(self):
+        """Print what setup() prints after a reset."""
+        self.boots += 1
+        self.upload_session = 0
+        # Opening the port resets the board; give the host time to flush its buffers
+        time.sleep(0.05)
+        if self.config_loaded:
+            self.println("Configuration loaded from EEPROM")
+        else:
+            self.println("Invalid config magic/version")
+            self.println("No valid configuration found. Please configure via GUI.")
+        self.println("Arduino Mega Solo Input Handler Ready")
+        self.println("Send JSON configuration to update settings")
+        self.println("Keyboard commands will be sent to daemon via Serial")
+
+    def handle_line(self, line):
+        """Handle one line received from the host (handleSerialCommand)."""
+        if not line:
+            return
+
+        self.commands_received += 1
+
+        if line.startswith('#'):
+            self.handle_upload(line)
+            return
+
+        try:
+            doc = json.loads(line)
+        except ValueError:
+            self.println("JSON parse error: InvalidInput")
+            return
+
+        if json_document_size(doc) > JSON_DOCUMENT_SIZE:
+            self.println("JSON parse error: NoMemory")
+            return
+
+        cmd_type = doc.get("type") if isinstance(doc, dict) else None
+        if not isinstance(cmd_type, str):
+            self.println("Missing 'type' field")
+            return
+
+        if cmd_type == "config":
+            self.handle_config(doc)
+        elif cmd_type == "test":
+            self.handle_test(doc)
+        elif cmd_type == "status":
+            self.send_status()
+        else:
+            self.println("Unknown command type")
+
+    def handle_config(self, doc):
+        inputs = doc.get("inputs")
+        if not isinstance(inputs, list):
+            self.inputs = []
+            self.println("Missing 'inputs' array")
+            return
+
+        self.inputs = [self.stored_input(item) for item in inputs[:MAX_INPUTS]]
+
+        self.config_loaded = True
+        self.fingerprint = 0  # Not known for a single-line upload
+        self.println("Configuration saved to EEPROM")
+        self.println(f"Configuration updated: {len(self.inputs)} inputs configured")
+
+    @staticmethod
+    def stored_input(item):
+        """What parseInput() keeps of one input (full or compact keys)."""
+        if not isinstance(item, dict):
+            item = {}
+
+        def field(key):
+            value = item.get(key)
+            return item.get(COMPACT_KEYS[key][0]) if value is None else value
+
+        return {
+            "pin": _as_uint8(field("pin")),
+            "pin2": _as_uint8(field("pin2")),
+            "type": _as_uint8(field("type")),
+            "mode": _as_uint8(field("mode")),
+            "name": str(field("name") or "")[:NAME_LENGTH],
+            "key": str(field("key") or "")[:KEY_LENGTH],
+        }
+
+    # ========== CHUNKED UPLOAD ==========
+
+    def handle_upload(self, line):
+        """Handle one upload protocol line (handleUploadCommand)."""
+        fields = line.split(' ', 4)
+        kind = fields[0]
+        try:
+            session = int(fields[1])
+        except (IndexError, ValueError):
+            return
+
+        if kind == '#I':
+            try:
+                size = int(fields[2])
+            except (IndexError, ValueError):
+                size = -1
+            if size != IMAGE_SIZE:
+                self.println(f"@F {session} layout-mismatch")
+                return
+            if session != self.upload_session or self.upload_next_seq:
+                self.upload_session = session
+                self.upload_next_seq = 0
+                self.upload_received = 0
+                self.upload_expected_inputs = 0
+                self.upload_patch = False
+                self.upload_inputs = []
+                self.upload_image = bytearray()
+            self.upload_deadline = time.monotonic() + UPLOAD_IDLE_TIMEOUT
+            self.println(f"@B {session} {self.upload_credits} {self.max_payload}")
+            return
+
+        if kind == '#B':
+            try:
+                count = int(fields[2])
+                changed = int(fields[3]) if len(fields) > 4 else None
+                base = int(fields[4], 16) if len(fields) > 4 else None
+            except (IndexError, ValueError):
+                count = -1
+            if count < 0 or count > MAX_INPUTS:
+                self.println(f"@F {session} too-many-inputs")
+                return
+            if base is not None and (not self.fingerprint or base != self.fingerprint):
+                if self.upload_session:
+                    self.abort_upload(None)  # Late chunks of the dropped session must not apply
+                self.println(f"@F {session} stale-base")
+                return
+            if session != self.upload_session or self.upload_next_seq:
+                # New session (a repeated "#B" for a fresh session is just answered again)
+                self.upload_session = session
+                self.upload_next_seq = 0
+                self.upload_received = 0
+                self.upload_image = None
+                self.upload_patch = base is not None
+                if self.upload_patch:
+                    # Start from the current inputs; the changed ones arrive by index
+                    self.upload_expected_inputs = changed
+                    self.upload_inputs = (self.inputs + [self.stored_input({})] * count)[:count]
+                else:
+                    self.upload_expected_inputs = count
+                    self.upload_inputs = []
+            self.upload_deadline = time.monotonic() + UPLOAD_IDLE_TIMEOUT
+            self.println(f"@B {session} {self.upload_credits} {self.max_payload}")
+            return
+
+        if kind == '#E' and session == self.committed_session:
+            self.println(f"@E {session} {len(self.inputs)}")  # The first "@E" was lost
+            return
+
+        if session != self.upload_session:
+            if kind != '#X':
+                self.println(f"@F {session} no-session")
+            return
+
+        self.upload_deadline = time.monotonic() + UPLOAD_IDLE_TIMEOUT
+
+        if kind == '#C':
+            self.handle_chunk(session, fields)
+        elif kind == '#E':
+            if self.upload_received != self.upload_expected_inputs:
+                self.abort_upload("incomplete")
+                return
+            if self.upload_image is not None:
+                if len(self.upload_image) != IMAGE_SIZE:
+                    self.abort_upload("incomplete")
+                    return
+                try:
+                    _, records = read_image(bytes(self.upload_image))
+                except ValueError:
+                    self.abort_upload("bad-image")
+                    return
+                self.upload_inputs = [self.stored_input(record.to_dict()) for record in records]
+            try:
+                self.fingerprint = int(fields[2], 16)
+            except (IndexError, ValueError):
+                self.fingerprint = 0
+            self.inputs = self.upload_inputs
+            self.config_loaded = True
+            self.upload_session = 0
+            self.committed_session = session
+            self.println("Configuration saved to EEPROM")
+            self.println(f"@E {session} {len(self.inputs)}")
+        elif kind == '#X':
+            self.abort_upload(None)
+
+    def handle_chunk(self, session, fields):
+        self.chunks_received += 1
+        if self.drop_rate and self.random.random() < self.drop_rate:
+            return  # Lost on the wire
+
+        try:
+            seq = int(fields[2])
+            crc = int(fields[3], 16)
+            payload = fields[4].encode()
+        except (IndexError, ValueError):
+            self.send_nak(session, self.upload_next_seq)
+            return
+        if self.corrupt_rate and self.random.random() < self.corrupt_rate:
+            payload = payload[:-1] + bytes([payload[-1] ^ 0x20]) if payload else b'?'
+
+        if seq < self.upload_next_seq:
+            # Already stored; the acknowledgement was lost
+            self.println(f"@A {session} {self.upload_next_seq - 1} {self.upload_credits}")
+            return
+        if seq > self.upload_next_seq or crc16(payload) != crc:
+            self.send_nak(session, self.upload_next_seq)
+            return
+
+        if self.upload_image is not None:
+            self.store_image_chunk(session, seq, payload)
+            return
+
+        try:
+            items = json.loads(payload)
+        except ValueError:
+            self.abort_upload("bad-json")
+            return
+        if json_document_size(items) > CHUNK_DOCUMENT_SIZE:
+            self.abort_upload("chunk-too-large")
+            return
+        if not isinstance(items, list):
+            self.abort_upload("bad-json")
+            return
+        if self.upload_received + len(items) > self.upload_expected_inputs:
+            self.abort_upload("too-many-inputs")
+            return
+
+        for item in items:
+            if not self.upload_patch:
+                self.upload_inputs.append(self.stored_input(item))
+                continue
+            index = item.get("index") if isinstance(item, dict) else None
+            if not isinstance(index, int) or not 0 <= index < len(self.upload_inputs):
+                self.abort_upload("bad-index")
+                return
+            self.upload_inputs[index] = self.stored_input(item)
+        self.upload_received += len(items)
+        self.upload_next_seq += 1
+        self.println(f"@A {session} {seq} {self.upload_credits}")
+
+    def store_image_chunk(self, session, seq, payload):
+        """Append one image chunk (storeImageChunk)."""
+        try:
+            data = decode_zero_runs(base64.b64decode(payload, validate=True))
+        except (binascii.Error, ValueError):
+            self.abort_upload("bad-image")
+            return
+        if len(self.upload_image) + len(data) > IMAGE_SIZE:
+            self.abort_upload("bad-image")
+            return
+        self.upload_image += data
+        self.upload_next_seq += 1
+        self.println(f"@A {session} {seq} {self.upload_credits}")
+
+    def send_nak(self, session, seq):
+        self.naks_sent += 1
+        self.println(f"@N {session} {seq}")
+
+    def abort_upload(self, reason):
+        """Drop the upload in progress; the saved configuration stays active."""
+        session = self.upload_session
+        self.upload_session = 0
+        self.upload_inputs = []
+        self.upload_image = None
+        if reason:
+            self.println(f"@F {session} {reason}")
+
+    def handle_test(self, doc):
+        key = doc.get("key")
+        if isinstance(key, str):
+            self.println(key)
+            self.println("Test command sent")
+
+    def send_status(self):
+        status = {
+            "status": "ok",
+            "mode": "solo",
+            "configLoaded": self.config_loaded,
+            "maxInputs": MAX_INPUTS,
+            "activeInputs": len(self.inputs),
+            "fingerprint": f"{self.fingerprint:08X}",
+            "compact": True,
+            "image": IMAGE_SIZE,
+        }
+        self.println(json.dumps(status, separators=(',', ':')))
+
+    # ========== SYNTHETIC INPUT EVENTS ==========
+
+    def start_events(self, rate, pattern='mixed', duration=None, burst=20):
+        """
+        Generate input events in a background thread.
+
+        Args:
+            rate (float): Key commands per second
+            pattern (str): 'buttons', 'encoder', 'pot' or 'mixed'
+            duration (float): Seconds to run (None = until stop())
+            burst (int): Commands per encoder spin
+        """
+        self.event_thread = threading.Thread(
+            target=self._generate_events, args=(rate, pattern, duration, burst), daemon=True
+        )
+        self.event_thread.start()
+
+    def event_lines(self, pattern, burst):
+        """Yield the command lines an endless stream of input events produces."""
+        inputs = self.inputs if self.config_loaded else DEMO_INPUTS
+        kinds = {
+            'buttons': (INPUT_BUTTON, INPUT_SWITCH),
+            'encoder': (INPUT_ENCODER,),
+            'pot': (INPUT_POT,),
+            'mixed': (INPUT_BUTTON, INPUT_SWITCH, INPUT_ENCODER, INPUT_POT),
+        }[pattern]
+        selected = [i for i in inputs if i["type"] in kinds and i["key"]] or \
+                   [i for i in DEMO_INPUTS if i["type"] in kinds]
+
+        while True:
+            for item in selected:
+                line = item["key"].encode() + b'\r\n'
+                # An encoder spin sends one command per detent
+                repeat = burst if item["type"] == INPUT_ENCODER else 1
+                for _ in range(repeat):
+                    yield line
+
+    def _generate_events(self, rate, pattern, duration, burst):
+        lines = self.event_lines(pattern, burst)
+        start = time.perf_counter()
+        sent = 0
+
+        while self.running:
+            elapsed = time.perf_counter() - start
+            if duration is not None and elapsed >= duration:
+                break
+
+            if not self.attached:
+                time.sleep(0.01)
+                start = time.perf_counter() - sent / rate
+                continue
+
+            due = int(elapsed * rate) - sent
+            if due > 0:
+                self.write(b''.join(next(lines) for _ in range(due)))
+                sent += due
+                self.events_sent += due
+            else:
+                time.sleep(0.001)
+
+
+def main():
+    """Command-line interface for the firmware emulator."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Arduino Mega solo firmware emulator (pty)')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Synthetic key commands per second (default: 0, idle)')
+    parser.add_argument('--pattern', choices=['buttons', 'encoder', 'pot', 'mixed'], default='mixed',
+                        help='Kind of inputs generating events (default: mixed)')
+    parser.add_argument('--duration', type=float, help='Stop generating events after this many seconds')
+    parser.add_argument('--burst', type=int, default=20, help='Commands per encoder spin (default: 20)')
+    parser.add_argument('--demo-config', action='store_true', help='Start with a demo configuration "in EEPROM"')
+    parser.add_argument('--baud', type=int, help='Consume host data at this baud rate (default: unlimited)')
+    parser.add_argument('--credits', type=int, default=UPLOAD_CREDITS,
+                        help=f'Chunks granted during uploads (default: {UPLOAD_CREDITS})')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='Fraction of upload chunks to drop')
+    parser.add_argument('--corrupt-rate', type=float, default=0.0, help='Fraction of upload chunks to corrupt')
+
+    args = parser.parse_args()
+
+    emulator = FirmwareEmulator(DEMO_INPUTS if args.demo_config else None,
+                                upload_credits=args.credits, baud=args.baud)
+    emulator.drop_rate = args.drop_rate
+    emulator.corrupt_rate = args.corrupt_rate
+    emulator.start()
+    print(f"Emulated Arduino Mega listening on {emulator.port}")
+    print("Press Ctrl+C to stop.")
+
+    if args.rate > 0:
+        emulator.start_events(args.rate, args.pattern, args.duration, args.burst)
+
+    try:
+        while True:
+            time.sleep(1)
+            if args.rate > 0:
+                print(f"\rEvents sent: {emulator.events_sent}  Commands received: {emulator.commands_received}",
+                      end='', flush=True)
+    except KeyboardInterrupt:
+        print("\nStopping emulator...")
+    finally:
+        emulator.stop()
+
+
+if __name__ == '__main__':
+    main()
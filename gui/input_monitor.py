@@ -0,0 +1,365 @@
+"""
+Live Input Monitor for Arduino Input Configurator
+
+Shows what the board sends while it runs. Each line from the board is
+matched to the configured input(s) that send that keyboard command, and
+every input keeps its recent activity in a fixed-size ring buffer of
+event counts per time bucket, from which the monitor shows the event
+count, events per second, the last command and, for encoders and pots,
+a sparkline of the last few seconds.
+
+The firmware sends only the configured command for an event (no analog
+readings or encoder positions), so the monitor shows what the host can
+know: how often and how recently each input fired.
+
+Lines are queued as they arrive and applied once per frame by a timer
+capped at MONITOR_FPS, with a single dataChanged for the rows that moved,
+so a 1 kHz stream costs a few repaints per second instead of a thousand.
+"""
+
+import time
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer, QPointF
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableView, QHeaderView,
+    QStyledItemDelegate, QStyle
+)
+
+from config_model import INPUT_ENCODER, INPUT_POT, INPUT_TYPES
+
+MONITOR_FPS = 20            # Repaints per second at most
+BUCKET_SECONDS = 0.1        # Time covered by one ring buffer slot
+HISTORY_BUCKETS = 50        # Slots per input: 5 s of history
+RATE_SECONDS = 1.0          # Window the event rate is averaged over
+
+COLUMN_INPUT = 0
+COLUMN_TYPE = 1
+COLUMN_EVENTS = 2
+COLUMN_RATE = 3
+COLUMN_LAST = 4
+COLUMN_ACTIVITY = 5
+
+HEADERS = ("Input", "Type", "Events", "Rate", "Last Command", "Activity")
+
+HISTORY_ROLE = Qt.UserRole  # Activity column: bucket counts, oldest first
+
+TYPE_NAMES = {value: name for name, value in INPUT_TYPES.items()}
+SPARKLINE_TYPES = (INPUT_ENCODER, INPUT_POT)
+
+_SPARKLINE_COLOR = QColor('#2196F3')
+_IDLE_COLOR = QColor('#aaaaaa')
+
+
+class ActivityRing:
+    """Event counts over the last `size` time buckets, kept in a fixed-size ring."""
+
+    __slots__ = ('counts', 'bucket_seconds', 'bucket', 'position')
+
+    def __init__(self, size=HISTORY_BUCKETS, bucket_seconds=BUCKET_SECONDS):
+        self.counts = [0] * size
+        self.bucket_seconds = bucket_seconds
+        self.bucket = None      # Bucket number (time / bucket_seconds) of counts[position]
+        self.position = 0
+
+    def advance(self, now):
+        """Move the ring forward to the bucket of `now`, clearing the buckets passed."""
+        bucket = int(now / self.bucket_seconds)
+        if self.bucket is None:
+            self.bucket = bucket
+            return
+        steps = bucket - self.bucket
+        if steps <= 0:
+            return
+        size = len(self.counts)
+        if steps >= size:
+            self.counts = [0] * size
+        else:
+            for _ in range(steps):
+                self.position = (self.position + 1) % size
+                self.counts[self.position] = 0
+        self.bucket = bucket
+
+    def add(self, now, count=1):
+        """Count events at time `now`."""
+        self.advance(now)
+        self.counts[self.position] += count
+
+    def rate(self, seconds=RATE_SECONDS):
+        """Events per second over the complete buckets of the last `seconds`."""
+        buckets = min(len(self.counts) - 1, max(1, round(seconds / self.bucket_seconds)))
+        size = len(self.counts)
+        total = sum(self.counts[(self.position - offset) % size] for offset in range(1, buckets + 1))
+        return total / (buckets * self.bucket_seconds)
+
+    def history(self):
+        """Bucket counts, oldest first (the last one still filling)."""
+        start = self.position + 1
+        return self.counts[start:] + self.counts[:start]
+
+    def idle(self):
+        """True once every bucket is empty."""
+        return not any(self.counts)
+
+    def clear(self):
+        """Empty every bucket."""
+        self.counts = [0] * len(self.counts)
+
+
+class InputActivity:
+    """What the monitor knows about one configured input."""
+
+    __slots__ = ('record', 'commands', 'events', 'last_line', 'last_time', 'ring')
+
+    def __init__(self, record):
+        self.record = record
+        self.commands = _commands(record)
+        self.events = 0
+        self.last_line = ''
+        self.last_time = None
+        self.ring = ActivityRing()
+
+
+class InputMonitorModel(QAbstractTableModel):
+    """
+    Table model of per-input activity.
+
+    feed() takes a batch of lines and only marks rows; refresh() reports
+    all the rows that changed with one dataChanged, once per frame.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.activities = []
+        self.commands = {}          # Keyboard command -> rows of the inputs that send it
+        self.dirty = set()          # Rows with new events since the last refresh
+        self.active = set()         # Rows whose rate or sparkline still moves
+        self.lines = ActivityRing()  # Every line from the board
+        self.unmatched = 0          # Lines that are not a configured command
+
+    # ========== QAbstractTableModel interface ==========
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.activities)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        activity = self.activities[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == COLUMN_INPUT:
+                return activity.record.name
+            if column == COLUMN_TYPE:
+                return TYPE_NAMES.get(activity.record.type, str(activity.record.type))
+            if column == COLUMN_EVENTS:
+                return f"{activity.events:,}"
+            if column == COLUMN_RATE:
+                return f"{activity.ring.rate():.1f}/s" if activity.events else ""
+            if column == COLUMN_LAST:
+                return activity.last_line
+            return None
+        if role == HISTORY_ROLE and column == COLUMN_ACTIVITY and activity.record.type in SPARKLINE_TYPES:
+            return activity.ring.history()
+        if role == Qt.TextAlignmentRole and column in (COLUMN_EVENTS, COLUMN_RATE):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        if role == Qt.ForegroundRole and not activity.events:
+            return _IDLE_COLOR
+        return None
+
+    # ========== Monitoring ==========
+
+    def set_inputs(self, records):
+        """
+        Monitor a new list of inputs. Rows that still send the same command
+        keep their activity.
+
+        Args:
+            records (list): InputConfig records, in table order
+        """
+        old = self.activities
+        self.beginResetModel()
+        self.activities = []
+        self.commands = {}
+        for row, record in enumerate(records):
+            if row < len(old) and old[row].commands == _commands(record):
+                activity = old[row]
+                activity.record = record
+            else:
+                activity = InputActivity(record)
+            self.activities.append(activity)
+            for command in activity.commands:
+                self.commands.setdefault(command, []).append(row)
+        self.dirty = set()
+        self.active = {row for row, activity in enumerate(self.activities) if not activity.ring.idle()}
+        self.endResetModel()
+
+    def feed(self, lines, now):
+        """
+        Count a batch of lines from the board.
+
+        A command sent by several inputs is counted for each of them (the
+        board's output does not tell them apart).
+
+        Args:
+            lines (list): Lines, without terminators
+            now (float): time.monotonic() value
+        """
+        self.lines.add(now, len(lines))
+        commands = self.commands
+        activities = self.activities
+        dirty = self.dirty
+        for line in lines:
+            rows = commands.get(line)
+            if rows is None:
+                self.unmatched += 1
+                continue
+            for row in rows:
+                activity = activities[row]
+                activity.events += 1
+                activity.last_line = line
+                activity.last_time = now
+                activity.ring.add(now)
+                dirty.add(row)
+
+    def refresh(self, now):
+        """
+        Report the rows that changed since the last call: new events, and
+        rates and sparklines moving on for recently active rows.
+
+        Returns:
+            bool: True while any row is still active (the next frame has work)
+        """
+        self.lines.advance(now)
+        self.active |= self.dirty
+        changed = self.dirty | self.active
+        self.dirty = set()
+        for row in list(self.active):
+            ring = self.activities[row].ring
+            ring.advance(now)
+            if ring.idle():
+                self.active.discard(row)
+        if changed:
+            self.dataChanged.emit(self.index(min(changed), COLUMN_EVENTS),
+                                  self.index(max(changed), COLUMN_ACTIVITY))
+        return bool(self.active)
+
+    def clear(self):
+        """Forget all activity."""
+        self.beginResetModel()
+        self.activities = [InputActivity(activity.record) for activity in self.activities]
+        self.dirty = set()
+        self.active = set()
+        self.lines.clear()
+        self.unmatched = 0
+        self.endResetModel()
+
+
+def _commands(record):
+    """Keyboard commands an input sends (its key, and its encoder button keys)."""
+    return tuple(command for command in (record.key, record.button_short_key, record.button_long_key) if command)
+
+
+class SparklineDelegate(QStyledItemDelegate):
+    """Draws the activity history of encoders and pots as a line."""
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+        history = index.data(HISTORY_ROLE)
+        if not history:
+            return
+        rect = option.rect.adjusted(2, 3, -2, -3)
+        peak = max(history) or 1
+        step = rect.width() / max(1, len(history) - 1)
+        points = QPolygonF([QPointF(rect.left() + i * step, rect.bottom() - count * rect.height() / peak)
+                            for i, count in enumerate(history)])
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(_SPARKLINE_COLOR, 1.5))
+        painter.drawPolyline(points)
+        painter.restore()
+
+
+class InputMonitor(QWidget):
+    """Live monitor panel: a table of input activity, repainted at MONITOR_FPS at most."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pending = []   # Lines received since the last frame
+
+        self.model = InputMonitorModel(self)
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setItemDelegateForColumn(COLUMN_ACTIVITY, SparklineDelegate(self.table))
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(COLUMN_INPUT, QHeaderView.Stretch)
+        for column in (COLUMN_TYPE, COLUMN_EVENTS, COLUMN_RATE):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COLUMN_LAST, QHeaderView.Stretch)
+        header.setSectionResizeMode(COLUMN_ACTIVITY, QHeaderView.Fixed)
+        header.resizeSection(COLUMN_ACTIVITY, 160)
+        layout.addWidget(self.table)
+
+        footer = QHBoxLayout()
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet("color: #666; font-size: 10px;")
+        footer.addWidget(self.summary_label)
+        footer.addStretch()
+        clear_btn = QPushButton("Clear Monitor")
+        clear_btn.clicked.connect(self.clear)
+        footer.addWidget(clear_btn)
+        layout.addLayout(footer)
+        self.setLayout(layout)
+
+        # Frames run only while there is something to show
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setInterval(int(1000 / MONITOR_FPS))
+        self.frame_timer.timeout.connect(self.render_frame)
+        self.update_summary()
+
+    def set_inputs(self, records):
+        """Monitor these inputs (the configuration in the table)."""
+        self.model.set_inputs(records)
+        self.update_summary()
+
+    def add_lines(self, lines):
+        """Queue lines from the board; they are shown with the next frame."""
+        self.pending.extend(lines)
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def render_frame(self):
+        """Apply the queued lines and repaint what changed."""
+        now = time.monotonic()
+        if self.pending:
+            self.model.feed(self.pending, now)
+            self.pending = []
+        if not self.model.refresh(now) and self.model.lines.idle():
+            self.frame_timer.stop()
+        self.update_summary()
+
+    def update_summary(self):
+        model = self.model
+        self.summary_label.setText(
+            f"{model.lines.rate():,.0f} lines/s · {model.unmatched:,} not from a configured input")
+
+    def clear(self):
+        self.pending = []
+        self.model.clear()
+        self.update_summary()
@@ -0,0 +1,207 @@
+"""
+Versioned Install Layout for Arduino Input Configurator
+
+Updates are installed as complete, side-by-side version directories and
+activated by rewriting a one-line pointer file, so an install is never a
+mix of two releases and switching (or rolling back) costs one atomic
+rename no matter how many files a release has.
+
+Layout:
+    <install root>/
+        current-version      Name of the active version ("." = the files
+                             directly in the install root, i.e. an install
+                             from before versioned updates)
+        previous-version     Version to roll back to
+        versions/
+            3.1.0/           Complete project tree of one release
+            .staging-3.2.0/  Version being installed (removed on failure)
+
+The launchers (launch-gui.bat, check-updates.bat) follow current-version.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+POINTER_FILE = 'current-version'
+PREVIOUS_FILE = 'previous-version'
+VERSIONS_DIR = 'versions'
+STAGING_PREFIX = '.staging-'
+ROOT_VERSION = '.'
+
+KEEP_VERSIONS = 2  # Active and previous
+
+
+class InstallLayout:
+    """Locates, stages, activates and cleans up versioned installs."""
+
+    def __init__(self, project_root):
+        """
+        Args:
+            project_root (Path): Project tree of the running code; may be a
+                                 version directory or a pre-versioning install
+        """
+        project_root = Path(project_root)
+        if project_root.parent.name == VERSIONS_DIR and (project_root.parent.parent / POINTER_FILE).exists():
+            self.install_root = project_root.parent.parent
+        else:
+            self.install_root = project_root
+        self.running_root = project_root
+        self.versions_dir = self.install_root / VERSIONS_DIR
+
+    # ========== POINTERS ==========
+
+    def _read_pointer(self, name):
+        try:
+            value = (self.install_root / name).read_text().strip()
+        except OSError:
+            return None
+        return value or None
+
+    def _write_pointer(self, name, value):
+        """Replace a pointer file atomically."""
+        path = self.install_root / name
+        temp_path = path.with_name(name + '.tmp')
+        with open(temp_path, 'w') as f:
+            f.write(value + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    def active_version(self):
+        """Name of the active version (ROOT_VERSION for a pre-versioning install)."""
+        name = self._read_pointer(POINTER_FILE)
+        if name and name != ROOT_VERSION and self.version_root(name).is_dir():
+            return name
+        return ROOT_VERSION
+
+    def previous_version(self):
+        """Name of the version to roll back to, or None."""
+        name = self._read_pointer(PREVIOUS_FILE)
+        if name == ROOT_VERSION or (name and self.version_root(name).is_dir()):
+            return name
+        return None
+
+    def version_root(self, name):
+        """Project tree of a version."""
+        if name == ROOT_VERSION:
+            return self.install_root
+        return self.versions_dir / name
+
+    def active_root(self):
+        """Project tree of the active version."""
+        return self.version_root(self.active_version())
+
+    # ========== TRANSACTIONS ==========
+
+    def new_version_name(self, version):
+        """Directory name for a new install of `version` that does not exist yet."""
+        base = ''.join(c if c.isalnum() or c in '.-_+' else '_' for c in str(version or 'update')).strip('.')
+        base = base or 'update'
+        name = base
+        counter = 2
+        while self.version_root(name).exists():
+            name = f'{base}-{counter}'
+            counter += 1
+        return name
+
+    def begin(self, name):
+        """
+        Create an empty staging directory for version `name`.
+
+        Returns:
+            Path: Staging directory
+        """
+        staging = self.versions_dir / (STAGING_PREFIX + name)
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+        return staging
+
+    def abort(self, staging):
+        """Throw away a staging directory."""
+        shutil.rmtree(staging, ignore_errors=True)
+
+    def commit(self, staging, name):
+        """
+        Publish a staged version and make it active.
+
+        The staging directory is renamed to its final name, then the pointer
+        is replaced; until that single rename the old version stays active.
+
+        Args:
+            staging (Path): Directory from begin()
+            name (str): Version name passed to begin()
+        """
+        previous = self.active_version()
+        final = self.version_root(name)
+        os.replace(staging, final)
+        self.activate(name, previous)
+
+    def activate(self, name, previous=None):
+        """
+        Point the install at an existing version.
+
+        Args:
+            name (str): Version to activate
+            previous (str): Version to record for rollback
+        """
+        if previous is not None and previous != name:
+            self._write_pointer(PREVIOUS_FILE, previous)
+        self._write_pointer(POINTER_FILE, name)
+
+    def rollback(self):
+        """
+        Re-activate the previous version.
+
+        Returns:
+            str: Name of the now-active version, or None if there is nothing to roll back to
+        """
+        previous = self.previous_version()
+        current = self.active_version()
+        if previous is None or previous == current:
+            return None
+        self.activate(previous, current)
+        return previous
+
+    def collect_garbage(self, keep=KEEP_VERSIONS):
+        """
+        Delete versions other than the active, previous and running ones,
+        and any staging directories left behind by an interrupted install.
+
+        Args:
+            keep (int): How many of the newest versions to keep at least
+
+        Returns:
+            list: Names of deleted directories
+        """
+        if not self.versions_dir.is_dir():
+            return []
+
+        protected = {self.active_version(), self.previous_version()}
+        versions = []
+        for path in self.versions_dir.iterdir():
+            if not path.is_dir():
+                continue
+            if path.name.startswith(STAGING_PREFIX):
+                continue
+            versions.append(path)
+
+        # Newest first; the active/previous versions always survive
+        versions.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        kept = [path for path in versions if path.name in protected]
+        removed = []
+        for path in versions:
+            if path.name in protected or path == self.running_root:
+                continue
+            if len(kept) < keep:
+                kept.append(path)
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+
+        for path in self.versions_dir.glob(STAGING_PREFIX + '*'):
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+
+        return removed
@@ -7,13 +7,21 @@ and sends keyboard commands to the computer.
 Replaces the need for Arduino Pro Micro.
 """
 
+import os
 import sys
 import time
+import selectors
 import serial
 import serial.tools.list_ports
 import threading
 import json
+from collections import deque
+from queue import Queue, Empty
 from pathlib import Path
+from types import MappingProxyType
+
+from serial_framing import LineFramer
+from serial_recorder import SerialRecorder, RecordingSerial
 
 # Try to import keyboard library
 try:
@@ -23,34 +31,474 @@ except ImportError:
     KEYBOARD_AVAILABLE = False
     print("Warning: 'keyboard' library not available. Install with: pip install keyboard")
 
+_MISSING = object()
+
+
+# Map special key names to keyboard library format
+KEY_MAPPING = {
+    'UPARROW': 'up', 'UP': 'up',
+    'DOWNARROW': 'down', 'DOWN': 'down',
+    'LEFTARROW': 'left', 'LEFT': 'left',
+    'RIGHTARROW': 'right', 'RIGHT': 'right',
+    'ENTER': 'enter', 'RETURN': 'enter',
+    'ESC': 'esc', 'ESCAPE': 'esc',
+    'TAB': 'tab',
+    'SPACE': 'space',
+    'BACKSPACE': 'backspace',
+    'DELETE': 'delete', 'DEL': 'delete',
+    'HOME': 'home',
+    'END': 'end',
+    'PAGEUP': 'page up', 'PGUP': 'page up',
+    'PAGEDOWN': 'page down', 'PGDN': 'page down',
+    'F1': 'f1', 'F2': 'f2', 'F3': 'f3', 'F4': 'f4',
+    'F5': 'f5', 'F6': 'f6', 'F7': 'f7', 'F8': 'f8',
+    'F9': 'f9', 'F10': 'f10', 'F11': 'f11', 'F12': 'f12',
+}
+
+
+class Hotkey:
+    """A compiled keyboard command, ready to hand to keyboard.send."""
+
+    __slots__ = ('name', 'keys')
+
+    def __init__(self, name, keys):
+        """
+        Args:
+            name (str): Hotkey in keyboard library format (e.g., "ctrl+up")
+            keys: Pre-parsed scan codes from keyboard.parse_hotkey, or the
+                  name itself when the OS key tables are not available
+        """
+        self.name = name
+        self.keys = keys
+
+
+class CommandTable:
+    """
+    Lookup table from raw Arduino command lines to compiled Hotkey objects.
+
+    Every CTRL+ command the firmware can send (mapped key names and single
+    printable characters) is compiled once up front into a read-only table.
+    Anything else is compiled on first sight and remembered, including
+    unknown commands, which are stored as None so repeats cost one lookup.
+    """
+
+    def __init__(self, extra_commands=(), max_learned=1024):
+        """
+        Initialize and compile the table.
+
+        Args:
+            extra_commands (iterable): Additional raw commands to precompile
+                                       (e.g., the keys from a loaded config)
+            max_learned (int): Cap on commands learned at runtime, so serial
+                               noise cannot grow the table without bound
+        """
+        self.parse_keys = KEYBOARD_AVAILABLE
+        self.max_learned = max_learned
+        self.learned = {}
+
+        commands = {}
+        for command in self.default_commands():
+            commands[command] = self.compile_command(command)
+        for command in extra_commands:
+            commands[command] = self.compile_command(command)
+        self.commands = MappingProxyType(commands)
+
+    @staticmethod
+    def default_commands():
+        """Every CTRL+ command the firmware is expected to send."""
+        keys = list(KEY_MAPPING)
+        keys += [chr(c) for c in range(0x21, 0x7f)]
+        return ['CTRL+' + key for key in keys]
+
+    def compile_command(self, command):
+        """
+        Compile a raw command line into a Hotkey.
+
+        Args:
+            command (str): Command like "CTRL+F" or "CTRL+UPARROW"
+
+        Returns:
+            Hotkey: Compiled hotkey, or None if the command is not sendable
+        """
+        command = command.strip()
+
+        # All commands should start with "CTRL+"
+        if not command.startswith("CTRL+"):
+            return None
+
+        # Extract the key part after "CTRL+"
+        key_part = command[5:]
+
+        if not key_part:
+            return None
+
+        # Convert to keyboard library format (single character or unmapped otherwise)
+        final_key = KEY_MAPPING.get(key_part.upper(), key_part.lower())
+        name = 'ctrl+' + final_key
+
+        keys = name
+        if self.parse_keys:
+            try:
+                keys = keyboard.parse_hotkey(name)
+            except ValueError:
+                # Not a key the keyboard library knows
+                return None
+            except Exception:
+                # OS key tables unavailable; let keyboard.send parse at send time
+                self.parse_keys = False
+
+        return Hotkey(name, keys)
+
+    def lookup(self, command):
+        """
+        Find the compiled hotkey for a raw command line.
+
+        Args:
+            command (str): Raw line as received from the Arduino
+
+        Returns:
+            Hotkey: Compiled hotkey, or None if the command is not sendable
+        """
+        hotkey = self.commands.get(command, _MISSING)
+        if hotkey is not _MISSING:
+            return hotkey
+
+        hotkey = self.learned.get(command, _MISSING)
+        if hotkey is not _MISSING:
+            return hotkey
+
+        hotkey = self.commands.get(command.strip(), _MISSING)
+        if hotkey is _MISSING:
+            hotkey = self.compile_command(command)
+
+        if len(self.learned) < self.max_learned:
+            self.learned[command] = hotkey
+        return hotkey
+
+
+class CommandQueue:
+    """
+    Bounded hand-off queue between the serial reader and the key dispatcher.
+
+    Overflow policies (applied when the queue is full):
+        drop-oldest: discard the oldest queued command to make room
+        coalesce:    fold the command into the newest entry if identical
+                     (it is then dispatched repeat-count times), otherwise
+                     fall back to drop-oldest
+        block:       make the reader wait until the dispatcher catches up
+    """
+
+    OVERFLOW_POLICIES = ('drop-oldest', 'coalesce', 'block')
+
+    def __init__(self, maxsize=256, overflow='drop-oldest'):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize (int): Maximum number of queued entries
+            overflow (str): One of OVERFLOW_POLICIES
+        """
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self.entries = deque()  # [command, repeat_count, enqueued_at]
+        self.condition = threading.Condition()
+        self.closed = False
+
+        # Counters
+        self.enqueued = 0
+        self.dispatched = 0
+        self.dispatched_entries = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def put(self, command):
+        """
+        Queue a command, applying the overflow policy if the queue is full.
+
+        Args:
+            command (str): Command line received from the Arduino
+
+        Returns:
+            bool: False if the queue has been closed
+        """
+        with self.condition:
+            if self.closed:
+                return False
+
+            self.enqueued += 1
+
+            if len(self.entries) >= self.maxsize:
+                if self.overflow == 'block':
+                    while len(self.entries) >= self.maxsize and not self.closed:
+                        self.condition.wait()
+                    if self.closed:
+                        return False
+                elif self.overflow == 'coalesce' and self.entries[-1][0] == command:
+                    self.entries[-1][1] += 1
+                    self.coalesced += 1
+                    return True
+                else:
+                    dropped = self.entries.popleft()
+                    self.dropped += dropped[1]
+
+            self.entries.append([command, 1, time.perf_counter()])
+            self.max_depth = max(self.max_depth, len(self.entries))
+            self.condition.notify_all()
+            return True
+
+    def get(self, timeout=None):
+        """
+        Wait for the next queued entry.
+
+        Args:
+            timeout (float): Seconds to wait (None waits until closed)
+
+        Returns:
+            tuple: (command, repeat_count, enqueued_at), or None on timeout/close
+        """
+        with self.condition:
+            if not self.entries and not self.closed:
+                self.condition.wait(timeout)
+            if not self.entries:
+                return None
+
+            entry = self.entries.popleft()
+            self.condition.notify_all()
+            return tuple(entry)
+
+    def get_matching(self, command, timeout):
+        """
+        Pop the next entry only if it repeats `command`.
+
+        Args:
+            command (str): Command the next entry must match
+            timeout (float): Seconds to wait for a next entry
+
+        Returns:
+            int: Repeat count of the popped entry, or 0 if the next entry
+                 differs, the timeout expired or the queue was closed
+        """
+        with self.condition:
+            if not self.entries and not self.closed and timeout > 0:
+                self.condition.wait(timeout)
+            if not self.entries or self.entries[0][0] != command:
+                return 0
+
+            entry = self.entries.popleft()
+            self.condition.notify_all()
+            return entry[1]
+
+    def record_dispatch(self, repeat_count, enqueued_at):
+        """Record that an entry finished dispatching."""
+        latency = time.perf_counter() - enqueued_at
+        with self.condition:
+            self.dispatched += repeat_count
+            self.dispatched_entries += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def close(self):
+        """Wake up any waiting reader or dispatcher; queued entries are still drained."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def get_stats(self):
+        """
+        Snapshot of the queue counters.
+
+        Returns:
+            dict: depth, max_depth, enqueued, dispatched, dropped, coalesced,
+                  avg_latency_ms, max_latency_ms
+        """
+        with self.condition:
+            entries_done = max(1, self.dispatched_entries)
+            return {
+                'depth': len(self.entries),
+                'max_depth': self.max_depth,
+                'enqueued': self.enqueued,
+                'dispatched': self.dispatched,
+                'dropped': self.dropped,
+                'coalesced': self.coalesced,
+                'avg_latency_ms': self.latency_total / entries_done * 1000,
+                'max_latency_ms': self.latency_max * 1000,
+            }
+
+
+class BurstCoalescer:
+    """
+    Optional stage that merges runs of identical commands (e.g., a fast
+    encoder spin) before they reach the keyboard.
+
+    Modes:
+        batch:  send every press of the run, but no faster than max_rate
+        single: send one press per run, however many detents it contained
+    """
+
+    MODES = ('batch', 'single')
+
+    def __init__(self, window=0.03, mode='batch', max_rate=50):
+        """
+        Initialize the coalescer.
+
+        Args:
+            window (float): Seconds after the first command of a run during
+                            which identical commands are merged into it
+            mode (str): One of MODES
+            max_rate (float): Maximum presses per second in batch mode
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown coalescing mode: {mode}")
+
+        self.window = window
+        self.mode = mode
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.last_send = 0.0
+
+        # Counters
+        self.runs = 0
+        self.merged = 0
+        self.skipped = 0
+
+    def collect(self, queue, command, repeat_count, enqueued_at):
+        """
+        Merge queued repeats of `command` that arrive within the window.
+
+        Returns:
+            int: Total number of presses in the run
+        """
+        deadline = enqueued_at + self.window
+        while True:
+            remaining = deadline - time.perf_counter()
+            more = queue.get_matching(command, remaining)
+            if not more:
+                break
+            repeat_count += more
+            self.merged += more
+
+        self.runs += 1
+        return repeat_count
+
+    def dispatch(self, send, command, repeat_count):
+        """
+        Send a merged run according to the coalescing mode.
+
+        Args:
+            send (callable): Sends a single press (e.g., process_command)
+            command (str): Command of the run
+            repeat_count (int): Presses in the run
+        """
+        if self.mode == 'single':
+            self.skipped += repeat_count - 1
+            repeat_count = 1
+
+        for _ in range(repeat_count):
+            if self.min_interval:
+                wait = self.last_send + self.min_interval - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            self.last_send = time.perf_counter()
+            send(command)
+
+    def get_stats(self):
+        """
+        Returns:
+            dict: runs, merged, skipped
+        """
+        return {'runs': self.runs, 'merged': self.merged, 'skipped': self.skipped}
+
 
 class KeyboardDaemon:
-    def __init__(self, port=None, baud_rate=115200):
+    READY_BANNER = "Ready"        # Printed by the firmware once setup() is done
+    READY_TIMEOUT = 3.0           # Seconds to wait for the banner after opening the port
+    RECONNECT_MIN_DELAY = 0.05    # First reconnect attempt after a disconnect
+    RECONNECT_MAX_DELAY = 2.0     # Backoff ceiling while the board is unplugged
+    DRAIN_TIMEOUT = 2.0           # Seconds stop() waits for queued commands to be sent
+
+    def __init__(self, port=None, baud_rate=115200, queue_size=256, overflow_policy='drop-oldest',
+                 coalescer=None, auto_reconnect=True, keyboard_sink=None, recorder=None):
         """
         Initialize the keyboard daemon.
 
         Args:
             port (str): Serial port to connect to (auto-detect if None)
             baud_rate (int): Serial baud rate
+            queue_size (int): Maximum commands waiting for the dispatcher
+            overflow_policy (str): What to do when the queue is full
+                                   (see CommandQueue.OVERFLOW_POLICIES)
+            coalescer (BurstCoalescer): Optional stage merging repeated
+                                        commands (disabled if None)
+            auto_reconnect (bool): Wait for the board to reappear after a
+                                   disconnect instead of stopping
+            keyboard_sink: Object with a send(hotkey) method used instead of
+                           the keyboard library (e.g., a FakeKeyboard for replays)
+            recorder (SerialRecorder): Optional log capturing all serial traffic
         """
         self.port = port
         self.baud_rate = baud_rate
         self.serial_connection = None
         self.running = False
         self.thread = None
+        self.queue_size = queue_size
+        self.overflow_policy = overflow_policy
+        self.command_queue = CommandQueue(queue_size, overflow_policy)
+        self.dispatch_thread = None
+        self.command_table = CommandTable()
+        self.coalescer = coalescer
+        self.auto_reconnect = auto_reconnect
+        self.port_serial_number = None  # USB serial number, to find the board again after a replug
+        self.pending_lines = []         # Lines read while waiting for the ready banner
+        self.keyboard_sink = keyboard_sink or (keyboard if KEYBOARD_AVAILABLE else None)
+        self.recorder = recorder
 
-    def find_arduino_port(self):
-        """Auto-detect Arduino Mega port."""
+    def find_arduino_ports(self, verbose=True):
+        """Auto-detect every attached Arduino Mega port."""
         ports = serial.tools.list_ports.comports()
+        found = []
 
         for port in ports:
             # Look for Arduino Mega
             if 'Arduino' in port.description or 'CH340' in port.description or 'USB-SERIAL' in port.description:
-                print(f"Found potential Arduino at {port.device}: {port.description}")
+                if verbose:
+                    print(f"Found potential Arduino at {port.device}: {port.description}")
+                found.append(port.device)
+
+        return found
+
+    def locate_board(self):
+        """
+        Find the port the board is currently attached to.
+
+        Looks for the USB serial number seen on the first connect (the device
+        name may change after a replug), falling back to the original port.
+
+        Returns:
+            str: Port device, or None if the board is not attached
+        """
+        ports = serial.tools.list_ports.comports()
+
+        if self.port_serial_number:
+            for port in ports:
+                if port.serial_number == self.port_serial_number:
+                    return port.device
+
+        for port in ports:
+            if port.device == self.port:
                 return port.device
 
         return None
 
+    def find_arduino_port(self):
+        """Auto-detect Arduino Mega port."""
+        ports = self.find_arduino_ports()
+        return ports[0] if ports else None
+
     def connect(self):
         """Connect to Arduino Mega via serial."""
         if not KEYBOARD_AVAILABLE:
@@ -67,14 +515,101 @@ class KeyboardDaemon:
 
         try:
             print(f"Connecting to Arduino Mega on {self.port}...")
-            self.serial_connection = serial.Serial(self.port, self.baud_rate, timeout=1)
-            time.sleep(2)  # Wait for Arduino to reset
+            self.open_port(self.port)
             print(f"Connected to {self.port}")
             return True
         except serial.SerialException as e:
             print(f"Failed to connect: {e}")
             return False
 
+    def open_port(self, port):
+        """
+        Open the serial port and wait until the firmware is ready.
+
+        Args:
+            port (str): Serial port to open
+
+        Raises:
+            serial.SerialException: If the port cannot be opened
+        """
+        self.serial_connection = serial.Serial(port, self.baud_rate, timeout=1)
+        if self.recorder:
+            self.serial_connection = RecordingSerial(self.serial_connection, self.recorder)
+        self.port = port
+
+        for info in serial.tools.list_ports.comports():
+            if info.device == port and info.serial_number:
+                self.port_serial_number = info.serial_number
+
+        if not self.wait_for_ready():
+            print(f"No ready banner from {port} after {self.READY_TIMEOUT:.0f}s, continuing anyway")
+
+    def wait_for_ready(self):
+        """
+        Wait for the Arduino to finish resetting after the port was opened.
+
+        Returns as soon as the firmware prints its ready banner, or as soon
+        as a keyboard command arrives (the board did not reset). Lines read
+        meanwhile are kept in pending_lines for the read loop.
+
+        Returns:
+            bool: True if the board is ready, False on timeout
+        """
+        framer = LineFramer()
+        connection = self.serial_connection
+        deadline = time.monotonic() + self.READY_TIMEOUT
+        self.pending_lines = []
+
+        while time.monotonic() < deadline:
+            data = connection.read(connection.in_waiting or 1)
+            if not data:
+                continue
+
+            for line in framer.feed(data):
+                self.pending_lines.append(line)
+                if self.READY_BANNER in line or line.startswith("CTRL+"):
+                    return True
+
+        return False
+
+    def reconnect(self):
+        """
+        Wait for the board to reappear and reopen it, with exponential backoff.
+
+        Returns:
+            bool: True once reconnected, False if the daemon was stopped
+        """
+        if self.serial_connection:
+            try:
+                self.serial_connection.close()
+            except Exception:
+                pass
+
+        delay = self.RECONNECT_MIN_DELAY
+        while self.running:
+            port = self.locate_board()
+            if port:
+                try:
+                    self.open_port(port)
+                    print(f"Reconnected to {port}")
+                    return True
+                except serial.SerialException as e:
+                    print(f"Reconnect to {port} failed: {e}")
+
+            time.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+        return False
+
+    def load_commands(self, commands):
+        """
+        Recompile the command table with the commands from a configuration.
+
+        Args:
+            commands (iterable): Raw key commands (e.g., "CTRL+F") the board will send
+        """
+        self.command_table = CommandTable(commands)
+
     def process_command(self, command):
         """
         Process a keyboard command from Arduino.
@@ -82,54 +617,17 @@ class KeyboardDaemon:
         Args:
             command (str): Command like "CTRL+F" or "CTRL+UPARROW"
         """
-        if not KEYBOARD_AVAILABLE:
+        if self.keyboard_sink is None:
             return
 
-        command = command.strip()
-
-        # All commands should start with "CTRL+"
-        if not command.startswith("CTRL+"):
-            return
-
-        # Extract the key part after "CTRL+"
-        key_part = command[5:]
-
-        if not key_part:
+        hotkey = self.command_table.lookup(command)
+        if hotkey is None:
             return
 
         try:
-            # Map special key names to keyboard library format
-            key_mapping = {
-                'UPARROW': 'up', 'UP': 'up',
-                'DOWNARROW': 'down', 'DOWN': 'down',
-                'LEFTARROW': 'left', 'LEFT': 'left',
-                'RIGHTARROW': 'right', 'RIGHT': 'right',
-                'ENTER': 'enter', 'RETURN': 'enter',
-                'ESC': 'esc', 'ESCAPE': 'esc',
-                'TAB': 'tab',
-                'SPACE': 'space',
-                'BACKSPACE': 'backspace',
-                'DELETE': 'delete', 'DEL': 'delete',
-                'HOME': 'home',
-                'END': 'end',
-                'PAGEUP': 'page up', 'PGUP': 'page up',
-                'PAGEDOWN': 'page down', 'PGDN': 'page down',
-                'F1': 'f1', 'F2': 'f2', 'F3': 'f3', 'F4': 'f4',
-                'F5': 'f5', 'F6': 'f6', 'F7': 'f7', 'F8': 'f8',
-                'F9': 'f9', 'F10': 'f10', 'F11': 'f11', 'F12': 'f12',
-            }
-
-            # Convert to keyboard library format
-            key_part_upper = key_part.upper()
-            if key_part_upper in key_mapping:
-                final_key = key_mapping[key_part_upper]
-            else:
-                # Single character or unmapped
-                final_key = key_part.lower()
-
             # Send the keyboard command
-            keyboard.send('ctrl+' + final_key)
-            print(f"Sent: ctrl+{final_key}")
+            self.keyboard_sink.send(hotkey.keys)
+            print(f"Sent: {hotkey.name}")
 
         except Exception as e:
             print(f"Error sending keyboard command: {e}")
@@ -139,41 +637,105 @@ class KeyboardDaemon:
         if not self.connect():
             return
 
+        self.serve()
+
+    def serve(self, verbose=True):
+        """
+        Run the reader and dispatcher on the already open serial connection
+        until stopped.
+
+        Args:
+            verbose (bool): Print the startup banner
+        """
         self.running = True
-        print("\nKeyboard Daemon running...")
-        print("Reading commands from Arduino and sending keyboard input.")
-        print("Press Ctrl+C to stop.\n")
+        if verbose:
+            print("\nKeyboard Daemon running...")
+            print("Reading commands from Arduino and sending keyboard input.")
+            print("Press Ctrl+C to stop.\n")
 
-        input_buffer = ""
+        # Key injection runs on its own thread so a slow keyboard.send
+        # never stalls draining of the serial port
+        self.command_queue = CommandQueue(self.queue_size, self.overflow_policy)
+        self.dispatch_thread = threading.Thread(target=self.dispatch_loop, daemon=True)
+        self.dispatch_thread.start()
 
         try:
             while self.running:
-                if self.serial_connection and self.serial_connection.in_waiting > 0:
-                    try:
-                        # Read incoming data
-                        char = self.serial_connection.read(1).decode('utf-8', errors='ignore')
-
-                        if char == '\n':
-                            # Complete command received
-                            if input_buffer:
-                                self.process_command(input_buffer)
-                                input_buffer = ""
-                        else:
-                            input_buffer += char
-                            # Prevent buffer overflow
-                            if len(input_buffer) > 100:
-                                input_buffer = ""
-
-                    except Exception as e:
-                        print(f"Error reading serial: {e}")
-
-                time.sleep(0.001)  # Small delay to prevent CPU spinning
+                self.read_loop(self.command_queue.put)
+
+                if not self.running or not self.auto_reconnect:
+                    break
 
+                print("Connection lost. Waiting for the Arduino to reconnect...")
+                if not self.reconnect():
+                    break
         except KeyboardInterrupt:
             print("\nStopping daemon...")
         finally:
             self.stop()
 
+    def read_loop(self, on_line=None):
+        """
+        Drain the serial port and hand every complete line to `on_line`.
+
+        Blocks on the port (up to its read timeout) instead of polling, and
+        reads everything already waiting in one call.
+
+        Args:
+            on_line (callable): Called with each line (defaults to process_command)
+        """
+        if on_line is None:
+            on_line = self.process_command
+
+        framer = LineFramer()
+        connection = self.serial_connection
+
+        pending, self.pending_lines = self.pending_lines, []
+        for line in pending:
+            on_line(line)
+
+        while self.running:
+            try:
+                data = connection.read(connection.in_waiting or 1)
+            except Exception as e:
+                if self.running:
+                    print(f"Error reading serial: {e}")
+                break
+
+            if not data:
+                continue
+
+            for line in framer.feed(data):
+                on_line(line)
+
+    def dispatch_loop(self):
+        """Send queued commands until the queue is closed and drained."""
+        queue = self.command_queue
+
+        while True:
+            entry = queue.get()
+            if entry is None:
+                if queue.closed:
+                    break
+                continue
+
+            command, repeat_count, enqueued_at = entry
+            if self.coalescer:
+                repeat_count = self.coalescer.collect(queue, command, repeat_count, enqueued_at)
+                self.coalescer.dispatch(self.process_command, command, repeat_count)
+            else:
+                for _ in range(repeat_count):
+                    self.process_command(command)
+            queue.record_dispatch(repeat_count, enqueued_at)
+
+    def get_stats(self):
+        """Return the command queue counters (see CommandQueue.get_stats),
+        plus the coalescer counters when coalescing is enabled."""
+        stats = self.command_queue.get_stats()
+        if self.coalescer:
+            stats.update(self.coalescer.get_stats())
+        return stats
+
     def start_background(self):
         """Start the daemon in a background thread."""
         if self.thread and self.thread.is_alive():
@@ -189,9 +751,256 @@ class KeyboardDaemon:
         self.running = False
         if self.serial_connection and self.serial_connection.is_open:
             self.serial_connection.close()
+
+        self.command_queue.close()
+        if self.dispatch_thread and self.dispatch_thread is not threading.current_thread():
+            self.dispatch_thread.join(timeout=self.DRAIN_TIMEOUT)
+
+        stats = self.get_stats()
+        print(f"Commands dispatched: {stats['dispatched']}, dropped: {stats['dropped']}, "
+              f"coalesced: {stats['coalesced']}, max queue depth: {stats['max_depth']}, "
+              f"avg latency: {stats['avg_latency_ms']:.2f} ms")
+        if self.coalescer:
+            print(f"Coalesced runs: {stats['runs']}, merged: {stats['merged']}, skipped: {stats['skipped']}")
+        if self.recorder:
+            self.recorder.close()
         print("Daemon stopped")
 
 
+class BoardConnection:
+    """Serial port and line framer for one board of a MultiBoardDaemon."""
+
+    __slots__ = ('port', 'serial_connection', 'framer')
+
+    def __init__(self, port, serial_connection):
+        self.port = port
+        self.serial_connection = serial_connection
+        self.framer = LineFramer()
+
+
+class MultiBoardDaemon(KeyboardDaemon):
+    """
+    Keyboard daemon that serves several Arduino boards at once.
+
+    On POSIX systems all ports are multiplexed with a selector on a single
+    thread, which sleeps until any board has data. Windows cannot select()
+    on COM ports, so there each board gets a reader thread blocking in
+    read() that hands its data to the same loop through a queue - one
+    thread per board instead of one in total, but still no polling. Each
+    board keeps its own line framer; complete lines from every board feed
+    the shared command queue and dispatcher.
+
+    Boards are not waited on after opening: their reset banner simply flows
+    through the framer and is ignored like any other non-command line. The
+    port list is rescanned periodically so unplugged boards are picked up
+    again (and, when auto-detecting, new boards are added) while running.
+    """
+
+    RESCAN_INTERVAL = 0.5  # Seconds between hot-plug scans
+
+    def __init__(self, ports=None, baud_rate=115200, **kwargs):
+        """
+        Initialize the multi-board daemon.
+
+        Args:
+            ports (list): Serial ports to open (auto-detect all boards if None)
+            baud_rate (int): Serial baud rate
+            **kwargs: Queue, coalescing and reconnect options (see KeyboardDaemon)
+        """
+        super().__init__(port=None, baud_rate=baud_rate, **kwargs)
+        self.ports = ports
+        self.boards = []
+        self.retry_at = {}     # port -> monotonic time of the next open attempt
+        self.retry_delay = {}  # port -> current backoff delay
+
+    def connect(self):
+        """Connect to every Arduino Mega via serial."""
+        if not KEYBOARD_AVAILABLE:
+            print("ERROR: 'keyboard' library not installed!")
+            print("Install with: pip install keyboard")
+            return False
+
+        self.boards = []
+        self.scan_boards(verbose=True)
+
+        if not self.boards:
+            print("ERROR: Could not find any Arduino Mega. Please specify ports manually.")
+            return False
+
+        print(f"Connected to {len(self.boards)} board(s): {', '.join(b.port for b in self.boards)}")
+        return True
+
+    def scan_boards(self, verbose=False):
+        """
+        Open every expected board that is not connected yet.
+
+        Ports that fail to open are retried with exponential backoff.
+
+        Returns:
+            list: Newly connected BoardConnection objects
+        """
+        ports = self.ports or self.find_arduino_ports(verbose)
+        connected = {board.port for board in self.boards}
+        now = time.monotonic()
+        opened = []
+
+        for port in ports:
+            if port in connected or self.retry_at.get(port, 0) > now:
+                continue
+
+            try:
+                if verbose:
+                    print(f"Connecting to Arduino Mega on {port}...")
+                # Non-blocking where the event loop only reads ports reported
+                # ready; on Windows each board's reader thread blocks instead
+                timeout = self.RESCAN_INTERVAL if os.name == 'nt' else 0
+                connection = serial.Serial(port, self.baud_rate, timeout=timeout)
+                if self.recorder:
+                    connection = RecordingSerial(connection, self.recorder)
+            except serial.SerialException as e:
+                if verbose:
+                    print(f"Failed to connect to {port}: {e}")
+                delay = min(self.retry_delay.get(port, self.RECONNECT_MIN_DELAY / 2) * 2,
+                            self.RECONNECT_MAX_DELAY)
+                self.retry_delay[port] = delay
+                self.retry_at[port] = now + delay
+                continue
+
+            self.retry_delay.pop(port, None)
+            self.retry_at.pop(port, None)
+            board = BoardConnection(port, connection)
+            self.boards.append(board)
+            opened.append(board)
+            if not verbose:
+                print(f"Board on {port} connected ({len(self.boards)} total)")
+
+        return opened
+
+    def read_loop(self, on_line=None):
+        """
+        Multiplex all board ports and hand every complete line to `on_line`.
+
+        Args:
+            on_line (callable): Called with each line (defaults to process_command)
+        """
+        if on_line is None:
+            on_line = self.process_command
+
+        if os.name == 'nt':
+            self._threaded_read_loop(on_line)
+            return
+
+        selector = selectors.DefaultSelector()
+        for board in self.boards:
+            selector.register(board.serial_connection.fileno(), selectors.EVENT_READ, board)
+
+        next_scan = time.monotonic() + self.RESCAN_INTERVAL
+        try:
+            while self.running and (self.boards or self.auto_reconnect):
+                for key, _ in selector.select(timeout=self.RESCAN_INTERVAL):
+                    board = key.data
+                    if self._read_board(board, on_line) < 0:
+                        selector.unregister(key.fd)
+
+                if self.auto_reconnect and time.monotonic() >= next_scan:
+                    for board in self.scan_boards():
+                        selector.register(board.serial_connection.fileno(), selectors.EVENT_READ, board)
+                    next_scan = time.monotonic() + self.RESCAN_INTERVAL
+        finally:
+            selector.close()
+
+    def _threaded_read_loop(self, on_line):
+        """
+        Windows: COM port handles cannot be passed to select(), so every
+        board gets a thread blocking in read() (see _board_reader). This
+        thread waits on their shared queue and still frames and dispatches
+        every line, so lines reach `on_line` from one thread only.
+        """
+        received = Queue()
+
+        def start_reader(board):
+            threading.Thread(target=self._board_reader, args=(board, received), daemon=True).start()
+
+        for board in self.boards:
+            start_reader(board)
+
+        next_scan = time.monotonic() + self.RESCAN_INTERVAL
+        while self.running and (self.boards or self.auto_reconnect):
+            try:
+                board, data = received.get(timeout=self.RESCAN_INTERVAL)
+            except Empty:
+                pass
+            else:
+                if data is None:
+                    if board in self.boards:
+                        self._drop_board(board)
+                elif board in self.boards:  # Not dropped while the read was queued
+                    for line in board.framer.feed(data):
+                        on_line(line)
+
+            if self.auto_reconnect and time.monotonic() >= next_scan:
+                for board in self.scan_boards():
+                    start_reader(board)
+                next_scan = time.monotonic() + self.RESCAN_INTERVAL
+
+    def _board_reader(self, board, received):
+        """
+        Read one board until it fails or the daemon stops, queuing
+        (board, bytes) for each read and (board, None) when the port fails.
+        Reads block for up to the port's timeout, so an idle board costs nothing.
+        """
+        connection = board.serial_connection
+        while self.running and board in self.boards:
+            try:
+                data = connection.read(connection.in_waiting or 1)
+            except Exception as e:
+                if self.running:
+                    print(f"Error reading serial on {board.port}: {e}")
+                received.put((board, None))
+                return
+            if data:
+                received.put((board, data))
+
+    def _read_board(self, board, on_line):
+        """
+        Drain one board and dispatch its complete lines.
+
+        Returns:
+            int: Number of bytes read, or -1 if the board was disconnected
+        """
+        connection = board.serial_connection
+        try:
+            data = connection.read(connection.in_waiting or 1)
+        except Exception as e:
+            if self.running:
+                print(f"Error reading serial on {board.port}: {e}")
+            self._drop_board(board)
+            return -1
+
+        if data:
+            for line in board.framer.feed(data):
+                on_line(line)
+        return len(data)
+
+    def _drop_board(self, board):
+        """Close and forget a board that failed."""
+        if board in self.boards:
+            self.boards.remove(board)
+        try:
+            board.serial_connection.close()
+        except Exception:
+            pass
+        self.retry_at[board.port] = time.monotonic() + self.RECONNECT_MIN_DELAY
+        print(f"Board on {board.port} disconnected ({len(self.boards)} remaining)")
+
+    def stop(self):
+        """Stop the daemon and close every board."""
+        for board in self.boards:
+            if board.serial_connection.is_open:
+                board.serial_connection.close()
+        super().stop()
+
+
 def main():
     """Command-line interface for keyboard daemon."""
     import argparse
@@ -200,6 +1009,23 @@ def main():
     parser.add_argument('-p', '--port', help='Serial port (auto-detect if not specified)')
     parser.add_argument('-b', '--baud', type=int, default=115200, help='Baud rate (default: 115200)')
     parser.add_argument('-l', '--list', action='store_true', help='List available serial ports')
+    parser.add_argument('-r', '--record', metavar='FILE',
+                        help='Record all serial traffic to FILE (replay with serial_recorder.py)')
+    parser.add_argument('--no-reconnect', action='store_true',
+                        help='Exit when the Arduino disconnects instead of waiting for it to come back')
+    parser.add_argument('-a', '--all-boards', action='store_true',
+                        help='Serve every detected Arduino (or the comma-separated ports given with -p); '
+                             'on Windows this uses one reader thread per board')
+    parser.add_argument('-q', '--queue-size', type=int, default=256,
+                        help='Maximum commands waiting to be sent (default: 256)')
+    parser.add_argument('--overflow', choices=CommandQueue.OVERFLOW_POLICIES, default='drop-oldest',
+                        help='What to do when the command queue is full (default: drop-oldest)')
+    parser.add_argument('--coalesce', type=float, default=0, metavar='MS',
+                        help='Merge repeated commands arriving within MS milliseconds (default: off)')
+    parser.add_argument('--coalesce-mode', choices=BurstCoalescer.MODES, default='batch',
+                        help='batch: replay every press rate-limited, single: one press per run (default: batch)')
+    parser.add_argument('--max-rate', type=float, default=50,
+                        help='Maximum key presses per second when coalescing in batch mode (default: 50)')
 
     args = parser.parse_args()
 
@@ -218,8 +1044,24 @@ def main():
         print("      or add your user to the 'input' group")
         sys.exit(1)
 
+    coalescer = None
+    if args.coalesce > 0:
+        coalescer = BurstCoalescer(args.coalesce / 1000.0, args.coalesce_mode, args.max_rate)
+
+    recorder = SerialRecorder(args.record) if args.record else None
+
     # Create and run daemon
-    daemon = KeyboardDaemon(port=args.port, baud_rate=args.baud)
+    if args.all_boards:
+        ports = args.port.split(',') if args.port else None
+        daemon = MultiBoardDaemon(ports=ports, baud_rate=args.baud,
+                                  queue_size=args.queue_size, overflow_policy=args.overflow,
+                                  coalescer=coalescer, auto_reconnect=not args.no_reconnect,
+                                  recorder=recorder)
+    else:
+        daemon = KeyboardDaemon(port=args.port, baud_rate=args.baud,
+                                queue_size=args.queue_size, overflow_policy=args.overflow,
+                                coalescer=coalescer, auto_reconnect=not args.no_reconnect,
+                                recorder=recorder)
     daemon.run()
 
 
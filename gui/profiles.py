@@ -0,0 +1,413 @@
+"""
+Configuration Profiles for Arduino Input Configurator
+
+Saves and loads complete input configurations (advanced settings
+included) so a board setup can be restored without retyping it. Two
+encodings share one schema version:
+
+JSON profile (*.json), readable and diff-friendly:
+    {"format": 1, "kind": "arduino-input-profile", "name": "Cockpit",
+     "inputs": [<wire-format input>, ...]}
+
+Binary profile (*.aicp), compact and fast to load:
+    Header:  b'AICP' + format byte + <uint8 input count> + <str profile name>
+    Inputs:  INPUT_RECORD fields, <uint8 mutex indices...>,
+             <str name> <str key> <str short press key> <str long press key>
+    Trailer: <uint32 CRC-32 of everything before it>
+    (<str> = uint8 length + UTF-8 bytes; integers are little-endian)
+
+load_profile() recognizes the encoding from the file contents, and also
+accepts a bare config command as written by "config_model.py generate".
+RecentProfiles keeps a small index of recently used profiles (path, name,
+input count) so the recent list can be shown without opening any file.
+UploadHistory remembers the configurations recently uploaded to boards by
+fingerprint, so the configuration a board reports can be diffed against
+the table.
+
+Usage:
+    python profiles.py info cockpit.aicp
+    python profiles.py convert cockpit.json cockpit.aicp
+"""
+
+import os
+import json
+import time
+import zlib
+import struct
+from pathlib import Path
+
+from config_model import InputConfig, load_inputs, fingerprint
+
+PROFILE_FORMAT = 1
+PROFILE_KIND = 'arduino-input-profile'
+BINARY_MAGIC = b'AICP'
+BINARY_SUFFIX = '.aicp'
+JSON_SUFFIX = '.json'
+
+RECENT_LIMIT = 10
+UPLOAD_HISTORY_LIMIT = 20
+
+# pin, pin2, type, mode, displayType, displayClkPin, displayDataPin, displayCsPin,
+# displayDigits, displayMin, displayMax, buttonPin, buttonShortAction,
+# buttonLongAction, longPressMs, ledPin, mutexCount
+INPUT_RECORD = struct.Struct('<9B2h3BH2B')
+BINARY_HEADER = struct.Struct('<4sBB')
+CRC = struct.Struct('<I')
+
+
+def default_data_dir():
+    """Per-user directory for configurator data (recent profiles index)."""
+    base = os.environ.get('APPDATA') or os.environ.get('XDG_CONFIG_HOME') or str(Path.home() / '.config')
+    return Path(base) / 'arduino-input-configurator'
+
+
+# ========== ENCODING ==========
+
+def _pack_str(parts, text):
+    data = text.encode('utf-8')
+    if len(data) > 255:
+        raise ValueError(f"Text too long for a binary profile: {text[:20]!r}...")
+    parts.append(bytes([len(data)]))
+    parts.append(data)
+
+
+def encode_binary(inputs, name=''):
+    """
+    Encode a profile in the binary format.
+
+    Args:
+        inputs (list): InputConfig records
+        name (str): Profile name
+
+    Returns:
+        bytes: Profile file contents
+
+    Raises:
+        ValueError: If a value does not fit its binary field
+    """
+    if len(inputs) > 255:
+        raise ValueError("Too many inputs for a binary profile")
+
+    parts = [BINARY_HEADER.pack(BINARY_MAGIC, PROFILE_FORMAT, len(inputs))]
+    _pack_str(parts, name)
+    for index, record in enumerate(inputs):
+        try:
+            parts.append(INPUT_RECORD.pack(
+                record.pin, record.pin2, record.type, record.mode,
+                record.display_type, record.display_clk_pin, record.display_data_pin, record.display_cs_pin,
+                record.display_digits, record.display_min, record.display_max,
+                record.button_pin, record.button_short_action, record.button_long_action,
+                record.long_press_ms, record.led_pin, len(record.mutex_list)))
+            parts.append(bytes(record.mutex_list))
+        except (struct.error, ValueError, TypeError) as e:
+            raise ValueError(f"Row {index + 1}: cannot be stored in a binary profile ({e})") from None
+        for text in (record.name, record.key, record.button_short_key, record.button_long_key):
+            _pack_str(parts, text)
+
+    data = b''.join(parts)
+    return data + CRC.pack(zlib.crc32(data))
+
+
+def decode_binary(data):
+    """
+    Decode a binary profile.
+
+    Args:
+        data (bytes): Profile file contents
+
+    Returns:
+        tuple: (profile name, list of InputConfig records)
+
+    Raises:
+        ValueError: If the data is corrupt or of an unknown format
+    """
+    if len(data) < BINARY_HEADER.size + CRC.size:
+        raise ValueError("Profile is truncated")
+    magic, version, count = BINARY_HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a binary profile")
+    if version != PROFILE_FORMAT:
+        raise ValueError(f"Unsupported profile format {version}")
+    body = memoryview(data)[:-CRC.size]
+    if CRC.unpack_from(data, len(body))[0] != zlib.crc32(body):
+        raise ValueError("Profile is corrupt (checksum mismatch)")
+
+    offset = BINARY_HEADER.size
+
+    def read_str():
+        nonlocal offset
+        length = body[offset]
+        offset += 1 + length
+        return bytes(body[offset - length:offset]).decode('utf-8')
+
+    try:
+        name = read_str()
+        inputs = []
+        for _ in range(count):
+            fields = INPUT_RECORD.unpack_from(body, offset)
+            offset += INPUT_RECORD.size
+            mutex_count = fields[16]
+            mutex_list = tuple(body[offset:offset + mutex_count])
+            offset += mutex_count
+
+            record = InputConfig.__new__(InputConfig)
+            (record.pin, record.pin2, record.type, record.mode,
+             record.display_type, record.display_clk_pin, record.display_data_pin, record.display_cs_pin,
+             record.display_digits, record.display_min, record.display_max,
+             record.button_pin, record.button_short_action, record.button_long_action,
+             record.long_press_ms, record.led_pin) = fields[:16]
+            record.mutex_list = mutex_list
+            record.name = read_str()
+            record.key = read_str()
+            record.button_short_key = read_str()
+            record.button_long_key = read_str()
+            inputs.append(record)
+    except (IndexError, struct.error, UnicodeDecodeError):
+        raise ValueError("Profile is truncated or corrupt") from None
+    if offset != len(body):
+        raise ValueError("Profile has trailing data")
+
+    return name, inputs
+
+
+def encode_json(inputs, name=''):
+    """Encode a profile as indented JSON text."""
+    profile = {
+        'format': PROFILE_FORMAT,
+        'kind': PROFILE_KIND,
+        'name': name,
+        'inputs': [record.to_dict() for record in inputs],
+    }
+    return json.dumps(profile, indent=1) + '\n'
+
+
+def decode_json(text):
+    """
+    Decode a JSON profile (or a bare config command / inputs list).
+
+    Returns:
+        tuple: (profile name, list of InputConfig records)
+
+    Raises:
+        ValueError: If the text is not a profile of a known format
+    """
+    data = json.loads(text)
+    name = ''
+    if isinstance(data, dict) and data.get('kind') == PROFILE_KIND:
+        if data.get('format') != PROFILE_FORMAT:
+            raise ValueError(f"Unsupported profile format {data.get('format')}")
+        name = data.get('name') or ''
+    return name, load_inputs(data)
+
+
+# ========== FILES ==========
+
+def save_profile(path, inputs, name=None):
+    """
+    Write a profile; the suffix picks the encoding (.aicp = binary, else JSON).
+
+    The file is replaced atomically, so a failed save never leaves a
+    half-written profile behind.
+
+    Args:
+        path (Path): Profile file
+        inputs (list): InputConfig records
+        name (str): Profile name (default: the file name without suffix)
+
+    Raises:
+        ValueError: If the inputs cannot be stored in the chosen encoding
+    """
+    path = Path(path)
+    name = path.stem if name is None else name
+    if path.suffix.lower() == BINARY_SUFFIX:
+        data = encode_binary(inputs, name)
+    else:
+        data = encode_json(inputs, name).encode('utf-8')
+
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def load_profile(path):
+    """
+    Read a profile in either encoding.
+
+    Args:
+        path (Path): Profile file
+
+    Returns:
+        tuple: (profile name, list of InputConfig records)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If it is not a valid profile
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    if data.startswith(BINARY_MAGIC):
+        name, inputs = decode_binary(data)
+    else:
+        try:
+            name, inputs = decode_json(data.decode('utf-8'))
+        except UnicodeDecodeError:
+            raise ValueError("Not a profile") from None
+    return name or path.stem, inputs
+
+
+# ========== RECENT PROFILES ==========
+
+class RecentProfiles:
+    """Most-recently-used profiles, newest first, kept in a small JSON index."""
+
+    def __init__(self, index_path=None, limit=RECENT_LIMIT):
+        """
+        Args:
+            index_path (Path): Index file (default: recent-profiles.json in default_data_dir())
+            limit (int): Entries to keep
+        """
+        self.index_path = Path(index_path) if index_path else default_data_dir() / 'recent-profiles.json'
+        self.limit = limit
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            entries = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+        return [entry for entry in entries if isinstance(entry, dict) and isinstance(entry.get('path'), str)]
+
+    def _save(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+            temp_path.write_text(json.dumps(self.entries, indent=1))
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save recent profiles: {e}")
+
+    def add(self, path, name, input_count):
+        """Record that a profile was opened or saved (moves it to the top)."""
+        path = str(Path(path).resolve())
+        self.entries = [entry for entry in self.entries if entry['path'] != path]
+        self.entries.insert(0, {'path': path, 'name': name, 'inputs': input_count, 'used': int(time.time())})
+        del self.entries[self.limit:]
+        self._save()
+
+    def remove(self, path):
+        """Forget a profile (e.g. one that no longer exists)."""
+        path = str(Path(path).resolve())
+        self.entries = [entry for entry in self.entries if entry['path'] != path]
+        self._save()
+
+    def clear(self):
+        """Forget all profiles."""
+        self.entries = []
+        self._save()
+
+
+# ========== UPLOAD HISTORY ==========
+
+class UploadHistory:
+    """Configurations recently uploaded to a board, newest first, keyed by fingerprint."""
+
+    def __init__(self, index_path=None, limit=UPLOAD_HISTORY_LIMIT):
+        """
+        Args:
+            index_path (Path): Index file (default: uploaded-configs.json in default_data_dir())
+            limit (int): Configurations to keep
+        """
+        self.index_path = Path(index_path) if index_path else default_data_dir() / 'uploaded-configs.json'
+        self.limit = limit
+        self.entries = self._load()
+
+    def _load(self):
+        try:
+            entries = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return []
+        if not isinstance(entries, list):
+            return []
+        return [entry for entry in entries
+                if isinstance(entry, dict) and isinstance(entry.get('fingerprint'), int)
+                and isinstance(entry.get('inputs'), list)]
+
+    def _save(self):
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+            temp_path.write_text(json.dumps(self.entries, separators=(',', ':')))
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(f"Could not save upload history: {e}")
+
+    def get(self, config_fingerprint):
+        """
+        Look up an uploaded configuration.
+
+        Returns:
+            list: InputConfig records, or None if the fingerprint is unknown
+                  (or its entry no longer matches it)
+        """
+        for entry in self.entries:
+            if entry['fingerprint'] == config_fingerprint:
+                try:
+                    inputs = load_inputs(entry['inputs'])
+                except ValueError:
+                    return None
+                return inputs if fingerprint(inputs) == config_fingerprint else None
+        return None
+
+    def add(self, config_fingerprint, inputs):
+        """Record a configuration a board accepted (moves it to the top)."""
+        self.entries = [entry for entry in self.entries if entry['fingerprint'] != config_fingerprint]
+        self.entries.insert(0, {'fingerprint': config_fingerprint,
+                                'inputs': [record.to_dict() for record in inputs],
+                                'used': int(time.time())})
+        del self.entries[self.limit:]
+        self._save()
+
+
+def main():
+    """Command-line interface for inspecting and converting profiles."""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Configuration profile tools')
+    subparsers = parser.add_subparsers(dest='command')
+
+    info_parser = subparsers.add_parser('info', help='Summarize a profile')
+    info_parser.add_argument('profile', help='Profile file (.json or .aicp)')
+
+    convert_parser = subparsers.add_parser('convert', help='Convert between JSON and binary profiles')
+    convert_parser.add_argument('source', help='Profile to read')
+    convert_parser.add_argument('destination', help='Profile to write (.aicp = binary, else JSON)')
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        start = time.perf_counter()
+        name, inputs = load_profile(args.profile)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"Profile:  {name}")
+        print(f"Inputs:   {len(inputs)}")
+        print(f"Size:     {Path(args.profile).stat().st_size:,} bytes (loaded in {elapsed:.2f} ms)")
+        for index, record in enumerate(inputs):
+            print(f"  {index + 1:>2}. {record!r}")
+
+    elif args.command == 'convert':
+        name, inputs = load_profile(args.source)
+        save_profile(args.destination, inputs, name)
+        print(f"Wrote {args.destination}: {len(inputs)} inputs, "
+              f"{Path(args.destination).stat().st_size:,} bytes (was {Path(args.source).stat().st_size:,})")
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
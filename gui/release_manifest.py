@@ -0,0 +1,261 @@
+"""
+Release Manifest for Arduino Input Configurator
+
+A release manifest lists every file a release installs, with its size and
+SHA-256. Publishing it next to the release zip lets the updater compare
+the release with the local install and fetch only the files that changed.
+
+Manifest format (release-manifest.json):
+    {
+        "format": 1,
+        "version": "1.2.0",
+        "files": {
+            "gui/updater.py": {"size": 12345, "sha256": "<hex>"},
+            ...
+        }
+    }
+
+Paths are relative to the project root and use forward slashes.
+
+Usage:
+    python release_manifest.py build release.zip -o release-manifest.json
+    python release_manifest.py build .. --version 1.2.0
+    python release_manifest.py diff release-manifest.json ..
+"""
+
+import json
+import hashlib
+import zipfile
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+
+MANIFEST_NAME = 'release-manifest.json'
+MANIFEST_FORMAT = 1
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Files/directories an update never touches (user data, system files)
+SKIP_ITEMS = (
+    '.git', '.github', '.gitignore', '.vs', '.vscode', '.pio',
+    '__pycache__', '*.pyc', '*.pyo', 'venv', 'env',
+    '.claude'  # Don't overwrite Claude workspace
+)
+
+
+def is_skipped(rel_path):
+    """
+    Check a project-relative path against SKIP_ITEMS.
+
+    Args:
+        rel_path (str): Path relative to the project root ("/" separated)
+
+    Returns:
+        bool: True if an update must leave this path alone
+    """
+    return any(fnmatch(part, pattern) for part in PurePosixPath(rel_path).parts for pattern in SKIP_ITEMS)
+
+
+def is_safe_path(rel_path):
+    """True if a release path stays inside the project root."""
+    path = PurePosixPath(rel_path)
+    return bool(rel_path) and not path.is_absolute() and '..' not in path.parts \
+        and '\\' not in rel_path and ':' not in rel_path
+
+
+def archive_root(names):
+    """
+    Find the single top-level directory of a release zip (GitHub source
+    archives wrap everything in "<repo>-<sha>/").
+
+    Args:
+        names (list): Member names of the zip
+
+    Returns:
+        str: Prefix to strip from member names ("" if there is none)
+    """
+    tops = {name.split('/', 1)[0] for name in names}
+    if len(tops) == 1 and all('/' in name for name in names):
+        return tops.pop() + '/'
+    return ''
+
+
+def hash_stream(stream, view=None):
+    """
+    Hash a binary stream.
+
+    Args:
+        stream: Object with readinto() (file) or read() (zip member)
+        view (memoryview): Optional reusable buffer
+
+    Returns:
+        tuple: (size, sha256 hex digest)
+    """
+    hasher = hashlib.sha256()
+    size = 0
+    if view is None:
+        view = memoryview(bytearray(HASH_CHUNK_SIZE))
+
+    if hasattr(stream, 'readinto'):
+        while True:
+            count = stream.readinto(view)
+            if not count:
+                break
+            hasher.update(view[:count])
+            size += count
+    else:
+        while True:
+            chunk = stream.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            size += len(chunk)
+
+    return size, hasher.hexdigest()
+
+
+def hash_file(path, view=None):
+    """Return (size, sha256 hex digest) of a file."""
+    with open(path, 'rb') as f:
+        return hash_stream(f, view)
+
+
+def build_manifest(source, version=None):
+    """
+    Build the manifest of a release.
+
+    Args:
+        source (Path): Release zip, or a directory laid out like the project
+        version (str): Release version (default: the VERSION file in the release)
+
+    Returns:
+        dict: Manifest
+    """
+    source = Path(source)
+    files = {}
+
+    if source.is_dir():
+        view = memoryview(bytearray(HASH_CHUNK_SIZE))
+        for path in sorted(source.rglob('*')):
+            rel_path = path.relative_to(source).as_posix()
+            if path.is_file() and not is_skipped(rel_path):
+                size, digest = hash_file(path, view)
+                files[rel_path] = {'size': size, 'sha256': digest}
+        if version is None and (source / 'VERSION').is_file():
+            version = (source / 'VERSION').read_text().strip()
+    else:
+        with zipfile.ZipFile(source) as archive:
+            infos = [info for info in archive.infolist() if not info.is_dir()]
+            root = archive_root([info.filename for info in infos])
+            for info in infos:
+                rel_path = info.filename[len(root):]
+                if is_skipped(rel_path):
+                    continue
+                with archive.open(info) as member:
+                    size, digest = hash_stream(member)
+                files[rel_path] = {'size': size, 'sha256': digest}
+                if version is None and rel_path == 'VERSION':
+                    version = archive.read(info).decode().strip()
+
+    return {'format': MANIFEST_FORMAT, 'version': version, 'files': files}
+
+
+def parse_manifest(data):
+    """
+    Parse and validate a manifest.
+
+    Args:
+        data (bytes): Manifest JSON
+
+    Returns:
+        dict: Manifest
+
+    Raises:
+        ValueError: If the manifest is malformed or of an unknown format
+    """
+    manifest = json.loads(data)
+    if not isinstance(manifest, dict) or manifest.get('format') != MANIFEST_FORMAT:
+        raise ValueError("Unsupported release manifest format")
+    files = manifest.get('files')
+    if not isinstance(files, dict):
+        raise ValueError("Release manifest has no file list")
+    for rel_path, entry in files.items():
+        if not is_safe_path(rel_path):
+            raise ValueError(f"Unsafe path in release manifest: {rel_path}")
+        if not isinstance(entry.get('size'), int) or not isinstance(entry.get('sha256'), str):
+            raise ValueError(f"Bad release manifest entry: {rel_path}")
+    return manifest
+
+
+def changed_files(manifest, install_root):
+    """
+    Compare a manifest with an install.
+
+    Files whose size differs are known to have changed without reading
+    them; only same-size files are hashed.
+
+    Args:
+        manifest (dict): Release manifest
+        install_root (Path): Project root of the local install
+
+    Returns:
+        list: Paths (manifest keys) that are missing or different locally
+    """
+    install_root = Path(install_root)
+    view = memoryview(bytearray(HASH_CHUNK_SIZE))
+    changed = []
+
+    for rel_path, entry in sorted(manifest['files'].items()):
+        if is_skipped(rel_path):
+            continue
+        path = install_root / rel_path
+        try:
+            if path.stat().st_size != entry['size'] or hash_file(path, view)[1] != entry['sha256']:
+                changed.append(rel_path)
+        except OSError:
+            changed.append(rel_path)  # Missing or unreadable
+
+    return changed
+
+
+def main():
+    """Command-line interface for building and checking manifests."""
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Release manifest tools')
+    subparsers = parser.add_subparsers(dest='command')
+
+    build_parser = subparsers.add_parser('build', help='Write the manifest of a release zip or directory')
+    build_parser.add_argument('source', help='Release zip or project directory')
+    build_parser.add_argument('-o', '--output', default=MANIFEST_NAME,
+                              help=f'Manifest file to write (default: {MANIFEST_NAME})')
+    build_parser.add_argument('--version', help='Release version (default: from the VERSION file)')
+
+    diff_parser = subparsers.add_parser('diff', help='List files an install would need to update')
+    diff_parser.add_argument('manifest', help='Release manifest')
+    diff_parser.add_argument('root', nargs='?', default=str(Path(__file__).parent.parent),
+                             help='Project root (default: this install)')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        manifest = build_manifest(args.source, args.version)
+        Path(args.output).write_text(json.dumps(manifest, indent=1, sort_keys=True) + '\n')
+        total = sum(entry['size'] for entry in manifest['files'].values())
+        print(f"Wrote {args.output}: {len(manifest['files'])} files, {total:,} bytes, version {manifest['version']}")
+
+    elif args.command == 'diff':
+        manifest = parse_manifest(Path(args.manifest).read_bytes())
+        changed = changed_files(manifest, args.root)
+        for rel_path in changed:
+            print(f"{rel_path}  ({manifest['files'][rel_path]['size']:,} bytes)")
+        total = sum(manifest['files'][rel_path]['size'] for rel_path in changed)
+        print(f"{len(changed)} of {len(manifest['files'])} files differ ({total:,} bytes)")
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
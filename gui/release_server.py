@@ -0,0 +1,316 @@
+"""
+Local Release Server for Arduino Input Configurator
+
+A small stand-in for the GitHub releases API, so the updater can be
+exercised offline. It serves a releases list with ETag/Last-Modified
+validators (answering conditional requests with 304 Not Modified) and
+any number of static files with Range/If-Range support, can cut a
+transfer short to simulate a dropped connection, and counts what it was
+asked for.
+
+Usage:
+    python release_server.py                  # cache demo against a temporary server
+    python release_server.py --serve --version 9.9.9
+"""
+
+import json
+import time
+import hashlib
+import threading
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+RELEASES_PATH = '/repos/bworthy89/seths-crap/releases'
+
+
+def make_release(version, download_url=None, notes='Test release', draft=False, prerelease=False):
+    """
+    Build a release object shaped like the GitHub API's.
+
+    Args:
+        version (str): Version without the "v" prefix
+        download_url (str): Zip asset URL (None = no assets)
+        notes (str): Release notes
+        draft (bool): Draft release
+        prerelease (bool): Pre-release
+
+    Returns:
+        dict: Release object
+    """
+    assets = []
+    if download_url:
+        assets.append({'name': f'release-v{version}.zip', 'browser_download_url': download_url})
+    return {
+        'tag_name': f'v{version}',
+        'draft': draft,
+        'prerelease': prerelease,
+        'body': notes,
+        'html_url': f'https://github.com/bworthy89/seths-crap/releases/tag/v{version}',
+        'assets': assets,
+        'zipball_url': download_url,
+    }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # Keep test output quiet
+
+    def do_GET(self):
+        server = self.server.release_server
+        server.count('requests')
+
+        with server.lock:
+            resource = server.resources.get(self.path.split('?', 1)[0])
+        if resource is None:
+            self.send_error(404)
+            return
+
+        body, content_type, etag, modified_at = resource
+        last_modified = formatdate(modified_at, usegmt=True)
+
+        if self._not_modified(etag, modified_at):
+            server.count('not_modified')
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', last_modified)
+            self.end_headers()
+            return
+
+        byte_range = self._byte_range(etag, last_modified, len(body))
+        if byte_range is False:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(body)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if byte_range is None:
+            server.count('full_responses')
+            self.send_response(200)
+            start, end = 0, len(body)
+        else:
+            server.count('partial_responses')
+            self.send_response(206)
+            start, end = byte_range
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{len(body)}')
+
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(end - start))
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+
+        payload = memoryview(body)[start:end]
+        cut_after = server.take_interrupt()
+        if cut_after is not None:
+            # Simulate a dropped connection part way through the body
+            self.wfile.write(payload[:cut_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+    def _byte_range(self, etag, last_modified, size):
+        """
+        Parse a single-range Range header ("bytes=N-", "bytes=N-M", "bytes=-N").
+
+        Returns:
+            tuple: (start, end) to serve, None for the whole body, or
+                   False if the range cannot be satisfied
+        """
+        range_header = self.headers.get('Range', '')
+        if not range_header.startswith('bytes='):
+            return None
+        if_range = self.headers.get('If-Range')
+        if if_range is not None and if_range not in (etag, last_modified):
+            return None  # The client's partial copy is of a different version
+
+        first, _, last = range_header[len('bytes='):].split(',')[0].strip().partition('-')
+        try:
+            if not first:
+                start, end = max(0, size - int(last)), size
+            else:
+                start = int(first)
+                end = min(size, int(last) + 1) if last else size
+        except ValueError:
+            return None
+        if start >= size or start >= end:
+            return False
+        return start, end
+
+    def _not_modified(self, etag, modified_at):
+        # If-None-Match takes precedence over If-Modified-Since (RFC 7232)
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                return int(modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+class ReleaseServer:
+    """Threaded local HTTP server with GitHub-like release resources."""
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """
+        Bind the server (port 0 picks a free port).
+
+        Args:
+            host (str): Interface to listen on
+            port (int): TCP port
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.release_server = self
+        self.lock = threading.Lock()
+        self.resources = {}
+        self.stats = {'requests': 0, 'full_responses': 0, 'partial_responses': 0, 'not_modified': 0}
+        self.interrupts = []
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def releases_url(self):
+        return self.base_url + RELEASES_PATH
+
+    def url(self, path):
+        """Full URL of a served path."""
+        return self.base_url + path
+
+    def count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def reset_stats(self):
+        with self.lock:
+            for name in self.stats:
+                self.stats[name] = 0
+
+    def interrupt_next(self, *byte_counts):
+        """
+        Cut the next responses short.
+
+        Args:
+            *byte_counts (int): Body bytes to send before dropping the
+                                connection, one per upcoming response
+        """
+        with self.lock:
+            self.interrupts.extend(byte_counts)
+
+    def take_interrupt(self):
+        with self.lock:
+            return self.interrupts.pop(0) if self.interrupts else None
+
+    def add_file(self, path, data, content_type='application/octet-stream'):
+        """
+        Serve `data` at `path`. Replacing a resource changes its validators.
+
+        Args:
+            path (str): URL path (e.g. "/downloads/update.zip")
+            data (bytes): Response body
+            content_type (str): Content-Type header
+        """
+        etag = '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+        with self.lock:
+            previous = self.resources.get(path)
+            if previous is not None and previous[2] == etag:
+                return  # Unchanged: keep the old Last-Modified
+            # Whole seconds, as HTTP dates have no finer resolution
+            modified_at = int(time.time())
+            if previous is not None and modified_at <= previous[3]:
+                modified_at = previous[3] + 1
+            self.resources[path] = (data, content_type, etag, modified_at)
+
+    def set_releases(self, releases):
+        """
+        Serve `releases` as the repository's releases list.
+
+        Args:
+            releases (list): Release objects (see make_release)
+        """
+        self.add_file(RELEASES_PATH, json.dumps(releases).encode(), 'application/json')
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+
+def cache_demo():
+    """Show how many round trips a series of update checks costs."""
+    import tempfile
+    from updater import Updater
+
+    server = ReleaseServer().start()
+    server.set_releases([make_release('9.9.9', server.url('/downloads/update.zip'))])
+
+    try:
+        with tempfile.TemporaryDirectory(prefix='release_cache_') as cache_dir:
+            def check(label, **options):
+                updater = Updater(cache_dir=cache_dir, api_url=server.releases_url, **options)
+                server.reset_stats()
+                start = time.perf_counter()
+                info = updater.check_for_updates()
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"{label:<36} latest={info['latest_version'] if info else None:<8} "
+                      f"requests={server.stats['requests']}  304s={server.stats['not_modified']}  "
+                      f"{elapsed:.1f} ms")
+
+            check("Cold cache")
+            check("Within TTL")
+            check("TTL expired, unchanged", cache_ttl=0)
+            server.set_releases([make_release('10.0.0', server.url('/downloads/update.zip'))])
+            check("TTL expired, new release", cache_ttl=0)
+            check("Within TTL again")
+    finally:
+        server.stop()
+
+
+def main():
+    """Command-line interface for the local release server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Local stand-in for the GitHub releases API')
+    parser.add_argument('--serve', action='store_true', help='Serve until Ctrl+C instead of running the demo')
+    parser.add_argument('--port', type=int, default=8089, help='Port for --serve (default: 8089)')
+    parser.add_argument('--version', default='9.9.9', help='Version of the served release (default: 9.9.9)')
+
+    args = parser.parse_args()
+
+    if not args.serve:
+        cache_demo()
+        return
+
+    server = ReleaseServer(port=args.port).start()
+    server.set_releases([make_release(args.version, server.url('/downloads/update.zip'))])
+    print(f"Releases API: {server.releases_url}")
+    print("Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nRequests: {server.stats['requests']}  304 responses: {server.stats['not_modified']}")
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Serial line framing for Arduino Input Configurator
+
+Shared by the keyboard daemon, the GUI serial worker and the firmware
+emulator to split the raw serial byte stream into lines.
+"""
+
+
+class LineFramer:
+    """
+    Incremental line framer for the raw serial byte stream.
+
+    Incoming chunks are appended to a single reusable bytearray. Complete
+    lines are sliced out through a memoryview (no intermediate copies) and
+    decoded exactly once each.
+    """
+
+    def __init__(self, max_line_length=100):
+        """
+        Initialize the framer.
+
+        Args:
+            max_line_length (int): Discard a partial line once it grows past
+                                   this many bytes without a newline
+        """
+        self.max_line_length = max_line_length
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Append raw bytes and return every line completed by them.
+
+        Args:
+            data (bytes): Bytes read from the serial port
+
+        Returns:
+            list: Decoded lines (without the trailing newline), empty lines skipped
+        """
+        buffer = self.buffer
+        scan_from = len(buffer)
+        buffer += data
+
+        newline = buffer.find(b'\n', scan_from)
+        if newline < 0:
+            # Prevent buffer overflow
+            if len(buffer) > self.max_line_length:
+                buffer.clear()
+            return []
+
+        lines = []
+        start = 0
+        with memoryview(buffer) as view:
+            while newline >= 0:
+                if newline > start:
+                    lines.append(str(view[start:newline], 'utf-8', 'ignore'))
+                start = newline + 1
+                newline = buffer.find(b'\n', start)
+
+        # Keep only the trailing partial line
+        del buffer[:start]
+        if len(buffer) > self.max_line_length:
+            buffer.clear()
+
+        return lines
+
+    def reset(self):
+        """Drop any buffered partial line."""
+        self.buffer.clear()
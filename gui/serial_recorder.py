@@ -0,0 +1,366 @@
+"""
+Serial Traffic Recorder for Arduino Input Configurator
+
+Captures timestamped raw serial traffic (both directions) from any serial
+session into a compact binary log, and replays logs back through the
+keyboard daemon's framing and dispatch path against a fake keyboard.
+
+Log format:
+    Header:  b'SRLOG' + version byte
+    Records: <uint32 microseconds since previous record>
+             <uint8 direction (0 = received from board, 1 = sent to board)>
+             <uint16 payload length>
+             <payload bytes>
+
+Usage:
+    python serial_recorder.py info capture.srlog
+    python serial_recorder.py replay capture.srlog [--realtime]
+"""
+
+import sys
+import time
+import struct
+import threading
+from collections import deque
+
+LOG_MAGIC = b'SRLOG'
+LOG_VERSION = 1
+RECORD_HEADER = struct.Struct('<IBH')
+
+DIRECTION_RX = 0  # Board -> host
+DIRECTION_TX = 1  # Host -> board
+
+
+class SerialRecorder:
+    """Writes timestamped serial traffic records to a binary log file."""
+
+    def __init__(self, path):
+        """
+        Open a new log file.
+
+        Args:
+            path (str): Log file to create (overwritten if it exists)
+        """
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(LOG_MAGIC + bytes([LOG_VERSION]))
+        self.lock = threading.Lock()
+        self.last_time = time.perf_counter()
+        self.records = 0
+
+    def record(self, direction, data):
+        """
+        Append one record.
+
+        Args:
+            direction (int): DIRECTION_RX or DIRECTION_TX
+            data (bytes): Raw bytes that crossed the port
+        """
+        if not data:
+            return
+
+        with self.lock:
+            if self.file is None:
+                return
+
+            now = time.perf_counter()
+            delta_us = min(int((now - self.last_time) * 1e6), 0xFFFFFFFF)
+            self.last_time = now
+
+            view = memoryview(data)
+            # Payloads longer than a record can hold are split
+            for offset in range(0, len(view), 0xFFFF):
+                chunk = view[offset:offset + 0xFFFF]
+                self.file.write(RECORD_HEADER.pack(delta_us, direction, len(chunk)))
+                self.file.write(chunk)
+                self.records += 1
+                delta_us = 0
+
+    def close(self):
+        """Flush and close the log."""
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class RecordingSerial:
+    """
+    Transparent wrapper around a serial.Serial that records everything read
+    from and written to it. Any other attribute is passed through.
+    """
+
+    def __init__(self, connection, recorder):
+        """
+        Args:
+            connection (serial.Serial): Open serial connection
+            recorder (SerialRecorder): Log to write traffic into
+        """
+        self.connection = connection
+        self.recorder = recorder
+
+    def read(self, size=1):
+        data = self.connection.read(size)
+        self.recorder.record(DIRECTION_RX, data)
+        return data
+
+    def readline(self, *args, **kwargs):
+        data = self.connection.readline(*args, **kwargs)
+        self.recorder.record(DIRECTION_RX, data)
+        return data
+
+    def write(self, data):
+        self.recorder.record(DIRECTION_TX, data)
+        return self.connection.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def read_log(path):
+    """
+    Iterate over the records of a log file.
+
+    Args:
+        path (str): Log file written by SerialRecorder
+
+    Yields:
+        tuple: (seconds since start of recording, direction, bytes)
+
+    Raises:
+        ValueError: If the file is not a serial log
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    header_size = len(LOG_MAGIC) + 1
+    if data[:len(LOG_MAGIC)] != LOG_MAGIC:
+        raise ValueError(f"{path} is not a serial traffic log")
+    if data[len(LOG_MAGIC)] != LOG_VERSION:
+        raise ValueError(f"Unsupported serial log version: {data[len(LOG_MAGIC)]}")
+
+    view = memoryview(data)
+    offset = header_size
+    timestamp = 0.0
+
+    while offset + RECORD_HEADER.size <= len(data):
+        delta_us, direction, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        timestamp += delta_us / 1e6
+        yield timestamp, direction, bytes(view[offset:offset + length])
+        offset += length
+
+
+def received_chunks(path):
+    """Return the (timestamp, bytes) chunks a board sent, in order."""
+    return [(t, payload) for t, direction, payload in read_log(path) if direction == DIRECTION_RX]
+
+
+class ReplayPort:
+    """
+    Minimal stand-in for serial.Serial that serves recorded board output.
+
+    Chunks are handed out at most packet_size bytes at a time, like USB CDC
+    packets. With realtime=True the original inter-chunk timing is kept.
+    """
+
+    def __init__(self, chunks, packet_size=64, realtime=False, on_end=None):
+        """
+        Initialize the replay port.
+
+        Args:
+            chunks (list): (timestamp, bytes) pairs, or plain bytes objects
+            packet_size (int): Maximum bytes returned per read
+            realtime (bool): Sleep to reproduce the recorded timing
+            on_end (callable): Called once the replay is exhausted; if None,
+                               reads past the end raise EOFError
+        """
+        self.chunks = deque(c if isinstance(c, tuple) else (0.0, c) for c in chunks)
+        self.packet_size = packet_size
+        self.realtime = realtime
+        self.on_end = on_end
+        self.current = b''
+        self.start_time = None
+        self.written = bytearray()
+        self.is_open = True
+
+    @classmethod
+    def from_bytes(cls, data, **kwargs):
+        """Replay a raw byte capture (no timing information)."""
+        return cls([data], **kwargs)
+
+    def _next_chunk(self):
+        if not self.chunks:
+            return False
+
+        timestamp, self.current = self.chunks.popleft()
+        if self.realtime:
+            if self.start_time is None:
+                self.start_time = time.perf_counter() - timestamp
+            wait = self.start_time + timestamp - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        return True
+
+    @property
+    def in_waiting(self):
+        if not self.current and not self.realtime:
+            self._next_chunk()
+        return min(self.packet_size, len(self.current))
+
+    def read(self, size=1):
+        if not self.current and not self._next_chunk():
+            if self.on_end is None:
+                raise EOFError("End of replay")
+            self.on_end()
+            return b''
+
+        size = min(size, self.packet_size)
+        chunk = self.current[:size]
+        self.current = self.current[size:]
+        return chunk
+
+    def write(self, data):
+        self.written += data
+        return len(data)
+
+    def close(self):
+        self.is_open = False
+
+
+class FakeKeyboard:
+    """Keyboard sink that records hotkeys instead of sending OS key events."""
+
+    def __init__(self):
+        self.sent = []
+        self.sent_at = []
+
+    def send(self, hotkey):
+        self.sent_at.append(time.perf_counter())
+        self.sent.append(hotkey)
+
+
+def replay_through_daemon(chunks, packet_size=64, realtime=False, read_loop=None, **daemon_options):
+    """
+    Feed recorded board output through a KeyboardDaemon's reader thread,
+    command queue and dispatcher, sending keys to a FakeKeyboard.
+
+    Args:
+        chunks (list): (timestamp, bytes) pairs from received_chunks()
+        packet_size (int): Bytes per simulated USB packet
+        realtime (bool): Reproduce the recorded timing
+        read_loop (callable): Reader to run instead of KeyboardDaemon.read_loop,
+                              called as read_loop(daemon, on_line)
+        **daemon_options: Extra KeyboardDaemon options (queue size, coalescer...)
+
+    Returns:
+        dict: commands, elapsed, commands_per_sec, latencies (sorted seconds,
+              one per line dispatched, from the moment the reader queued it),
+              sent (hotkeys), daemon stats
+    """
+    from keyboard_daemon import KeyboardDaemon
+
+    sink = FakeKeyboard()
+    daemon = KeyboardDaemon(port='replay', keyboard_sink=sink, auto_reconnect=False, **daemon_options)
+    daemon.DRAIN_TIMEOUT = None
+    port = ReplayPort(chunks, packet_size, realtime, on_end=lambda: setattr(daemon, 'running', False))
+    daemon.serial_connection = port
+    if read_loop is not None:
+        daemon.read_loop = lambda on_line=None: read_loop(daemon, on_line)
+
+    # Time every queue entry against the timestamp the reader stored with it,
+    # so lines the queue dropped or merged cannot shift the pairing
+    latencies = []
+    commands = 0
+    process_command = daemon.process_command
+    dispatch_loop = daemon.dispatch_loop
+
+    def counted_process_command(command):
+        nonlocal commands
+        process_command(command)
+        commands += 1
+
+    def timed_dispatch_loop():
+        queue = daemon.command_queue
+        record_dispatch = queue.record_dispatch
+
+        def timed_record_dispatch(repeat_count, enqueued_at):
+            record_dispatch(repeat_count, enqueued_at)
+            latencies.extend([time.perf_counter() - enqueued_at] * repeat_count)
+
+        queue.record_dispatch = timed_record_dispatch
+        dispatch_loop()
+
+    daemon.process_command = counted_process_command
+    daemon.dispatch_loop = timed_dispatch_loop
+
+    start = time.perf_counter()
+    daemon.serve(verbose=False)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'commands': commands,
+        'elapsed': elapsed,
+        'commands_per_sec': commands / elapsed if elapsed > 0 else 0.0,
+        'latencies': latencies,
+        'sent': sink.sent,
+        'stats': daemon.get_stats(),
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    """Command-line interface for inspecting and replaying serial logs."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serial traffic log tools')
+    subparsers = parser.add_subparsers(dest='command')
+
+    info_parser = subparsers.add_parser('info', help='Summarize a serial log')
+    info_parser.add_argument('log', help='Log file written by --record')
+
+    replay_parser = subparsers.add_parser('replay', help='Replay a log through the keyboard daemon')
+    replay_parser.add_argument('log', help='Log file written by --record')
+    replay_parser.add_argument('--realtime', action='store_true', help='Keep the recorded timing')
+    replay_parser.add_argument('--packet-size', type=int, default=64, help='Bytes per USB packet (default: 64)')
+    replay_parser.add_argument('--show', action='store_true', help='Print every hotkey sent')
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        counts = {DIRECTION_RX: [0, 0], DIRECTION_TX: [0, 0]}
+        duration = 0.0
+        for timestamp, direction, payload in read_log(args.log):
+            counts[direction][0] += 1
+            counts[direction][1] += len(payload)
+            duration = timestamp
+        print(f"Duration:          {duration:.3f} s")
+        print(f"Board -> host:     {counts[DIRECTION_RX][0]} records, {counts[DIRECTION_RX][1]} bytes")
+        print(f"Host -> board:     {counts[DIRECTION_TX][0]} records, {counts[DIRECTION_TX][1]} bytes")
+
+    elif args.command == 'replay':
+        result = replay_through_daemon(received_chunks(args.log), args.packet_size, args.realtime)
+        if args.show:
+            for hotkey in result['sent']:
+                print(hotkey)
+        print(f"Lines dispatched:  {result['commands']}")
+        print(f"Hotkeys sent:      {len(result['sent'])}")
+        print(f"Throughput:        {result['commands_per_sec']:,.0f} lines/sec")
+        print(f"p50 latency:       {percentile(result['latencies'], 50) * 1e6:.1f} us")
+        print(f"p99 latency:       {percentile(result['latencies'], 99) * 1e6:.1f} us")
+
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Serial I/O worker for Arduino Input Configurator
+
+Owns the serial port on a dedicated QThread: continuously frames incoming
+lines and emits them as Qt signals, and sends JSON requests one at a time,
+matching each with the firmware's response instead of guessing delays.
+Configuration uploads use the chunked upload protocol (config_upload.py),
+falling back to the single-line command on firmware without it.
+"""
+
+import json
+import time
+import queue
+import itertools
+
+import serial
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from serial_framing import LineFramer
+from config_upload import ConfigUpload
+
+READY_BANNER = "Ready"
+READY_TIMEOUT = 3.0     # Seconds to wait for the banner after the board resets
+
+# Seconds to wait for the response to each request type
+REQUEST_TIMEOUTS = {
+    "status": 2.0,
+    "test": 2.0,
+    "config": 5.0,  # Includes the EEPROM write on the board
+}
+UPLOAD_TIMEOUT = 60.0   # Seconds for a whole chunked upload, retransmissions included
+
+# Firmware messages that answer any request with an error
+ERROR_PREFIXES = ("JSON parse error", "Missing 'type' field", "Unknown command type")
+
+
+def match_response(request_type, line):
+    """
+    Decide whether a line received from the firmware answers a request.
+
+    Args:
+        request_type (str): The "type" of the outstanding request
+        line (str): Line received from the board
+
+    Returns:
+        bool: True (success), False (error), or None if the line is unrelated
+    """
+    if line.startswith(ERROR_PREFIXES):
+        return False
+
+    if request_type == "config":
+        if line.startswith("Configuration updated"):
+            return True
+        if line.startswith("Missing 'inputs' array"):
+            return False
+    elif request_type == "test":
+        if line.startswith("Test command sent"):
+            return True
+    elif request_type == "status":
+        if line.startswith('{') and '"status"' in line:
+            return True
+
+    return None
+
+
+class SerialRequest:
+    """A request waiting to be sent, or waiting for its response."""
+
+    __slots__ = ('request_id', 'request_type', 'payload', 'timeout', 'deadline', 'upload')
+
+    def __init__(self, request_id, request_type, payload, timeout, upload=None):
+        self.request_id = request_id
+        self.request_type = request_type
+        self.payload = payload
+        self.timeout = timeout
+        self.deadline = None
+        self.upload = upload  # ConfigUpload while a chunked upload is in progress
+
+
+class SerialWorker(QThread):
+    """
+    Serial port reader/writer running off the GUI thread.
+
+    Signals:
+        lines_received(list): Complete lines from the board, one batch per read
+        ready(): The board finished resetting (banner seen or timed out)
+        request_finished(int, bool, str): Request id, success, response line
+        upload_progress(int, int, int): Request id, inputs stored, total inputs
+        connection_lost(str): The port failed; the worker has stopped
+    """
+
+    lines_received = pyqtSignal(list)
+    ready = pyqtSignal()
+    request_finished = pyqtSignal(int, bool, str)
+    upload_progress = pyqtSignal(int, int, int)
+    connection_lost = pyqtSignal(str)
+
+    def __init__(self, port, baud_rate=115200, parent=None):
+        """
+        Open the serial port (raises serial.SerialException on failure).
+
+        Args:
+            port (str): Serial port to open
+            baud_rate (int): Serial baud rate
+        """
+        super().__init__(parent)
+        self.port = port
+        self.serial_connection = serial.Serial(port, baud_rate, timeout=0.02)
+        self.outgoing = queue.Queue()
+        self.request_ids = itertools.count(1)
+        self.running = False
+
+    def request(self, command, timeout=None, upload=None):
+        """
+        Queue a JSON command; its response is reported via request_finished.
+
+        "config" commands are sent as a chunked upload (progress is reported
+        via upload_progress) unless the firmware turns out not to support it.
+
+        Args:
+            command (dict): Command with a "type" field
+            timeout (float): Seconds to wait for the response
+                             (default from REQUEST_TIMEOUTS)
+            upload (ConfigUpload): Prepared upload for a "config" command
+                                   (e.g. a patch); default: all inputs
+
+        Returns:
+            int: Request id
+        """
+        request_type = command.get("type", "")
+        if timeout is None:
+            timeout = REQUEST_TIMEOUTS.get(request_type, 2.0)
+
+        if request_type == "config":
+            if upload is None:
+                upload = ConfigUpload(command.get("inputs", []))
+            timeout = max(timeout, UPLOAD_TIMEOUT)
+
+        request_id = next(self.request_ids)
+        payload = (json.dumps(command) + '\n').encode()
+        self.outgoing.put(SerialRequest(request_id, request_type, payload, timeout, upload))
+        return request_id
+
+    def stop(self):
+        """Stop the worker and close the port."""
+        self.running = False
+        self.wait()
+        if self.serial_connection.is_open:
+            self.serial_connection.close()
+
+    def run(self):
+        framer = LineFramer(max_line_length=4096)
+        connection = self.serial_connection
+        ready_deadline = time.monotonic() + READY_TIMEOUT
+        is_ready = False
+        pending = None
+
+        self.running = True
+        try:
+            while self.running:
+                try:
+                    data = connection.read(connection.in_waiting or 1)
+                except Exception as e:
+                    if pending is not None:
+                        self.request_finished.emit(pending.request_id, False, str(e))
+                    self.connection_lost.emit(str(e))
+                    break
+
+                lines = [line.strip() for line in framer.feed(data)]
+                lines = [line for line in lines if line]
+                received = [line for line in lines if not ConfigUpload.is_protocol_line(line)]
+                if received:
+                    # One signal per read: a fast event stream must not queue a signal per line
+                    self.lines_received.emit(received)
+
+                out = []
+                for line in lines:
+                    if not is_ready and READY_BANNER in line:
+                        is_ready = True
+                        self.ready.emit()
+
+                    if pending is not None and pending.upload is not None:
+                        upload = pending.upload
+                        stored = upload.inputs_acked
+                        out.append(upload.on_line(line))
+                        if upload.inputs_acked != stored:
+                            self.upload_progress.emit(pending.request_id, upload.inputs_acked, upload.total)
+                    elif pending is not None:
+                        result = match_response(pending.request_type, line)
+                        if result is not None:
+                            self.request_finished.emit(pending.request_id, result, line)
+                            pending = None
+
+                if pending is not None and pending.upload is not None:
+                    upload = pending.upload
+                    out.append(upload.poll())
+                    if upload.legacy:
+                        # Old firmware: send the whole configuration as one line
+                        out.append(pending.payload)
+                        pending.upload = None
+                        pending.deadline = time.monotonic() + REQUEST_TIMEOUTS["config"]
+                    elif upload.finished:
+                        self.request_finished.emit(pending.request_id, upload.success, upload.message)
+                        pending = None
+
+                out = b''.join(out)
+                if out:
+                    try:
+                        connection.write(out)
+                    except Exception as e:
+                        if pending is not None:
+                            self.request_finished.emit(pending.request_id, False, str(e))
+                        self.connection_lost.emit(str(e))
+                        break
+
+                now = time.monotonic()
+                if not is_ready:
+                    if now < ready_deadline:
+                        continue  # Anything sent now would be lost in the reset
+                    is_ready = True
+                    self.ready.emit()
+
+                if pending is not None and now >= pending.deadline:
+                    if pending.upload is not None:
+                        try:
+                            connection.write(pending.upload.abort())
+                        except Exception as e:
+                            self.request_finished.emit(pending.request_id, False, str(e))
+                            self.connection_lost.emit(str(e))
+                            break
+                    self.request_finished.emit(pending.request_id, False, "No response from Arduino")
+                    pending = None
+
+                if pending is None and not self.outgoing.empty():
+                    pending = self.outgoing.get_nowait()
+                    try:
+                        if pending.upload is not None:
+                            connection.write(pending.upload.start())
+                        else:
+                            connection.write(pending.payload)
+                    except Exception as e:
+                        self.request_finished.emit(pending.request_id, False, str(e))
+                        self.connection_lost.emit(str(e))
+                        break
+                    pending.deadline = time.monotonic() + pending.timeout
+        finally:
+            self.running = False
+            if connection.is_open:
+                connection.close()
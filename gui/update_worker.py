@@ -0,0 +1,57 @@
+"""
+Background update worker for Arduino Input Configurator
+
+Runs Updater.check_for_updates and Updater.download_and_install_update on
+a QThread so network timeouts and downloads never block the GUI. Progress
+from the updater's callback(progress, status) is forwarded as a Qt signal.
+"""
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from updater import Updater
+
+
+class UpdateWorker(QThread):
+    """
+    Runs one update check or one install off the GUI thread.
+
+    Signals:
+        check_finished(object): Update info dict from check_for_updates (or None)
+        progress(int, str): Progress percent and status from the install
+        install_finished(bool): Whether the install succeeded
+    """
+
+    check_finished = pyqtSignal(object)
+    progress = pyqtSignal(int, str)
+    install_finished = pyqtSignal(bool)
+
+    def __init__(self, update_info=None, force_check=False, parent=None):
+        """
+        Args:
+            update_info (dict): Install this update (from check_for_updates);
+                                if None, only check for updates
+            force_check (bool): Revalidate the cached release list even if fresh
+        """
+        super().__init__(parent)
+        self.update_info = update_info
+        self.force_check = force_check
+        self.updater = Updater()
+
+    def cancel(self):
+        """Cancel a running install (effective until files are being installed)."""
+        self.updater.cancel()
+
+    def run(self):
+        if self.update_info is None:
+            try:
+                update_info = self.updater.check_for_updates(force=self.force_check)
+            except Exception as e:
+                print(f"Update check failed: {e}")
+                update_info = None
+            self.check_finished.emit(update_info)
+            return
+
+        success = self.updater.install_update(
+            self.update_info, callback=lambda percent, status: self.progress.emit(percent, status)
+        )
+        self.install_finished.emit(success)
@@ -7,17 +7,203 @@ Checks GitHub for new releases and downloads/installs updates automatically.
 import os
 import sys
 import json
+import socket
+import hashlib
+import http.client
 import urllib.request
 import urllib.error
 import zipfile
 import shutil
-import tempfile
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 from pathlib import Path
 
+from release_manifest import MANIFEST_NAME, is_skipped, is_safe_path, archive_root, \
+    parse_manifest, changed_files
+from install_layout import InstallLayout, POINTER_FILE, PREVIOUS_FILE, VERSIONS_DIR
+
+
+# Progress value at which the staged version is switched to;
+# cancel() has no effect from here on
+INSTALL_START_PROGRESS = 90
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_RETRIES = 3    # Resume attempts after a dropped connection
+
+# Worker threads writing files while an update is staged. Per-file costs
+# (antivirus scans on Windows, metadata updates) dominate, not bandwidth;
+# without them the threads only compete for the CPU, so use at most one
+# per core.
+INSTALL_WORKERS = min(8, os.cpu_count() or 1)
+PROGRESS_INTERVAL = 0.1  # Seconds between progress reports while installing
+
+# Fetch the whole zip instead when the changed members are more than this
+# fraction of it: one streamed download beats many range requests
+DELTA_MAX_FRACTION = 0.5
+
+
+class UpdateCancelled(Exception):
+    """Raised inside the updater when cancel() was requested."""
+
+
+class RangeNotSupported(Exception):
+    """The server answered a Range request with something other than 206."""
+
+
+class _InstallProgress:
+    """Byte and file counters shared by install workers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bytes = 0
+        self.files = 0
+
+    def add(self, byte_count, file_count=0):
+        with self.lock:
+            self.bytes += byte_count
+            self.files += file_count
+
+
+class HttpRangeFile:
+    """
+    Read-only, seekable file over HTTP Range requests.
+
+    Lets zipfile.ZipFile read a remote release zip's central directory and
+    single members without downloading the whole archive. Reads are served
+    from a few cached spans; prefetch() fetches a member in one request.
+    """
+
+    TAIL_SIZE = 128 * 1024  # End-of-central-directory record, and usually the directory
+    MIN_FETCH = 16 * 1024
+    MAX_SPANS = 8
+
+    def __init__(self, url, timeout=30, check_cancelled=None):
+        """
+        Fetch the tail of the file (which also tells its size).
+
+        Args:
+            url (str): File URL
+            timeout (int): Socket timeout in seconds
+            check_cancelled (callable): Called before every request
+
+        Raises:
+            RangeNotSupported: If the server does not serve byte ranges
+        """
+        self.url = url
+        self.timeout = timeout
+        self.check_cancelled = check_cancelled
+        self.validator = None
+        self.spans = []
+        self.position = 0
+        self.requests = 0
+        self.bytes_fetched = 0
+
+        data, start, self.size = self._get(f'bytes=-{self.TAIL_SIZE}')
+        self.spans.append((start, data))
+
+    def _get(self, byte_range):
+        if self.check_cancelled:
+            self.check_cancelled()
+
+        req = urllib.request.Request(self.url)
+        req.add_header('User-Agent', 'Arduino-Input-Configurator')
+        req.add_header('Range', byte_range)
+        if self.validator:
+            # Every range must come from the same version of the file
+            req.add_header('If-Range', self.validator)
+
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            if response.status != 206:
+                raise RangeNotSupported(f"HTTP {response.status} for a range request")
+
+            content_range = response.headers.get('Content-Range', '')
+            try:
+                # "bytes <first>-<last>/<total>"
+                span, total = content_range.split(' ', 1)[1].split('/')
+                first, last = (int(value) for value in span.split('-'))
+                total = int(total)
+            except ValueError:
+                raise RangeNotSupported(f"Unusable Content-Range: {content_range!r}")
+
+            if self.validator is None:
+                validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                if validator and not validator.startswith('W/'):
+                    self.validator = validator
+
+            data = response.read()
+
+        if len(data) != last - first + 1:
+            raise http.client.IncompleteRead(data, last - first + 1 - len(data))
+
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        return data, first, total
+
+    def _find(self, start, end):
+        for span_start, data in reversed(self.spans):
+            if span_start <= start and end <= span_start + len(data):
+                return span_start, data
+        return None
+
+    def prefetch(self, start, end):
+        """Fetch bytes [start, end) in one request unless they are cached."""
+        start = max(0, start)
+        end = min(self.size, end)
+        if start >= end or self._find(start, end) is not None:
+            return
+        data, first, _ = self._get(f'bytes={start}-{end - 1}')
+        self.spans.append((first, data))
+        del self.spans[:-self.MAX_SPANS]
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size - self.position
+        end = min(self.size, self.position + size)
+        if end <= self.position:
+            return b''
+
+        found = self._find(self.position, end)
+        if found is None:
+            self.prefetch(self.position, max(end, self.position + self.MIN_FETCH))
+            found = self._find(self.position, end)
+
+        span_start, data = found
+        chunk = data[self.position - span_start:end - span_start]
+        self.position = end
+        return chunk
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self.position
+        elif whence == 2:
+            offset += self.size
+        self.position = max(0, offset)
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def close(self):
+        self.spans = []
+
+
+def default_cache_dir():
+    """Per-user cache directory for update metadata."""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or (Path.home() / '.cache')
+    return Path(base) / 'arduino-input-configurator'
+
 
 class Updater:
-    def __init__(self, repo_owner="bworthy89", repo_name="seths-crap", current_version=None):
+    def __init__(self, repo_owner="bworthy89", repo_name="seths-crap", current_version=None,
+                 cache_dir=None, cache_ttl=3600, api_url=None, install_workers=INSTALL_WORKERS):
         """
         Initialize the updater.
 
@@ -25,13 +211,39 @@ class Updater:
             repo_owner (str): GitHub repository owner
             repo_name (str): GitHub repository name
             current_version (str): Current version (e.g., "1.0.0")
+            cache_dir (Path): Where the releases response is cached
+                              (default: per-user cache directory)
+            cache_ttl (int): Seconds a cached releases response is used without
+                             contacting GitHub (0 = always revalidate)
+            api_url (str): Releases API URL override (e.g. a local release_server)
+            install_workers (int): Threads writing files during an install (1 = sequential)
         """
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.project_root = Path(__file__).parent.parent.absolute()
         self.current_version = current_version or self._read_version_file()
         # Use /releases instead of /releases/latest to avoid caching issues
-        self.github_api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases"
+        self.github_api_url = api_url or f"https://api.github.com/repos/{repo_owner}/{repo_name}/releases"
+        self.cancel_requested = threading.Event()
+        self.cache_dir = Path(cache_dir or default_cache_dir())
+        self.cache_file = self.cache_dir / 'releases.json'
+        self.cache_ttl = cache_ttl
+        self.install_workers = max(1, install_workers)
+        self._buffers = threading.local()  # One copy buffer per install thread
+
+    def cancel(self):
+        """
+        Request cancellation of a running download_and_install_update.
+
+        Safe to call from any thread. Cancellation takes effect during the
+        download and extraction; once files are being installed the update
+        runs to completion.
+        """
+        self.cancel_requested.set()
+
+    def _check_cancelled(self):
+        if self.cancel_requested.is_set():
+            raise UpdateCancelled()
 
     def _read_version_file(self):
         """Read current version from VERSION file."""
@@ -43,12 +255,87 @@ class Updater:
             pass
         return "0.0.0"
 
-    def check_for_updates(self, timeout=10):
+    def _load_release_cache(self):
+        """Return the cached releases response, or None if missing/unusable."""
+        try:
+            cache = json.loads(self.cache_file.read_text())
+            if cache.get('url') == self.github_api_url and isinstance(cache.get('releases'), list):
+                return cache
+        except Exception:
+            pass
+        return None
+
+    def _save_release_cache(self, cache):
+        """Write the releases cache atomically (errors are not fatal)."""
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_suffix('.tmp')
+            temp_file.write_text(json.dumps(cache))
+            os.replace(temp_file, self.cache_file)
+        except Exception as e:
+            print(f"Could not write update cache: {e}")
+
+    def fetch_releases(self, timeout=10, force=False):
+        """
+        Get the GitHub releases list, using the on-disk cache when possible.
+
+        Within the cache TTL no request is made at all. After it, the cached
+        ETag/Last-Modified are sent back as a conditional request, so an
+        unchanged list costs a single 304 response.
+
+        Args:
+            timeout (int): Request timeout in seconds
+            force (bool): Revalidate with GitHub even if the cache is fresh
+
+        Returns:
+            list: Release objects from the GitHub API
+
+        Raises:
+            urllib.error.HTTPError, urllib.error.URLError: On request failure
+        """
+        cache = self._load_release_cache()
+        now = time.time()
+
+        if cache and not force and now - cache.get('fetched_at', 0) < self.cache_ttl:
+            return cache['releases']
+
+        req = urllib.request.Request(self.github_api_url)
+        req.add_header('User-Agent', 'Arduino-Input-Configurator')
+        if cache:
+            if cache.get('etag'):
+                req.add_header('If-None-Match', cache['etag'])
+            if cache.get('last_modified'):
+                req.add_header('If-Modified-Since', cache['last_modified'])
+
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                releases = json.loads(response.read().decode())
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cache:
+                # Unchanged since last time
+                cache['fetched_at'] = now
+                self._save_release_cache(cache)
+                return cache['releases']
+            raise
+
+        self._save_release_cache({
+            'url': self.github_api_url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': now,
+            'releases': releases,
+        })
+        return releases
+
+    def check_for_updates(self, timeout=10, force=False):
         """
         Check if a new version is available on GitHub.
 
         Args:
             timeout (int): Request timeout in seconds
+            force (bool): Revalidate the cached release list even if it is fresh
 
         Returns:
             dict: Update info with keys:
@@ -56,16 +343,14 @@ class Updater:
                 - latest_version (str): Latest version on GitHub
                 - current_version (str): Current installed version
                 - download_url (str): Download URL for new version
+                - sha256 (str): Published SHA-256 of the download, or None
+                - manifest_url (str): Release manifest URL (enables delta updates), or None
                 - release_notes (str): Release notes
             None if check failed
         """
         try:
             # Query GitHub API for all releases
-            req = urllib.request.Request(self.github_api_url)
-            req.add_header('User-Agent', 'Arduino-Input-Configurator')
-
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                releases = json.loads(response.read().decode())
+            releases = self.fetch_releases(timeout, force)
 
             # Find the latest non-draft, non-prerelease version
             data = None
@@ -88,11 +373,16 @@ class Updater:
             latest_version = data['tag_name'].lstrip('v')  # Remove 'v' prefix if present
             download_url = None
 
+            zip_asset = None
+            manifest_url = None
+
             # Find the source code zip URL
             for asset in data.get('assets', []):
-                if asset['name'].endswith('.zip'):
+                if asset['name'].endswith('.zip') and zip_asset is None:
+                    zip_asset = asset
                     download_url = asset['browser_download_url']
-                    break
+                elif asset['name'] == MANIFEST_NAME:
+                    manifest_url = asset['browser_download_url']
 
             # If no asset, use the source code archive
             if not download_url:
@@ -101,11 +391,17 @@ class Updater:
             # Compare versions
             update_available = self._compare_versions(latest_version, self.current_version) > 0
 
+            sha256 = None
+            if update_available and zip_asset:
+                sha256 = self._published_digest(data, zip_asset, timeout)
+
             return {
                 'available': update_available,
                 'latest_version': latest_version,
                 'current_version': self.current_version,
                 'download_url': download_url,
+                'sha256': sha256,
+                'manifest_url': manifest_url if zip_asset else None,
                 'release_notes': data.get('body', 'No release notes available.'),
                 'html_url': data.get('html_url', '')
             }
@@ -126,6 +422,33 @@ class Updater:
             print(f"Update check failed: {e}")
             return None
 
+    def _published_digest(self, release, asset, timeout=10):
+        """
+        Find the published SHA-256 of a release asset.
+
+        GitHub reports it as the asset's "digest" ("sha256:<hex>"); releases
+        can also ship a "<asset name>.sha256" file next to the zip.
+
+        Returns:
+            str: Lowercase hex digest, or None if none is published
+        """
+        digest = asset.get('digest') or ''
+        if digest.startswith('sha256:'):
+            return digest[len('sha256:'):].lower()
+
+        checksum_name = asset['name'] + '.sha256'
+        for other in release.get('assets', []):
+            if other['name'] == checksum_name:
+                try:
+                    req = urllib.request.Request(other['browser_download_url'])
+                    req.add_header('User-Agent', 'Arduino-Input-Configurator')
+                    with urllib.request.urlopen(req, timeout=timeout) as response:
+                        # sha256sum format: "<hex>  <file name>"
+                        return response.read(1024).decode().split()[0].lower()
+                except Exception as e:
+                    print(f"Could not read {checksum_name}: {e}")
+        return None
+
     def _compare_versions(self, version1, version2):
         """
         Compare two semantic versions.
@@ -154,115 +477,583 @@ class Updater:
         except Exception:
             return 0
 
-    def download_and_install_update(self, download_url, callback=None):
+    def download_file(self, url, dest_path, expected_sha256=None, callback=None, timeout=30):
+        """
+        Stream a download to disk, resuming from a previous partial download.
+
+        Data goes through one reusable buffer into "<dest_path>.part" and is
+        hashed as it arrives. An existing partial file is continued with an
+        HTTP Range request (guarded by If-Range, so a changed file restarts
+        from scratch), and dropped connections are resumed up to
+        DOWNLOAD_RETRIES times. The partial file is only renamed to
+        dest_path once the digest has been checked.
+
+        Args:
+            url (str): URL to download
+            dest_path (Path): Where the finished file goes
+            expected_sha256 (str): Published hex digest to verify, or None
+            callback (callable): Optional callback(progress, status), 0-50 percent
+            timeout (int): Socket timeout in seconds
+
+        Returns:
+            str: SHA-256 hex digest of the downloaded file
+
+        Raises:
+            UpdateCancelled: If cancel() was called (the partial file is kept)
+            ValueError: If the digest does not match (the partial file is deleted)
+        """
+        dest_path = Path(dest_path)
+        part_path = dest_path.with_name(dest_path.name + '.part')
+        validator_path = dest_path.with_name(dest_path.name + '.validator')
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+
+        view = memoryview(bytearray(DOWNLOAD_CHUNK_SIZE))
+        attempt = 0
+
+        while True:
+            try:
+                digest = self._download_attempt(url, part_path, validator_path, view, callback, timeout)
+                break
+            except urllib.error.HTTPError:
+                raise
+            except (urllib.error.URLError, http.client.HTTPException, ConnectionError, socket.timeout) as e:
+                attempt += 1
+                if attempt > DOWNLOAD_RETRIES:
+                    raise
+                print(f"Download interrupted ({e}), resuming...")
+                self.cancel_requested.wait(min(0.5 * attempt, 2.0))
+                self._check_cancelled()
+
+        if expected_sha256 and digest != expected_sha256.lower():
+            self._remove_files(part_path, validator_path)
+            raise ValueError(f"Checksum mismatch: expected {expected_sha256}, got {digest}")
+
+        os.replace(part_path, dest_path)
+        self._remove_files(validator_path)
+        return digest
+
+    def _download_attempt(self, url, part_path, validator_path, view, callback, timeout):
+        """One request of download_file; returns the digest of the whole file."""
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        hasher = hashlib.sha256()
+
+        req = urllib.request.Request(url)
+        req.add_header('User-Agent', 'Arduino-Input-Configurator')
+        if offset and validator_path.exists():
+            req.add_header('Range', f'bytes={offset}-')
+            req.add_header('If-Range', validator_path.read_text())
+        else:
+            offset = 0
+
+        try:
+            response = urllib.request.urlopen(req, timeout=timeout)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # The partial file does not fit the server's copy; start over
+                self._remove_files(part_path, validator_path)
+                return self._download_attempt(url, part_path, validator_path, view, callback, timeout)
+            raise
+
+        with response:
+            length = response.headers.get('Content-Length')
+            total = int(length) if length else 0
+
+            if offset and response.status == 206 and \
+                    (response.headers.get('Content-Range') or '').startswith(f'bytes {offset}-'):
+                # Resuming: the hash has to include what is already on disk
+                with open(part_path, 'rb') as f:
+                    while True:
+                        count = f.readinto(view)
+                        if not count:
+                            break
+                        hasher.update(view[:count])
+                mode = 'ab'
+                total = total + offset if total else 0
+            else:
+                offset = 0
+                mode = 'wb'
+                # Remember what identifies this file, for If-Range on resume
+                validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+                if validator and not validator.startswith('W/'):
+                    validator_path.write_text(validator)
+                else:
+                    self._remove_files(validator_path)
+
+            received = offset
+            last_percent = -1
+
+            with open(part_path, mode) as f:
+                while True:
+                    self._check_cancelled()
+                    count = response.readinto(view)
+                    if not count:
+                        break
+                    chunk = view[:count]
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    received += count
+
+                    if callback and total:
+                        percent = min(50, received * 50 // total)
+                        if percent != last_percent:
+                            last_percent = percent
+                            callback(percent, f"Downloading... {received // 1024:,} / {total // 1024:,} KB")
+
+        if total and received < total:
+            # urllib reports a dropped connection as a normal end of body
+            raise http.client.IncompleteRead(b'', total - received)
+
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _remove_files(*paths):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _download_path(self, download_url):
+        """Stable location for a download, so an interrupted one can be resumed."""
+        name = hashlib.sha1(download_url.encode()).hexdigest()[:16]
+        return self.cache_dir / 'downloads' / f'update-{name}.zip'
+
+    def _fetch_manifest(self, manifest_url, timeout=10):
+        """Download and parse a release manifest; None if it is unusable."""
+        try:
+            req = urllib.request.Request(manifest_url)
+            req.add_header('User-Agent', 'Arduino-Input-Configurator')
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                return parse_manifest(response.read())
+        except Exception as e:
+            print(f"Release manifest unavailable ({e}), installing the full release")
+            return None
+
+    def install_update(self, update_info, callback=None):
+        """
+        Install the update described by check_for_updates().
+
+        Args:
+            update_info (dict): Update info from check_for_updates
+            callback (callable): Optional callback function(progress, status)
+
+        Returns:
+            bool: True if update successful, False otherwise
+        """
+        return self.download_and_install_update(
+            update_info['download_url'], callback,
+            expected_sha256=update_info.get('sha256'),
+            manifest_url=update_info.get('manifest_url'),
+            version=update_info.get('latest_version')
+        )
+
+    def download_and_install_update(self, download_url, callback=None, expected_sha256=None, manifest_url=None,
+                                    version=None):
         """
         Download and install an update from GitHub.
 
+        The update is built as a complete new version directory (see
+        install_layout): files that changed are streamed from the zip, the
+        rest are copied from the active version. Only once it is complete is
+        it switched to, by replacing the current-version pointer; the old
+        version is kept for rollback.
+
+        With a release manifest only the files that differ from the active
+        version are fetched (as byte ranges of the release zip). Without
+        one, or if the server cannot serve ranges, the whole zip is
+        downloaded.
+
         Args:
             download_url (str): URL to download the update from
             callback (callable): Optional callback function(progress, status)
                                 progress: 0-100 percent
                                 status: status message string
+            expected_sha256 (str): Published SHA-256 of the download; the
+                                   update is rejected if it does not match
+            manifest_url (str): Release manifest URL, for a delta update
+            version (str): Version being installed (names its directory)
 
         Returns:
             bool: True if update successful, False otherwise
         """
+        self.cancel_requested.clear()
+        zip_path = self._download_path(download_url)
+        layout = InstallLayout(self.project_root)
+        active_root = layout.active_root()
+        staging = None
+
         try:
+            changed = None
+            manifest = self._fetch_manifest(manifest_url) if manifest_url else None
+            if manifest is not None:
+                if callback:
+                    callback(0, "Comparing files...")
+                changed = changed_files(manifest, active_root)
+                if not changed:
+                    if callback:
+                        callback(100, "All files are already up to date")
+                    return True
+
+                name = layout.new_version_name(version or manifest.get('version'))
+                staging = layout.begin(name)
+                if self._install_delta(download_url, manifest, changed, active_root, staging, callback):
+                    self._switch_version(layout, staging, name, callback)
+                    staging = None
+                    if callback:
+                        callback(100, "Update complete!")
+                    return True
+
             if callback:
                 callback(0, "Downloading update...")
 
-            # Download to temporary directory
-            temp_dir = tempfile.mkdtemp(prefix='arduino_update_')
-            zip_path = os.path.join(temp_dir, 'update.zip')
-
-            # Download with progress
-            def download_progress(block_num, block_size, total_size):
-                if callback and total_size > 0:
-                    percent = min(100, int((block_num * block_size / total_size) * 50))
-                    callback(percent, f"Downloading... {percent}%")
-
-            urllib.request.urlretrieve(download_url, zip_path, download_progress)
+            self.download_file(download_url, zip_path, expected_sha256, callback)
 
             if callback:
                 callback(50, "Extracting files...")
 
-            # Extract zip
-            extract_dir = os.path.join(temp_dir, 'extracted')
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-
-            # Find the root directory in the extracted files
-            extracted_items = os.listdir(extract_dir)
-            if len(extracted_items) == 1 and os.path.isdir(os.path.join(extract_dir, extracted_items[0])):
-                source_dir = os.path.join(extract_dir, extracted_items[0])
-            else:
-                source_dir = extract_dir
-
-            if callback:
-                callback(60, "Installing update...")
-
-            # Copy files to project directory (excluding user data)
-            self._copy_update_files(source_dir, self.project_root, callback)
-
-            if callback:
-                callback(90, "Cleaning up...")
+            # Stream members straight from the zip (excluding user data)
+            with zipfile.ZipFile(zip_path) as archive:
+                members = self._update_members(archive, changed)
+                if staging is None:
+                    name = layout.new_version_name(version or self._zip_version(archive, members))
+                    staging = layout.begin(name)
+                self._stage_version(archive, members, active_root, staging, manifest, callback, 50,
+                                    "Extracting files")
+            self._switch_version(layout, staging, name, callback)
+            staging = None
 
-            # Clean up temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            self._remove_files(zip_path)
 
             if callback:
                 callback(100, "Update complete!")
 
             return True
 
+        except UpdateCancelled:
+            # A partially downloaded file is kept so the next attempt resumes it
+            if staging is not None:
+                layout.abort(staging)
+            if callback:
+                callback(0, "Update cancelled")
+            return False
+
         except Exception as e:
+            if staging is not None:
+                layout.abort(staging)
             print(f"Update installation failed: {e}")
             if callback:
                 callback(0, f"Update failed: {str(e)}")
             return False
 
-    def _copy_update_files(self, source_dir, dest_dir, callback=None):
+    def _install_delta(self, download_url, manifest, changed, active_root, stage_root, callback=None):
         """
-        Copy update files, excluding user data and system files.
+        Stage only the changed members of a remote release zip.
+
+        The zip's central directory and each changed member are read with
+        HTTP Range requests; every member is checked against the manifest.
 
         Args:
-            source_dir (str): Source directory with new files
-            dest_dir (Path): Destination directory (project root)
+            download_url (str): Release zip URL
+            manifest (dict): Release manifest
+            changed (list): Manifest paths that differ locally
+            active_root (Path): Project tree of the active version
+            stage_root (Path): Staging directory of the new version
             callback (callable): Progress callback
+
+        Returns:
+            bool: True if staged, False if a full download should be used
+        """
+        try:
+            remote = HttpRangeFile(download_url, check_cancelled=self._check_cancelled)
+        except (RangeNotSupported, urllib.error.URLError, http.client.HTTPException, OSError) as e:
+            print(f"Delta update not possible ({e}), downloading the full release")
+            return False
+
+        def prefetch(info):
+            # Local header (30 bytes + name + extra field) followed by the data
+            header_size = 30 + len(info.filename.encode()) + len(info.extra) + 64
+            remote.prefetch(info.header_offset, info.header_offset + header_size + info.compress_size)
+
+        with zipfile.ZipFile(remote) as archive:
+            members = self._update_members(archive, changed)
+            missing = set(changed).difference(rel_path for rel_path, _ in members)
+            if missing:
+                raise ValueError(f"{min(missing)} is in the release manifest but not in the release zip")
+
+            if sum(info.compress_size for _, info in members) > remote.size * DELTA_MAX_FRACTION:
+                return False
+
+            if callback:
+                callback(0, f"Downloading {len(members)} changed files...")
+            self._stage_version(archive, members, active_root, stage_root, manifest, callback, 0,
+                                "Downloading changed files", prefetch)
+
+        print(f"Delta update: {len(members)} files, {remote.bytes_fetched:,} of {remote.size:,} bytes "
+              f"in {remote.requests} requests")
+        return True
+
+    def _update_members(self, archive, only=None):
+        """
+        Pick the members to install from a release zip's central directory.
+
+        Args:
+            archive (zipfile.ZipFile): Release zip
+            only (list): Install just these project-relative paths (default: all)
+
+        Returns:
+            list: (project-relative path, ZipInfo) pairs
+
+        Raises:
+            ValueError: If a member would land outside the project
+        """
+        infos = [info for info in archive.infolist() if not info.is_dir()]
+        root = archive_root([info.filename for info in infos])
+        if only is not None:
+            only = set(only)
+
+        members = []
+        for info in infos:
+            rel_path = info.filename[len(root):]
+            if is_skipped(rel_path) or (only is not None and rel_path not in only):
+                continue
+            if not is_safe_path(rel_path):
+                raise ValueError(f"Unsafe path in release zip: {info.filename}")
+            members.append((rel_path, info))
+        return members
+
+    def _zip_version(self, archive, members):
+        """Version named by the VERSION file in a release zip, or None."""
+        for rel_path, info in members:
+            if rel_path == 'VERSION':
+                return archive.read(info).decode(errors='ignore').strip() or None
+        return None
+
+    def _stage_version(self, archive, members, active_root, stage_root, manifest=None, callback=None,
+                       start_progress=50, status="Extracting files", prefetch=None):
         """
-        # Files/directories to skip (user data, system files)
-        skip_items = {
-            '.git', '.github', '.gitignore', '.vs', '.vscode', '.pio',
-            '__pycache__', '*.pyc', '*.pyo', 'venv', 'env',
-            '.claude'  # Don't overwrite Claude workspace
-        }
+        Build a complete new version in a staging directory.
 
-        # Copy files recursively
-        total_files = sum(1 for _ in Path(source_dir).rglob('*') if _.is_file())
-        copied_files = 0
+        Zip members are streamed in, and the active version's files that the
+        update does not replace (unchanged release files and anything the
+        user added) are hard-linked over, or copied where the file system
+        cannot link them, on a pool of install_workers threads. Nothing
+        installed is touched.
 
-        for source_path in Path(source_dir).rglob('*'):
-            if source_path.is_file():
-                # Get relative path
-                rel_path = source_path.relative_to(source_dir)
+        Args:
+            archive (zipfile.ZipFile): Release zip
+            members (list): (project-relative path, ZipInfo) pairs to extract
+            active_root (Path): Project tree of the active version
+            stage_root (Path): Staging directory of the new version
+            manifest (dict): Release manifest to verify members against, or None
+            callback (callable): Progress callback, from start_progress up to
+                                 INSTALL_START_PROGRESS by bytes written
+            start_progress (int): Progress when staging starts
+            status (str): Status text for progress reports
+            prefetch (callable): Called with each ZipInfo before it is read;
+                                 members are then extracted one at a time
+                                 (the archive is a remote file)
+        """
+        carried = self._carry_over_files(active_root, [rel_path for rel_path, _ in members])
+
+        # Create every directory up front so workers only write files
+        directories = {(stage_root / rel_path).parent for rel_path, _ in members}
+        directories.update((stage_root / rel_path).parent for rel_path, _, _ in carried)
+        for directory in sorted(directories):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        progress = _InstallProgress()
+        tasks = []
+
+        # Reads through one ZipFile share its file handle and are serialized,
+        # so each worker thread opens its own handle on a local zip
+        handles = []
+        local = threading.local()
+
+        def thread_archive():
+            if prefetch is not None or self.install_workers == 1 or not archive.filename:
+                return archive
+            handle = getattr(local, 'archive', None)
+            if handle is None:
+                handle = local.archive = zipfile.ZipFile(archive.filename)
+                handles.append(handle)
+            return handle
+
+        def extract_task(rel_path, info):
+            expected = manifest['files'][rel_path]['sha256'] if manifest is not None else None
+            return lambda: self._extract_member(thread_archive(), info, stage_root / rel_path, expected, progress)
+
+        if prefetch is None:
+            tasks.extend(extract_task(rel_path, info) for rel_path, info in members)
+        else:
+            def extract_remote():
+                for rel_path, info in members:
+                    prefetch(info)
+                    extract_task(rel_path, info)()
+            tasks.append(extract_remote)
+
+        tasks.extend(
+            (lambda source=source, rel_path=rel_path, size=size:
+             self._copy_file(source, stage_root / rel_path, size, progress))
+            for rel_path, source, size in carried
+        )
+
+        total_bytes = sum(info.file_size for _, info in members) + sum(size for _, _, size in carried)
+        total_files = len(members) + len(carried)
+        progress_span = INSTALL_START_PROGRESS - start_progress
+
+        def report():
+            if callback:
+                with progress.lock:
+                    done_bytes, done_files = progress.bytes, progress.files
+                percent = start_progress + (done_bytes * progress_span // total_bytes if total_bytes else 0)
+                callback(min(percent, INSTALL_START_PROGRESS), f"{status}... ({done_files}/{total_files})")
+
+        try:
+            self._run_install_tasks(tasks, report)
+        finally:
+            for handle in handles:
+                handle.close()
+
+    def _run_install_tasks(self, tasks, report):
+        """
+        Run install tasks on up to install_workers threads.
+
+        Progress is reported from the calling thread every PROGRESS_INTERVAL
+        seconds, however many files complete in between. The first error or
+        cancellation stops tasks that have not started and is re-raised.
+
+        Args:
+            tasks (list): Callables
+            report (callable): Reports the aggregated progress
+        """
+        if self.install_workers == 1 or len(tasks) <= 1:
+            next_report = time.monotonic()
+            for task in tasks:
+                self._check_cancelled()
+                task()
+                if time.monotonic() >= next_report:
+                    report()
+                    next_report = time.monotonic() + PROGRESS_INTERVAL
+            report()
+            return
+
+        with ThreadPoolExecutor(max_workers=self.install_workers) as pool:
+            futures = [pool.submit(task) for task in tasks]
+            pending = futures
+            try:
+                while pending:
+                    done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+                    for future in done:
+                        future.result()
+                    report()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _extract_member(self, archive, info, dest_path, expected_sha256, progress):
+        """Stream one zip member to dest_path, verifying it if a digest is given."""
+        buffer = getattr(self._buffers, 'view', None)
+        if buffer is None:
+            buffer = self._buffers.view = memoryview(bytearray(DOWNLOAD_CHUNK_SIZE))
+        hasher = hashlib.sha256()
+
+        with archive.open(info) as member, open(dest_path, 'wb') as f:
+            while True:
+                self._check_cancelled()
+                count = member.readinto(buffer)
+                if not count:
+                    break
+                chunk = buffer[:count]
+                hasher.update(chunk)
+                f.write(chunk)
+                progress.add(count)
+
+        if expected_sha256 is not None and hasher.hexdigest() != expected_sha256:
+            raise ValueError(f"Checksum mismatch for {info.filename}")
+
+        # Keep the release's timestamps, as extracting the zip did
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(dest_path, (mtime, mtime))
+        progress.add(0, 1)
+
+    def _copy_file(self, source, dest_path, size, progress):
+        """
+        Carry one file from the active version into the staging directory.
+
+        The file is hard-linked, so only what an update changes is written;
+        it is copied instead where links are not supported (another device,
+        FAT). Installed files are never modified in place, only replaced.
+        """
+        self._check_cancelled()
+        try:
+            os.link(source, dest_path)
+        except OSError:
+            shutil.copy2(source, dest_path)
+        progress.add(size, 1)
+
+    def _carry_over_files(self, active_root, replaced):
+        """
+        List the active version's files that a new version must keep.
 
-                # Skip if in skip list
-                if any(skip in rel_path.parts for skip in skip_items):
+        Args:
+            active_root (Path): Project tree of the active version
+            replaced (list): Project-relative paths the update provides
+
+        Returns:
+            list: (project-relative path, source path, size) tuples
+        """
+        replaced = set(replaced)
+        # A pre-versioning install keeps the versions and pointers in its root
+        layout_items = {VERSIONS_DIR, POINTER_FILE, PREVIOUS_FILE,
+                        POINTER_FILE + '.tmp', PREVIOUS_FILE + '.tmp'}
+        carried = []
+
+        for directory, dirnames, filenames in os.walk(active_root):
+            rel_dir = Path(directory).relative_to(active_root)
+            if rel_dir == Path('.'):
+                dirnames[:] = [d for d in dirnames if d not in layout_items]
+                filenames = [f for f in filenames if f not in layout_items]
+            dirnames[:] = [d for d in dirnames if not is_skipped((rel_dir / d).as_posix())]
+
+            for filename in filenames:
+                rel_path = (rel_dir / filename).as_posix()
+                if rel_path in replaced or is_skipped(rel_path):
                     continue
+                source = os.path.join(directory, filename)
+                carried.append((rel_path, source, os.path.getsize(source)))
 
-                # Destination path
-                dest_path = dest_dir / rel_path
+        return carried
 
-                # Create parent directories
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
+    def _switch_version(self, layout, stage_root, name, callback=None):
+        """
+        Activate a fully staged version. Cancellation is honoured up to here.
 
-                # Copy file
-                shutil.copy2(source_path, dest_path)
+        Args:
+            layout (InstallLayout): Install layout
+            stage_root (Path): Staging directory of the new version
+            name (str): Version directory name
+            callback (callable): Progress callback
+        """
+        self._check_cancelled()
+
+        if callback:
+            callback(INSTALL_START_PROGRESS, "Switching to the new version...")
 
-                copied_files += 1
-                if callback and total_files > 0:
-                    progress = 60 + int((copied_files / total_files) * 30)
-                    callback(progress, f"Installing files... ({copied_files}/{total_files})")
+        layout.commit(stage_root, name)
+
+        removed = layout.collect_garbage()
+        if removed:
+            print(f"Removed old versions: {', '.join(removed)}")
+
+    def rollback(self):
+        """
+        Switch back to the version that was active before the last update.
+
+        Returns:
+            str: Name of the re-activated version, or None if there is none
+        """
+        return InstallLayout(self.project_root).rollback()
 
     def restart_application(self):
         """
@@ -272,17 +1063,19 @@ class Updater:
             bool: True if restart initiated
         """
         try:
-            # Get the path to the launcher script
-            launcher = self.project_root / "launch-gui.bat"
+            layout = InstallLayout(self.project_root)
+
+            # Get the path to the launcher script (it follows current-version)
+            launcher = layout.install_root / "launch-gui.bat"
 
             if launcher.exists():
                 # Launch the application
                 subprocess.Popen([str(launcher)], shell=True)
                 return True
             else:
-                # Fallback: restart Python script
+                # Fallback: restart the active version's Python script
                 python = sys.executable
-                script = Path(__file__).parent / "main.py"
+                script = layout.active_root() / "gui" / "main.py"
                 subprocess.Popen([python, str(script)])
                 return True
 
@@ -323,10 +1116,7 @@ def check_for_updates_cli():
         print(f"\r{status} [{percent}%]", end='', flush=True)
 
     print("\nInstalling update...")
-    success = updater.download_and_install_update(
-        update_info['download_url'],
-        callback=progress_callback
-    )
+    success = updater.install_update(update_info, callback=progress_callback)
 
     if success:
         print("\n\nUpdate installed successfully!")
@@ -335,5 +1125,18 @@ def check_for_updates_cli():
         print("\n\nUpdate failed. Please try again or download manually.")
 
 
+def rollback_cli():
+    """Command-line interface for rolling back the last update."""
+    restored = Updater().rollback()
+    if restored is None:
+        print("There is no previous version to roll back to.")
+    else:
+        print(f"Rolled back to {'the original install' if restored == '.' else restored}.")
+        print("Please restart the application.")
+
+
 if __name__ == '__main__':
-    check_for_updates_cli()
+    if sys.argv[1:] == ['--rollback']:
+        rollback_cli()
+    else:
+        check_for_updates_cli()
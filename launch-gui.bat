@@ -48,7 +48,12 @@ echo.
 
 REM Check and install dependencies
 echo [3/4] Checking required packages (PyQt5, pyserial)...
-cd /d "%~dp0gui"
+REM Follow current-version (written by the updater) to the active install
+set "APP_DIR=%~dp0"
+set "APP_VERSION="
+if exist "%~dp0current-version" set /p APP_VERSION=<"%~dp0current-version"
+if defined APP_VERSION if not "%APP_VERSION%"=="." set "APP_DIR=%~dp0versions\%APP_VERSION%\"
+cd /d "%APP_DIR%gui"
 
 python -c "import PyQt5" >nul 2>&1
 set PYQT5_INSTALLED=%errorlevel%